@@ -0,0 +1,13 @@
+from fastapi import Request
+from api.event_hub import EventHub
+from clients.async_redis_client import AsyncRedisClient
+
+
+async def get_redis(request: Request) -> AsyncRedisClient:
+    """Return the pooled async Redis client opened by the application lifespan."""
+    return request.app.state.redis
+
+
+async def get_event_hub(request: Request) -> EventHub:
+    """Return the process-wide event hub opened by the application lifespan."""
+    return request.app.state.events
@@ -0,0 +1,261 @@
+"""Server-sent events of execution status changes.
+
+The state scripts append every node transition and workflow status change
+to the execution's capped stream ``workflow:{execution_id}:events`` in the
+same call that writes the state, and the stream entry ids serve as SSE
+event ids. A client first receives what it missed: a snapshot of the
+current statuses on a fresh connection, or the entries after its
+``Last-Event-ID`` when it resumes. It then receives live entries until the
+workflow finishes.
+
+Live entries come from one ``EventHub`` per API process. It reads the streams
+of every execution with a connected client in a single blocking ``XREAD``
+and fans the entries out to in-process queues, so each process holds one
+Redis connection for events however many clients are connected.
+"""
+
+import asyncio
+import re
+from typing import AsyncIterator, Optional
+from logging_config import get_logger
+from clients import codecs
+from clients.async_redis_client import AsyncRedisClient
+from config import settings
+from orchestrator.models import NodeStatus
+from orchestrator.redis_keys import RedisKeyTemplates
+
+logger = get_logger(__name__)
+
+FINAL_STATUSES = {NodeStatus.COMPLETED.value, NodeStatus.FAILED.value}
+STREAM_ID_PATTERN = re.compile(r"^\d+-\d+$")
+
+_EVENTS_PREFIX, _EVENTS_SUFFIX = RedisKeyTemplates.WORKFLOW_EXECUTION_EVENTS.split("{execution_id}")
+
+
+def _events_key(execution_id: str) -> str:
+    return RedisKeyTemplates.WORKFLOW_EXECUTION_EVENTS.format(execution_id=execution_id)
+
+
+def _id_key(stream_id: str) -> tuple[int, int]:
+    milliseconds, sequence = stream_id.split("-")
+    return int(milliseconds), int(sequence)
+
+
+class Subscription:
+    """Queue of stream entries for one connected client."""
+
+    def __init__(self, execution_id: str, maxsize: int):
+        self.execution_id = execution_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        # Set when the client fell so far behind that its queue filled up;
+        # it is dropped and resumes from its last event on reconnect
+        self.overflowed = False
+
+
+class EventHub:
+    """Fan the event streams of watched executions out to subscribers.
+
+    One task reads every watched stream with one ``XREAD`` and puts each
+    entry on the queue of every subscriber of its execution. A stream is
+    read from the earliest position any subscriber asked for, so an entry
+    may reach a subscriber that already has it; subscribers skip ids they
+    have seen.
+    """
+
+    def __init__(self, client: AsyncRedisClient, block_ms: Optional[int] = None, queue_size: Optional[int] = None):
+        self.client = client
+        self.block_ms = block_ms or settings.SSE_READ_BLOCK_MS
+        self.queue_size = queue_size or settings.SSE_QUEUE_SIZE
+        self._subscribers: dict[str, set[Subscription]] = {}
+        # Id of the last entry read per execution; None until a subscriber
+        # has caught up and says where live reading should start
+        self._positions: dict[str, Optional[str]] = {}
+        self._changed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, execution_id: str) -> Subscription:
+        """Register a subscriber; call ``start_from`` once it has caught up."""
+        subscription = Subscription(execution_id, self.queue_size)
+        self._subscribers.setdefault(execution_id, set()).add(subscription)
+        self._positions.setdefault(execution_id, None)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return subscription
+
+    def start_from(self, execution_id: str, stream_id: str):
+        """Read the execution's stream live after ``stream_id``, or earlier if already reading earlier."""
+        if execution_id not in self._subscribers:
+            return
+        position = self._positions.get(execution_id)
+        if position is None or _id_key(stream_id) < _id_key(position):
+            self._positions[execution_id] = stream_id
+        self._changed.set()
+
+    def unsubscribe(self, subscription: Subscription):
+        subscribers = self._subscribers.get(subscription.execution_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.execution_id]
+            del self._positions[subscription.execution_id]
+
+    def subscriber_count(self) -> int:
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    async def close(self):
+        """Stop the reader task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            streams = {
+                _events_key(execution_id): position
+                for execution_id, position in self._positions.items() if position is not None
+            }
+            if not streams:
+                self._changed.clear()
+                await self._changed.wait()
+                continue
+            try:
+                response = await self.client.xread(streams, count=self.queue_size, block=self.block_ms)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Failed to read execution event streams: %s", e)
+                await asyncio.sleep(1)
+                continue
+            for stream, entries in response or []:
+                self._deliver(stream[len(_EVENTS_PREFIX):-len(_EVENTS_SUFFIX)], entries)
+
+    def _deliver(self, execution_id: str, entries: list):
+        if execution_id not in self._positions:
+            return
+        self._positions[execution_id] = entries[-1][0]
+        for subscription in list(self._subscribers[execution_id]):
+            for entry in entries:
+                try:
+                    subscription.queue.put_nowait(entry)
+                except asyncio.QueueFull:
+                    logger.warning("Dropping slow event subscriber of %s", execution_id)
+                    subscription.overflowed = True
+                    self.unsubscribe(subscription)
+                    break
+
+
+def format_event(event: str, data: dict, event_id: Optional[str] = None) -> str:
+    """Render one server-sent event."""
+    lines = [f"id: {event_id}"] if event_id else []
+    lines += [f"event: {event}", f"data: {codecs.json_codec.dumps(data)}"]
+    return "\n".join(lines) + "\n\n"
+
+
+def _format_entry(execution_id: str, entry_id: str, fields: dict) -> str:
+    if "node_id" in fields:
+        data = {"execution_id": execution_id, "node_id": fields["node_id"], "status": fields["status"]}
+        return format_event("node", data, entry_id)
+    return format_event("workflow", {"execution_id": execution_id, "status": fields["status"]}, entry_id)
+
+
+def _ends_stream(fields: dict) -> bool:
+    return "node_id" not in fields and fields.get("status") in FINAL_STATUSES
+
+
+def _node_status(raw: str) -> Optional[str]:
+    try:
+        record = codecs.json_codec.loads(raw)
+    except ValueError:
+        return raw
+    return record.get("status") if isinstance(record, dict) else raw
+
+
+async def read_snapshot(client: AsyncRedisClient, execution_id: str) -> tuple[str, dict]:
+    """Read the current statuses and the id of the last event in one transaction.
+
+    Returns:
+        tuple: The id of the last event the snapshot includes (``0-0`` if
+        none) and ``{"execution_id", "status", "nodes": {node_id: status}}``.
+    """
+    pipe = client.pipeline(transaction=True)
+    pipe.get(RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id=execution_id))
+    pipe.hgetall(RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id))
+    pipe.xrevrange(_events_key(execution_id), count=1)
+    status, nodes, last = await pipe.execute()
+    snapshot = {
+        "execution_id": execution_id,
+        "status": status,
+        "nodes": {node_id: _node_status(raw) for node_id, raw in nodes.items()},
+    }
+    return (last[0][0] if last else "0-0"), snapshot
+
+
+async def read_events_after(client: AsyncRedisClient, execution_id: str, last_id: str) -> Optional[list]:
+    """Return the events after ``last_id``, or None if some may have been trimmed.
+
+    Raises:
+        ValueError: If ``last_id`` is not a stream id.
+    """
+    if not STREAM_ID_PATTERN.match(last_id):
+        raise ValueError(f"Invalid event id: {last_id}")
+    key = _events_key(execution_id)
+    pipe = client.pipeline(transaction=True)
+    pipe.xrange(key, count=1)
+    pipe.xlen(key)
+    pipe.xrange(key, min=f"({last_id}")
+    first, length, entries = await pipe.execute()
+    # Trimming only happens past the cap, so a shorter stream is complete
+    if first and _id_key(first[0][0]) > _id_key(last_id) and length >= settings.EXECUTION_EVENT_STREAM_MAXLEN:
+        return None
+    return entries
+
+
+async def execution_events(
+    client: AsyncRedisClient, hub: EventHub, execution_id: str, last_id: Optional[str] = None
+) -> AsyncIterator[str]:
+    """Yield the server-sent events of an execution until it finishes.
+
+    Starts with the events after ``last_id``, or with a ``snapshot`` event
+    when ``last_id`` is omitted or older than the retained events. A comment
+    is sent every ``SSE_KEEPALIVE_SECONDS`` without events. The subscription
+    is registered before catching up, so no transition falls in between.
+    """
+    subscription = hub.subscribe(execution_id)
+    try:
+        entries = await read_events_after(client, execution_id, last_id) if last_id else None
+        if entries is None:
+            position, snapshot = await read_snapshot(client, execution_id)
+            yield format_event("snapshot", snapshot, position)
+            if snapshot["status"] in FINAL_STATUSES:
+                return
+            entries = []
+        else:
+            position = last_id
+        for entry_id, fields in entries:
+            position = entry_id
+            yield _format_entry(execution_id, entry_id, fields)
+            if _ends_stream(fields):
+                return
+        hub.start_from(execution_id, position)
+
+        while not (subscription.overflowed and subscription.queue.empty()):
+            try:
+                entry_id, fields = await asyncio.wait_for(
+                    subscription.queue.get(), timeout=settings.SSE_KEEPALIVE_SECONDS
+                )
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if _id_key(entry_id) <= _id_key(position):
+                continue
+            position = entry_id
+            yield _format_entry(execution_id, entry_id, fields)
+            if _ends_stream(fields):
+                return
+    finally:
+        hub.unsubscribe(subscription)
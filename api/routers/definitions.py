@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Depends, HTTPException
+from api.dependencies import get_redis
+from api.schemas.workflow import DefinitionRequest, RunRequest
+from api.validator import validate_definition
+from clients.async_redis_client import AsyncRedisClient
+from orchestrator.loader import load_definition_async
+from orchestrator.registry import list_versions, register_definition_async, resolve_version, run_submission
+from orchestrator.submission import store_submissions_async
+from logging_config import get_logger
+
+router = APIRouter()
+logger = get_logger(__name__)
+
+
+@router.post("")
+async def register_definition_endpoint(req: DefinitionRequest, redis: AsyncRedisClient = Depends(get_redis)):
+    logger.info("Received definition registration request for name=%s", req.name)
+    try:
+        topology = validate_definition(req)
+    except ValueError as e:
+        logger.error("Definition validation failed: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+    version, digest, created = await register_definition_async(redis, req.model_dump(mode="json"), topology)
+    return {"name": req.name, "version": version, "digest": digest, "created": created}
+
+
+@router.get("/{name}")
+async def get_definition_versions(name: str, redis: AsyncRedisClient = Depends(get_redis)):
+    logger.info("Listing versions of definition %s", name)
+    versions = await list_versions(redis, name)
+    if not versions:
+        raise HTTPException(status_code=404, detail=f"Definition {name} not found")
+    return {"name": name, "versions": versions}
+
+
+@router.post("/{name}/run")
+async def run_definition(name: str, req: RunRequest, redis: AsyncRedisClient = Depends(get_redis)):
+    logger.info("Run request received for definition %s version=%s", name, req.version or "latest")
+    try:
+        version, digest = await resolve_version(redis, name, req.version)
+        definition = await load_definition_async(redis, digest)
+    except ValueError as e:
+        logger.error("Definition lookup failed: %s", e)
+        raise HTTPException(status_code=404, detail=str(e))
+    try:
+        submission = run_submission(definition, version, req.params, req.priority, req.deadline)
+    except ValueError as e:
+        logger.error("Run parameters rejected: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+    await store_submissions_async(redis, [submission], req.trigger)
+    logger.info("Execution %s of %s version %d accepted", submission.execution_id, name, version)
+    return {
+        "execution_id": submission.execution_id,
+        "name": name,
+        "version": version,
+        "message": "Workflow accepted",
+    }
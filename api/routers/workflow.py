@@ -1,9 +1,14 @@
-from fastapi import APIRouter, HTTPException
-from api.schemas.workflow import WorkflowRequest
-from clients.redis_client import redis_client
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import ValidationError
+from api.dependencies import get_redis
+from api.schemas.workflow import WorkflowBatchRequest, WorkflowRequest
+from clients import codecs
+from clients.async_redis_client import AsyncRedisClient
 from api.validator import validate_workflow
-from orchestrator.models import NodeStatus
-from orchestrator.trigger import trigger_workflow_execution
+from config import settings
+from orchestrator.submission import Submission, store_submissions_async
+from orchestrator.trigger import start_workflow_async
 from orchestrator.redis_keys import RedisKeyTemplates
 import uuid
 from logging_config import get_logger
@@ -13,49 +18,89 @@ logger = get_logger(__name__)
 
 
 @router.post("")
-def submit_workflow(req: WorkflowRequest):
+async def submit_workflow(req: WorkflowRequest, redis: AsyncRedisClient = Depends(get_redis)):
     logger.info("Received workflow submission request for name=%s", req.name)
     try:
-        validate_workflow(req.dag.nodes)
+        submission = _prepare_submission(req)
     except ValueError as e:
         logger.error("Workflow validation failed: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
 
-    execution_id = str(uuid.uuid4())
-    logger.info("Storing workflow %s with execution_id=%s", req.name, execution_id)
-    redis_client.set(
-        RedisKeyTemplates.WORKFLOW.format(execution_id=execution_id),
-        req.model_dump_json(),
-    )
+    await store_submissions_async(redis, [submission])
+    logger.info("Workflow %s queued successfully", submission.execution_id)
+    return {"execution_id": submission.execution_id, "message": "Workflow accepted"}
+
+
+@router.post("/batch")
+async def submit_workflow_batch(req: WorkflowBatchRequest, redis: AsyncRedisClient = Depends(get_redis)):
+    """Validate and store many workflows in one request and one Redis round trip.
 
-    for node in req.dag.nodes:
-        redis_client.set(
-            RedisKeyTemplates.WORKFLOW_NODE.format(
-                execution_id=execution_id, node_id=node.id
-            ),
-            NodeStatus.PENDING.value,
+    Results are returned in request order: ``{"execution_id": ...}`` for each
+    accepted workflow and ``{"error": ...}`` for each rejected one. Rejected
+    workflows do not prevent the others from being stored.
+    """
+    logger.info("Received batch of %d workflows (trigger=%s)", len(req.workflows), req.trigger)
+    if len(req.workflows) > settings.WORKFLOW_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch of {len(req.workflows)} workflows exceeds the limit of {settings.WORKFLOW_BATCH_MAX_SIZE}",
         )
-    redis_client.set(
-        RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id=execution_id),
-        NodeStatus.PENDING.value,
+    results, submissions = await asyncio.to_thread(_prepare_batch, req.workflows)
+    await store_submissions_async(redis, submissions, trigger=req.trigger)
+    accepted = sum(1 for result in results if "execution_id" in result)
+    logger.info("Batch stored: %d accepted, %d rejected", accepted, len(results) - accepted)
+    return {"results": results, "accepted": accepted, "rejected": len(results) - accepted}
+
+
+def _prepare_submission(req: WorkflowRequest) -> Submission:
+    """Validate a workflow and encode it for storage.
+
+    Raises:
+        ValueError: If the DAG is invalid.
+    """
+    topology = validate_workflow(req.dag.nodes)
+    return Submission(
+        execution_id=str(uuid.uuid4()),
+        name=req.name,
+        definition=codecs.codec.dumps_model(req),
+        nodes=req.dag.nodes,
+        topology=topology,
     )
 
-    logger.info("Workflow %s queued successfully", execution_id)
-    return {"execution_id": execution_id, "message": "Workflow accepted"}
+
+def _prepare_batch(items: list[dict]) -> tuple[list[dict], list[Submission]]:
+    """Validate every item in one pass and return the results and the submissions to store.
+
+    Runs in a worker thread, since validation is CPU-bound; the submissions
+    are then stored together through the async client.
+    """
+    results, submissions = [], []
+    for position, item in enumerate(items):
+        try:
+            submission = _prepare_submission(WorkflowRequest.model_validate(item))
+        except ValidationError as e:
+            error = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+            logger.error("Workflow %d of the batch is malformed: %s", position, error)
+            results.append({"error": error})
+            continue
+        except ValueError as e:
+            logger.error("Workflow %d of the batch failed validation: %s", position, e)
+            results.append({"error": str(e)})
+            continue
+        submissions.append(submission)
+        results.append({"execution_id": submission.execution_id})
+    return results, submissions
 
 
 @router.post("/trigger/{execution_id}")
-def trigger_workflow(execution_id: str):
+async def trigger_workflow(execution_id: str, redis: AsyncRedisClient = Depends(get_redis)):
     logger.info("Trigger request received for execution_id=%s", execution_id)
-    if not redis_client.exists(
+    if not await redis.exists(
         RedisKeyTemplates.WORKFLOW.format(execution_id=execution_id)
     ):
         logger.error("Execution ID %s not found", execution_id)
         raise HTTPException(status_code=404, detail="Execution ID not found")
-    trigger_workflow_execution(execution_id)
-    redis_client.set(
-        RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id=execution_id),
-        NodeStatus.RUNNING.value,
-    )
+    await start_workflow_async(redis, execution_id)
     logger.info("Workflow %s triggered", execution_id)
     return {"message": "Workflow triggered", "execution_id": execution_id}
+
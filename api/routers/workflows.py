@@ -1,17 +1,69 @@
-from fastapi import APIRouter, HTTPException
-from orchestrator.loader import load_workflow
-from orchestrator.state import get_all_node_outputs, get_workflow_status
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from api.dependencies import get_event_hub, get_redis
+from api.event_hub import STREAM_ID_PATTERN, EventHub, execution_events
+from api.schemas.workflow import WorkflowStatusBatchRequest
+from clients import blob_store
+from clients.async_redis_client import AsyncRedisClient
+from config import settings
+from orchestrator.index import list_workflows
+from orchestrator.loader import load_workflow_async
+from orchestrator.models import NodeStatus
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.state import get_execution_statuses, parse_workflow_status
 from logging_config import get_logger
 
 router = APIRouter()
 logger = get_logger(__name__)
 
 
+@router.get("")
+async def list_workflows_endpoint(
+    status: Optional[NodeStatus] = None,
+    name: Optional[str] = None,
+    created_after: Optional[int] = Query(None, description="Inclusive lower bound, epoch milliseconds"),
+    created_before: Optional[int] = Query(None, description="Inclusive upper bound, epoch milliseconds"),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    redis: AsyncRedisClient = Depends(get_redis),
+):
+    logger.info("Listing workflows status=%s name=%s cursor=%s", status, name, cursor)
+    try:
+        items, next_cursor = await list_workflows(
+            redis, status, name, created_after, created_before, cursor, limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.post("/status:batch")
+async def get_workflow_statuses_endpoint(req: WorkflowStatusBatchRequest, redis: AsyncRedisClient = Depends(get_redis)):
+    """Return the status and node counts of many executions with one Redis round trip.
+
+    Results are in request order; an unknown execution gets an ``error``
+    entry instead of failing the request.
+    """
+    logger.info("Fetching statuses for %d workflows", len(req.execution_ids))
+    if len(req.execution_ids) > settings.WORKFLOW_STATUS_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Batch of {len(req.execution_ids)} execution ids exceeds the limit of "
+                f"{settings.WORKFLOW_STATUS_BATCH_MAX_SIZE}"
+            ),
+        )
+    return {"statuses": await get_execution_statuses(redis, req.execution_ids)}
+
+
 @router.get("/{execution_id}")
-def get_workflow_status_endpoint(execution_id: str):
+async def get_workflow_status_endpoint(execution_id: str, redis: AsyncRedisClient = Depends(get_redis)):
     logger.info("Fetching status for workflow %s", execution_id)
+    raw = await redis.get(RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id=execution_id))
     try:
-        status = get_workflow_status(execution_id)
+        status = parse_workflow_status(execution_id, raw)
     except ValueError as e:
         logger.error("Error fetching status for %s: %s", execution_id, e)
         raise HTTPException(status_code=404, detail=str(e))
@@ -24,13 +76,49 @@ def get_workflow_status_endpoint(execution_id: str):
 
 
 @router.get("/{execution_id}/results")
-def get_results(execution_id: str):
+async def get_results(execution_id: str, redis: AsyncRedisClient = Depends(get_redis)):
     logger.info("Fetching results for workflow %s", execution_id)
-    workflow = load_workflow(execution_id)
-    node_ids = [node.id for node in workflow.nodes]
-    all_outputs = get_all_node_outputs(execution_id, node_ids)
+    try:
+        workflow = await load_workflow_async(redis, execution_id)
+    except ValueError as e:
+        logger.error("Error fetching results for %s: %s", execution_id, e)
+        raise HTTPException(status_code=404, detail=str(e))
+    outputs = await redis.hgetall_json(RedisKeyTemplates.WORKFLOW_OUTPUTS.format(execution_id=execution_id))
+    all_outputs = {node.id: outputs.get(node.id) or {} for node in workflow.nodes}
+    offloaded = [node_id for node_id, output in all_outputs.items() if blob_store.is_blob_ref(output)]
+    if offloaded:
+        loaded = await asyncio.gather(*(
+            asyncio.to_thread(blob_store.load, all_outputs[node_id]) for node_id in offloaded
+        ))
+        all_outputs.update(zip(offloaded, loaded))
     logger.info("Returning results for workflow %s", execution_id)
     return {
         "execution_id": execution_id,
         "results": all_outputs
     }
+
+
+@router.get("/{execution_id}/events")
+async def stream_workflow_events(
+    execution_id: str,
+    last_event_id: Optional[str] = Query(None, description="Resume after this event id"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    redis: AsyncRedisClient = Depends(get_redis),
+    hub: EventHub = Depends(get_event_hub),
+):
+    """Stream node transitions and workflow status changes as server-sent events.
+
+    Browsers resume with the ``Last-Event-ID`` header on reconnect; the
+    ``last_event_id`` query parameter serves clients that cannot set it.
+    """
+    last_id = last_event_id_header or last_event_id
+    logger.info("Opening event stream for workflow %s after %s", execution_id, last_id)
+    if last_id and not STREAM_ID_PATTERN.match(last_id):
+        raise HTTPException(status_code=400, detail=f"Invalid event id: {last_id}")
+    if not await redis.exists(RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id=execution_id)):
+        raise HTTPException(status_code=404, detail=f"Workflow not found for execution_id={execution_id}")
+    return StreamingResponse(
+        execution_events(redis, hub, execution_id, last_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
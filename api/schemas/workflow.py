@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict
+from orchestrator.models import Priority
 
 
 class Node(BaseModel):
@@ -7,6 +8,9 @@ class Node(BaseModel):
     handler: str
     dependencies: List[str]
     config: Optional[Dict] = {}
+    # Overrides the workflow's priority / deadline (Unix timestamp, seconds)
+    priority: Optional[Priority] = None
+    deadline: Optional[float] = None
 
 
 class DAG(BaseModel):
@@ -16,3 +20,34 @@ class DAG(BaseModel):
 class WorkflowRequest(BaseModel):
     name: str
     dag: DAG
+    priority: Priority = Priority.NORMAL
+    deadline: Optional[float] = None
+
+
+class WorkflowBatchRequest(BaseModel):
+    # Items are parsed as WorkflowRequest one by one, so a malformed item
+    # is reported in its own result instead of rejecting the whole batch
+    workflows: List[Dict[str, Any]]
+    # Start every accepted execution right away
+    trigger: bool = False
+
+
+class WorkflowStatusBatchRequest(BaseModel):
+    execution_ids: List[str]
+
+
+class DefinitionRequest(WorkflowRequest):
+    # Parameters node configs may reference as {{ params.<name> }}, with
+    # their default values; a null default makes the parameter required
+    parameters: Dict[str, Any] = {}
+
+
+class RunRequest(BaseModel):
+    params: Dict[str, Any] = {}
+    # Latest version when omitted
+    version: Optional[int] = None
+    # Override the definition's priority / deadline
+    priority: Optional[Priority] = None
+    deadline: Optional[float] = None
+    # Start the execution right away
+    trigger: bool = False
@@ -1,23 +1,42 @@
-from collections import defaultdict
 from logging_config import get_logger
 
-from api.schemas.workflow import Node
+from api.schemas.workflow import DefinitionRequest, Node
+from orchestrator.models import Topology
+from orchestrator.template import PARAMS_NAMESPACE, template_references
+from orchestrator.topology import topological_sort
+from workers.registry import HANDLER_REGISTRY
 
 
 logger = get_logger(__name__)
 
 
-def validate_workflow(nodes: list[Node]) -> None:
-    """Validate workflow nodes for duplicate IDs, missing deps, and cycles."""
+def validate_workflow(nodes: list[Node]) -> Topology:
+    """Validate workflow nodes and compute their topology.
+
+    Rejects duplicate IDs, unknown handlers, missing dependencies and cycles.
+    The cycle check is Kahn's algorithm, so it runs in O(V + E) and handles
+    arbitrarily deep chains; its topological order, depth levels and children
+    index are returned for the orchestrator to reuse.
+
+    Args:
+        nodes: Nodes of the submitted DAG.
+
+    Returns:
+        Topology: The validated DAG's topology.
+
+    Raises:
+        ValueError: If the DAG is invalid.
+    """
     logger.info("Validating workflow with %d nodes", len(nodes))
-    node_ids = set()
     graph: dict[str, list[str]] = {}
 
     for node in nodes:
-        if node.id in node_ids:
+        if node.id in graph:
             logger.error("Duplicate node id detected: %s", node.id)
             raise ValueError(f"Duplicate node ID: {node.id}")
-        node_ids.add(node.id)
+        if node.handler not in HANDLER_REGISTRY:
+            logger.error("Unknown handler %s referenced by node %s", node.handler, node.id)
+            raise ValueError(f"Unknown handler: {node.handler}")
         graph[node.id] = node.dependencies
 
     for node in nodes:
@@ -26,39 +45,53 @@ def validate_workflow(nodes: list[Node]) -> None:
                 logger.error("Invalid dependency %s referenced by node %s", dep, node.id)
                 raise ValueError(f"Invalid dependency: {dep}")
 
-    if has_cycle(graph):
+    try:
+        topology = topological_sort(graph)
+    except ValueError:
         logger.error("Workflow DAG contains a cycle")
-        raise ValueError("Workflow DAG contains a cycle")
+        raise
 
     logger.info("Workflow validation succeeded")
+    return topology
+
+
+def validate_definition(req: DefinitionRequest) -> Topology:
+    """Validate a definition to register, including its parameter references.
+
+    On top of ``validate_workflow``, every ``{{ params.<name> }}`` template
+    must name a declared parameter, and no node may be called ``params``.
+
+    Returns:
+        Topology: The validated DAG's topology.
+
+    Raises:
+        ValueError: If the definition is invalid.
+    """
+    for node in req.dag.nodes:
+        if node.id == PARAMS_NAMESPACE:
+            raise ValueError(f"Node ID {PARAMS_NAMESPACE} is reserved for parameters")
+    topology = validate_workflow(req.dag.nodes)
+
+    undeclared = sorted({
+        name
+        for node in req.dag.nodes
+        for namespace, name in template_references(node.config or {})
+        if namespace == PARAMS_NAMESPACE and name not in req.parameters
+    })
+    if undeclared:
+        logger.error("Definition %s references undeclared parameters %s", req.name, undeclared)
+        raise ValueError(f"Undeclared parameters: {', '.join(undeclared)}")
+    return topology
 
 
 def has_cycle(graph: dict[str, list[str]]) -> bool:
     """Return True if the directed graph contains a cycle."""
-    logger.info("Checking workflow DAG for cycles")
-    normalized = defaultdict(list, graph)
-    visited = set()
-    rec_stack = set()
-
-    def visit(node: str) -> bool:
-        """Depth-first traversal helper used for cycle detection."""
-        logger.info("Visiting node %s for cycle detection", node)
-        if node in rec_stack:
-            logger.info("Cycle detected via node %s", node)
-            return True
-        if node in visited:
-            return False
-
-        visited.add(node)
-        rec_stack.add(node)
-        for neighbor in normalized[node]:
-            if visit(neighbor):
-                return True
-        rec_stack.remove(node)
-        return False
-
-    for node in normalized:
-        if node not in visited and visit(node):
-            return True
-    logger.info("No cycles detected in workflow DAG")
+    normalized = dict(graph)
+    for deps in graph.values():
+        for dep in deps:
+            normalized.setdefault(dep, [])
+    try:
+        topological_sort(normalized)
+    except ValueError:
+        return True
     return False
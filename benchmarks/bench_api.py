@@ -0,0 +1,82 @@
+"""Compare concurrent status polls on a sync route and on the async API.
+
+The sync route reads through the blocking ``redis_client`` like the API did
+before, so every in-flight request holds one of Starlette's threadpool
+slots. The async route awaits the pooled ``AsyncRedisClient``. Requests go
+through httpx's in-process ASGI transport; client and server share one CPU,
+so throughput mostly reflects per-request overhead, while the thread count
+shows what the sync route needs to keep requests in flight.
+
+Usage:
+    python -m benchmarks.bench_api [requests] [concurrency]
+"""
+
+import asyncio
+import sys
+import threading
+
+import httpx
+from fastapi import FastAPI
+
+from api.routers.workflows import logger
+from benchmarks.common import report, timed
+from clients.redis_client import redis_client
+from main import app, lifespan
+from orchestrator.models import NodeStatus
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.state import get_workflow_status
+
+EXECUTION_ID = "bench-api"
+
+sync_app = FastAPI()
+
+
+@sync_app.get("/workflows/{execution_id}")
+def sync_status(execution_id: str):
+    """The status route as it was before it became async, logging included."""
+    logger.info("Fetching status for workflow %s", execution_id)
+    status = get_workflow_status(execution_id)
+    logger.info("Returning status for workflow %s: %s", execution_id, status)
+    return {"execution_id": execution_id, "status": status}
+
+
+async def _poll(target: FastAPI, requests: int, concurrency: int) -> tuple[float, int]:
+    semaphore = asyncio.Semaphore(concurrency)
+    peak_threads = threading.active_count()
+    transport = httpx.ASGITransport(app=target)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        async def one():
+            nonlocal peak_threads
+            async with semaphore:
+                response = await http.get(f"/workflows/{EXECUTION_ID}")
+                response.raise_for_status()
+            peak_threads = max(peak_threads, threading.active_count())
+
+        with timed() as t:
+            await asyncio.gather(*(one() for _ in range(requests)))
+    return t["seconds"], peak_threads
+
+
+async def _run_async(requests: int, concurrency: int) -> tuple[float, int]:
+    async with lifespan(app):
+        return await _poll(app, requests, concurrency)
+
+
+def run(requests: int, concurrency: int):
+    redis_client.flush()
+    redis_client.set(RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id=EXECUTION_ID), NodeStatus.RUNNING.value)
+    rows = [("route", "requests", "concurrency", "seconds", "requests/s", "peak threads")]
+    for name, (seconds, threads) in (
+        ("sync def + redis_client", asyncio.run(_poll(sync_app, requests, concurrency))),
+        ("async def + pooled AsyncRedisClient", asyncio.run(_run_async(requests, concurrency))),
+    ):
+        rows.append((name, requests, concurrency, f"{seconds:.2f}", f"{requests / seconds:.0f}", threads))
+    report("Concurrent status polls", rows)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(
+        int(args[0]) if len(args) > 0 else 5000,
+        int(args[1]) if len(args) > 1 else 1000,
+    )
@@ -0,0 +1,68 @@
+"""Compare submitting workflows one request at a time and in one batch.
+
+One-by-one submission costs an HTTP request and a Redis round trip per
+workflow, plus another request (and the dispatch of the root nodes in the
+API process) per trigger. ``POST /workflow/batch`` validates every workflow
+and stores them all through one pipeline; with ``trigger`` the owning
+orchestrator dispatches the roots when it reads the trigger events.
+Round trips are counted on the synchronous client the writes go through.
+
+Usage:
+    python -m benchmarks.bench_batch [workflow_count] [nodes_per_workflow]
+"""
+
+import sys
+
+from fastapi.testclient import TestClient
+
+from benchmarks.common import count_round_trips, report, timed
+from clients.redis_client import redis_client
+from main import app
+
+
+def _workflow(node_count: int) -> dict:
+    nodes = [{"id": "n0", "handler": "noop", "dependencies": []}]
+    nodes += [{"id": f"n{i}", "handler": "noop", "dependencies": [f"n{i - 1}"]} for i in range(1, node_count)]
+    return {"name": "bench-batch", "dag": {"nodes": nodes}}
+
+
+def _one_by_one(client: TestClient, workflows: list[dict], trigger: bool) -> int:
+    requests = 0
+    for workflow in workflows:
+        execution_id = client.post("/workflow", json=workflow).json()["execution_id"]
+        requests += 1
+        if trigger:
+            client.post(f"/workflow/trigger/{execution_id}").raise_for_status()
+            requests += 1
+    return requests
+
+
+def _batch(client: TestClient, workflows: list[dict], trigger: bool) -> int:
+    response = client.post("/workflow/batch", json={"workflows": workflows, "trigger": trigger})
+    response.raise_for_status()
+    assert response.json()["accepted"] == len(workflows)
+    return 1
+
+
+def run(workflow_count: int, node_count: int):
+    workflows = [_workflow(node_count) for _ in range(workflow_count)]
+    rows = [("method", "trigger", "HTTP requests", "round trips", "seconds", "workflows/s")]
+    with TestClient(app) as client:
+        for trigger in (False, True):
+            for name, submit in (("POST /workflow each", _one_by_one), ("POST /workflow/batch", _batch)):
+                redis_client.flush()
+                with count_round_trips() as trips, timed() as t:
+                    requests = submit(client, workflows, trigger)
+                rows.append((
+                    name, trigger, requests, trips.count,
+                    f"{t['seconds']:.3f}", f"{workflow_count / t['seconds']:.0f}",
+                ))
+    report(f"Submitting {workflow_count} workflows of {node_count} nodes", rows)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(
+        int(args[0]) if len(args) > 0 else 1000,
+        int(args[1]) if len(args) > 1 else 10,
+    )
@@ -0,0 +1,65 @@
+"""Measure Redis traffic of passing a large output to a downstream node.
+
+One producer node stores its output, the orchestrator resolves the
+consumer's config and queues its task, and the consumer's worker reads the
+task and loads its config. Inline, the output crosses the Redis connection
+four times; offloaded, Redis only carries a reference.
+
+Usage:
+    python -m benchmarks.bench_blobs [output_kb]
+"""
+
+import sys
+import tempfile
+
+from benchmarks.common import report, timed
+from clients import blob_store, codecs
+from clients.redis_client import redis_client
+from config import settings
+from orchestrator.models import NodeStatus
+from orchestrator.state import set_node_status
+from orchestrator.task_queue import STREAM_NAME, push_task
+from orchestrator.template import load_task_config, task_inputs
+from workers.worker import complete_task, parse_message
+
+EXECUTION_ID = "bench-blobs"
+
+
+def _network_bytes() -> int:
+    stats = redis_client._redis.info("stats")
+    return stats["total_net_input_bytes"] + stats["total_net_output_bytes"]
+
+
+def _hop(output: dict) -> dict:
+    set_node_status(EXECUTION_ID, "producer", NodeStatus.QUEUED)
+    complete_task(STREAM_NAME, "0-1", EXECUTION_ID, "producer", codecs.encode(output))
+    payload = {"handler": "noop", **task_inputs(EXECUTION_ID, {"text": "{{ producer.body }}"})}
+    push_task(EXECUTION_ID, "consumer", payload)
+    _, fields = redis_client._redis.xrange(STREAM_NAME, count=1)[0]
+    return load_task_config(parse_message(fields)[3])
+
+
+def run(output_kb: int):
+    output = {"body": "".join(f"row {i};" for i in range(output_kb * 128))[: output_kb * 1024]}
+    rows = [("mode", "redis bytes", "redis used memory", "seconds")]
+    with tempfile.TemporaryDirectory() as root:
+        blob_store.blob_store = blob_store.LocalBlobStore(root)
+        for mode, threshold in (("inline", 0), ("offloaded", settings.BLOB_OFFLOAD_BYTES)):
+            settings.BLOB_OFFLOAD_BYTES = threshold
+            redis_client.flush()
+            before = _network_bytes()
+            with timed() as t:
+                config = _hop(output)
+            assert config["text"] == output["body"]
+            rows.append((
+                mode,
+                _network_bytes() - before,
+                redis_client._redis.info("memory")["used_memory"],
+                f"{t['seconds']:.3f}",
+            ))
+    report(f"Passing a {output_kb} KB output downstream", rows)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(int(args[0]) if args else 4096)
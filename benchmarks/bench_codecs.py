@@ -0,0 +1,73 @@
+"""Compare the installed codecs on typical workflow definitions and outputs.
+
+Usage:
+    python -m benchmarks.bench_codecs [node_count] [iterations]
+"""
+
+import sys
+import time
+
+from api.schemas.workflow import WorkflowRequest
+from benchmarks.common import report
+from clients import codecs
+
+
+def _definition(node_count: int) -> WorkflowRequest:
+    nodes = [
+        {
+            "id": f"node-{i}",
+            "handler": "call_external_service",
+            "dependencies": [f"node-{i - 1}"] if i else [],
+            "config": {"url": f"https://example.com/items/{i}", "input": f"{{{{ node-{i - 1}.data }}}}", "retries": 3},
+        }
+        for i in range(node_count)
+    ]
+    return WorkflowRequest.model_validate({"name": "bench", "dag": {"nodes": nodes}})
+
+
+def _output() -> dict:
+    return {
+        "status": "ok",
+        "data": {"id": 12345, "score": 0.87, "labels": ["alpha", "beta", "gamma"], "valid": True},
+        "items": [{"sku": f"SKU-{i}", "qty": i, "price": i * 1.25} for i in range(50)],
+        "message": "Processed 50 items in 12.5 ms",
+    }
+
+
+def _per_op_us(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def run(node_count: int, iterations: int):
+    definition = _definition(node_count)
+    definition_value = definition.model_dump(mode="json")
+    output = _output()
+    rows = [("codec", "value", "bytes", "encode us", "decode us")]
+    for name in codecs.available_codecs():
+        codec = codecs.get_codec(name)
+        cases = [
+            (f"definition ({node_count} nodes)", lambda: codec.dumps_model(definition), definition_value),
+            ("node output", lambda: codec.dumps(output), output),
+        ]
+        for label, encode, value in cases:
+            encoded = encode()
+            assert codecs.decode(encoded) == value
+            rows.append((
+                name,
+                label,
+                len(encoded.encode("utf-8", "surrogateescape")),
+                f"{_per_op_us(encode, iterations):.1f}",
+                f"{_per_op_us(lambda: codec.loads(encoded), iterations):.1f}",
+            ))
+    report("Codec size and speed", rows)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(
+        int(args[0]) if len(args) > 0 else 200,
+        int(args[1]) if len(args) > 1 else 500,
+    )
@@ -0,0 +1,96 @@
+"""Compare inline submissions with runs of a registered definition.
+
+Every inline submission carries, validates and stores the full DAG, its
+topology and its children index, and each scheduler process parses it once
+per execution. A run of a registered definition stores a reference plus its
+parameters, and every execution shares the definition parsed once per
+process. Bytes per execution sum every key of an execution
+(``workflow:{id}`` and ``workflow:{id}:*``), including the node states and
+counters both kinds store.
+
+Usage:
+    python -m benchmarks.bench_definitions [executions] [nodes]
+"""
+
+import sys
+
+from api.routers.workflow import _prepare_submission
+from api.schemas.workflow import DefinitionRequest, WorkflowRequest
+from api.validator import validate_definition
+from benchmarks.common import report, timed
+from clients.redis_client import redis_client
+from orchestrator.dag_cache import definition_cache, workflow_cache
+from orchestrator.loader import load_definition, load_workflow
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.registry import register_definition, run_submission
+from orchestrator.submission import store_submissions
+
+
+def _definition(node_count: int) -> dict:
+    nodes = [{"id": "n0", "handler": "noop", "dependencies": [], "config": {"url": "http://example.com/{{ params.id }}"}}]
+    nodes += [
+        {"id": f"n{i}", "handler": "noop", "dependencies": [f"n{i - 1}"], "config": {"text": "{{ n%d.data }}" % (i - 1)}}
+        for i in range(1, node_count)
+    ]
+    return {"name": "bench-definition", "dag": {"nodes": nodes}, "parameters": {"id": None}}
+
+
+def _stored_bytes(execution_ids: list[str]) -> int:
+    """Sum the memory of every key of the executions: the record and all ``workflow:{id}:*`` keys."""
+    total = 0
+    for execution_id in execution_ids:
+        record = RedisKeyTemplates.WORKFLOW.format(execution_id=execution_id)
+        keys = [record, *redis_client._redis.scan_iter(f"{record}:*", count=1000)]
+        pipe = redis_client._redis.pipeline()
+        for key in keys:
+            pipe.memory_usage(key)
+        total += sum(usage or 0 for usage in pipe.execute())
+    return total
+
+
+def _load_all(execution_ids: list[str]) -> float:
+    workflow_cache.clear()
+    definition_cache.clear()
+    with timed() as t:
+        for execution_id in execution_ids:
+            load_workflow(execution_id)
+    return t["seconds"]
+
+
+def run(execution_count: int, node_count: int):
+    redis_client.flush()
+    body = _definition(node_count)
+    rows = [("method", "prepare s", "bytes/execution", "load all s")]
+
+    with timed() as prepare:
+        inline = [
+            _prepare_submission(WorkflowRequest.model_validate(body))
+            for _ in range(execution_count)
+        ]
+    store_submissions(inline)
+    ids = [submission.execution_id for submission in inline]
+    rows.append((
+        "inline POST /workflow", f"{prepare['seconds']:.3f}",
+        _stored_bytes(ids) // execution_count, f"{_load_all(ids):.3f}",
+    ))
+
+    request = DefinitionRequest.model_validate(body)
+    version, digest, _ = register_definition(request.model_dump(mode="json"), validate_definition(request))
+    definition = load_definition(digest)
+    with timed() as prepare:
+        runs = [run_submission(definition, version, {"id": str(i)}) for i in range(execution_count)]
+    store_submissions(runs)
+    ids = [submission.execution_id for submission in runs]
+    rows.append((
+        "POST /definitions/{name}/run", f"{prepare['seconds']:.3f}",
+        _stored_bytes(ids) // execution_count, f"{_load_all(ids):.3f}",
+    ))
+    report(f"{execution_count} executions of a {node_count}-node definition", rows)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(
+        int(args[0]) if len(args) > 0 else 1000,
+        int(args[1]) if len(args) > 1 else 50,
+    )
@@ -0,0 +1,103 @@
+"""Compare clients polling an execution with clients following its SSE stream.
+
+Pollers issue what a poll costs the API (the status ``GET`` plus reading the
+node statuses) every ``poll_ms``; SSE subscribers follow
+``api.event_hub.execution_events`` through one ``EventHub``. The execution
+moves each node through RUNNING and COMPLETED at a steady pace. Redis load is
+the ``total_commands_processed`` delta, which includes the transitions
+themselves.
+
+Usage:
+    python -m benchmarks.bench_events [clients] [nodes] [poll_ms]
+"""
+
+import asyncio
+import sys
+
+from api.event_hub import EventHub, execution_events
+from benchmarks.common import report, timed
+from clients.async_redis_client import AsyncRedisClient
+from clients.redis_client import redis_client
+from orchestrator.models import NodeStatus
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.state import init_node_counters, set_node_status, set_node_statuses, set_workflow_status
+
+EXECUTION_ID = "bench-events"
+STEP_SECONDS = 0.02
+
+
+def _commands_processed() -> int:
+    return int(redis_client._redis.info("stats")["total_commands_processed"])
+
+
+def _start_execution(node_count: int):
+    redis_client.flush()
+    init_node_counters(EXECUTION_ID, node_count)
+    set_node_statuses(EXECUTION_ID, {f"n{i}": NodeStatus.PENDING for i in range(node_count)})
+    set_workflow_status(EXECUTION_ID, NodeStatus.RUNNING)
+
+
+async def _drive(node_count: int):
+    # Let every client connect first, so all of them can see every transition
+    await asyncio.sleep(0.2)
+    for i in range(node_count):
+        for status in (NodeStatus.RUNNING, NodeStatus.COMPLETED):
+            await asyncio.to_thread(set_node_status, EXECUTION_ID, f"n{i}", status)
+            await asyncio.sleep(STEP_SECONDS)
+
+
+async def _poll(client: AsyncRedisClient, poll_seconds: float) -> tuple[int, int]:
+    polls, seen, last = 0, 0, None
+    while True:
+        status = await client.get(RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id=EXECUTION_ID))
+        nodes = await client.hgetall_json(RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=EXECUTION_ID))
+        polls += 1
+        if nodes != last:
+            seen, last = seen + 1, nodes
+        if status == NodeStatus.COMPLETED.value:
+            return polls, seen
+        await asyncio.sleep(poll_seconds)
+
+
+async def _follow(client: AsyncRedisClient, hub: EventHub) -> tuple[int, int]:
+    seen = 0
+    async for message in execution_events(client, hub, EXECUTION_ID):
+        seen += message.startswith("id:")
+    return 1, seen
+
+
+async def _scenario(clients: int, node_count: int, follow) -> tuple[int, int, int]:
+    client = AsyncRedisClient()
+    hub = EventHub(client)
+    try:
+        _start_execution(node_count)
+        before = _commands_processed()
+        results = await asyncio.gather(_drive(node_count), *(follow(client, hub) for _ in range(clients)))
+        commands = _commands_processed() - before
+    finally:
+        await hub.close()
+        await client.close()
+    requests = sum(requests for requests, _ in results[1:])
+    seen = min(seen for _, seen in results[1:])
+    return requests, seen, commands
+
+
+def run(clients: int, node_count: int, poll_ms: int):
+    rows = [("method", "clients", "HTTP requests", "states seen (min)", "Redis commands", "seconds")]
+    for name, follow in (
+        (f"poll every {poll_ms} ms", lambda client, hub: _poll(client, poll_ms / 1000)),
+        ("SSE via EventHub", _follow),
+    ):
+        with timed() as t:
+            requests, seen, commands = asyncio.run(_scenario(clients, node_count, follow))
+        rows.append((name, clients, requests, seen, commands, f"{t['seconds']:.2f}"))
+    report(f"Following an execution of {node_count} nodes ({2 * node_count} transitions)", rows)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(
+        int(args[0]) if len(args) > 0 else 200,
+        int(args[1]) if len(args) > 1 else 20,
+        int(args[2]) if len(args) > 2 else 100,
+    )
@@ -0,0 +1,72 @@
+"""Compare listing the last 100 failed executions via indexes and via the keyspace.
+
+Without indexes the only way to find failed executions is to enumerate
+every ``workflow:*:status`` key (``KEYS`` or ``SCAN``) and read each status.
+
+Usage:
+    python -m benchmarks.bench_index [execution_count]
+"""
+
+import asyncio
+import sys
+
+from benchmarks.common import count_round_trips, report, timed
+from clients.async_redis_client import AsyncRedisClient
+from clients.redis_client import redis_client
+from orchestrator.index import iter_execution_ids, list_workflows, register_workflow
+from orchestrator.models import NodeStatus
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.state import set_workflow_status
+
+
+def _populate(execution_count: int):
+    for i in range(execution_count):
+        execution_id = f"bench-{i:07d}"
+        register_workflow(execution_id, f"flow-{i % 10}", created_at=1_000_000 + i)
+        # Pad the keyspace like real executions (definition, node hashes, ...)
+        redis_client._redis.set(RedisKeyTemplates.WORKFLOW.format(execution_id=execution_id), "{}")
+        if i % 10 == 0:
+            set_workflow_status(execution_id, NodeStatus.FAILED)
+
+
+def _scan_failed(limit: int) -> list[str]:
+    failed = []
+    ids = list(iter_execution_ids())
+    pipe = redis_client.pipeline()
+    for execution_id in ids:
+        pipe.get(RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id=execution_id))
+    for execution_id, status in zip(ids, pipe.execute()):
+        if status == NodeStatus.FAILED.value:
+            failed.append(execution_id)
+    return sorted(failed, reverse=True)[:limit]
+
+
+async def _index_failed(limit: int) -> list[str]:
+    client = AsyncRedisClient()
+    try:
+        items, _ = await list_workflows(client, status=NodeStatus.FAILED, limit=limit)
+    finally:
+        await client.close()
+    return [item["execution_id"] for item in items]
+
+
+def run(execution_count: int):
+    redis_client.flush()
+    _populate(execution_count)
+    rows = [("method", "round trips", "seconds")]
+
+    with count_round_trips() as trips, timed() as t:
+        scanned = _scan_failed(100)
+    rows.append(("SCAN + GET every status", trips.count, f"{t['seconds']:.3f}"))
+
+    with count_round_trips() as trips, timed() as t:
+        indexed = asyncio.run(_index_failed(100))
+    rows.append(("status index (ZREVRANGEBYSCORE)", trips.count, f"{t['seconds']:.3f}"))
+
+    assert scanned == indexed
+    report(f"Last 100 failed of {execution_count} executions", rows)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(int(args[0]) if args else 20000)
@@ -0,0 +1,74 @@
+"""Compare Redis memory and key count of the legacy and hash node layouts.
+
+The legacy layout stores every node's status and output under its own key;
+the current one keeps them in two hashes per execution.
+
+Usage:
+    python -m benchmarks.bench_layout [node_count]
+"""
+
+import json
+import sys
+
+from benchmarks.common import report, timed
+from clients.redis_client import redis_client
+from orchestrator.migration import migrate_legacy_node_keys
+from orchestrator.models import NodeStatus
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.state import set_node_output, set_node_statuses
+
+EXECUTION_ID = "bench-layout"
+
+
+def _used_memory() -> int:
+    return redis_client._redis.info("memory")["used_memory"]
+
+
+def _write_legacy(node_ids: list[str]):
+    pipe = redis_client.pipeline()
+    for node_id in node_ids:
+        pipe.set(
+            RedisKeyTemplates.WORKFLOW_NODE.format(execution_id=EXECUTION_ID, node_id=node_id),
+            json.dumps({"status": NodeStatus.COMPLETED.value}),
+        )
+        pipe.set(
+            RedisKeyTemplates.WORKFLOW_NODE_OUTPUT.format(execution_id=EXECUTION_ID, node_id=node_id),
+            json.dumps({"value": node_id}),
+        )
+    pipe.execute()
+
+
+def _write_hashes(node_ids: list[str]):
+    set_node_statuses(EXECUTION_ID, {node_id: NodeStatus.COMPLETED for node_id in node_ids})
+    for node_id in node_ids:
+        set_node_output(EXECUTION_ID, node_id, {"value": node_id})
+
+
+def _measure(name: str, write) -> tuple:
+    redis_client.flush()
+    baseline = _used_memory()
+    write()
+    used = _used_memory() - baseline
+    keys = redis_client._redis.dbsize()
+    with timed() as elapsed:
+        for key in redis_client._redis.scan_iter(match=f"workflow:{EXECUTION_ID}:*", count=1000):
+            redis_client._redis.unlink(key)
+    return name, keys, used, f"{elapsed['seconds']:.3f}"
+
+
+def run(node_count: int):
+    node_ids = [f"node-{i}" for i in range(node_count)]
+    rows = [("layout", "keys", "bytes", "cleanup seconds")]
+    rows.append(_measure("key per node", lambda: _write_legacy(node_ids)))
+    rows.append(_measure("hash per execution", lambda: _write_hashes(node_ids)))
+    report(f"Node state of one {node_count}-node execution", rows)
+
+    redis_client.flush()
+    _write_legacy(node_ids)
+    with timed() as elapsed:
+        moved = migrate_legacy_node_keys()
+    report("Migration", [("values moved", "seconds"), (moved, f"{elapsed['seconds']:.3f}")])
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
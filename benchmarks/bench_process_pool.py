@@ -0,0 +1,45 @@
+"""Compare thread and process execution of a CPU-bound handler.
+
+Usage:
+    python -m benchmarks.bench_process_pool [task_count] [rounds]
+"""
+
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import report, timed
+from workers.handlers import checksum
+from workers.process_pool import pool_size, run_in_process, shutdown_process_pool, start_process_pool
+
+
+def run(task_count: int, rounds: int):
+    payloads = [
+        json.dumps({"handler": "checksum", "config": {"data": f"task-{i}", "rounds": rounds}})
+        for i in range(task_count)
+    ]
+    workers = pool_size()
+    rows = [("execution", "tasks", "seconds", "tasks/s")]
+
+    with ThreadPoolExecutor(max_workers=workers) as threads:
+        with timed() as elapsed:
+            list(threads.map(lambda payload: checksum(json.loads(payload)["config"]), payloads))
+    rows.append((f"threads x{workers}", task_count, f"{elapsed['seconds']:.3f}", f"{task_count / elapsed['seconds']:.1f}"))
+
+    start_process_pool()
+    with ThreadPoolExecutor(max_workers=workers) as threads:
+        with timed() as elapsed:
+            list(threads.map(lambda payload: run_in_process("checksum", payload), payloads))
+    shutdown_process_pool()
+    rows.append((f"processes x{workers}", task_count, f"{elapsed['seconds']:.3f}", f"{task_count / elapsed['seconds']:.1f}"))
+
+    report(f"CPU-bound checksum handler ({rounds} rounds) on {os.cpu_count()} cores", rows)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(
+        int(args[0]) if len(args) > 0 else 32,
+        int(args[1]) if len(args) > 1 else 200_000,
+    )
@@ -0,0 +1,52 @@
+"""Show task stream size under steady load with and without trimming.
+
+Each round queues ``batch`` tasks, lets a worker read and ack them, and (in
+the trimmed run) calls ``trim_task_streams`` like the orchestrator does.
+
+Usage:
+    python -m benchmarks.bench_retention [rounds] [batch]
+"""
+
+import sys
+
+from benchmarks.common import report
+from clients.redis_client import redis_client
+from orchestrator.retention import trim_task_streams
+from orchestrator.task_queue import STREAM_NAME, push_task
+from workers.worker import GROUP
+
+
+def _steady_load(rounds: int, batch: int, trim: bool) -> list[tuple]:
+    redis_client.flush()
+    redis_client._redis.xgroup_create(STREAM_NAME, GROUP, id="0", mkstream=True)
+    samples = []
+    for round_number in range(1, rounds + 1):
+        for i in range(batch):
+            push_task("bench-retention", f"node-{round_number}-{i}", {"handler": "noop", "config": {}})
+        response = redis_client._redis.xreadgroup(GROUP, "bench", {STREAM_NAME: ">"}, count=batch)
+        redis_client._redis.xack(STREAM_NAME, GROUP, *[msg_id for msg_id, _ in response[0][1]])
+        if trim:
+            trim_task_streams([STREAM_NAME])
+        if round_number % max(1, rounds // 5) == 0:
+            samples.append((
+                "trimmed" if trim else "untrimmed",
+                round_number,
+                redis_client._redis.xlen(STREAM_NAME),
+                redis_client._redis.memory_usage(STREAM_NAME) or 0,
+            ))
+    return samples
+
+
+def run(rounds: int, batch: int):
+    rows = [("mode", "round", "entries", "bytes")]
+    rows.extend(_steady_load(rounds, batch, trim=False))
+    rows.extend(_steady_load(rounds, batch, trim=True))
+    report(f"Task stream size over {rounds} rounds of {batch} tasks", rows)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(
+        int(args[0]) if len(args) > 0 else 50,
+        int(args[1]) if len(args) > 1 else 200,
+    )
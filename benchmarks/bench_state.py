@@ -0,0 +1,49 @@
+"""Compare per-node and bulk state access on a large execution.
+
+Usage:
+    python -m benchmarks.bench_state [node_count]
+"""
+
+import sys
+
+from benchmarks.common import count_round_trips, report, timed
+from clients.redis_client import redis_client
+from orchestrator.models import NodeStatus
+from orchestrator.state import (
+    get_node_output,
+    get_node_outputs,
+    get_node_status,
+    get_node_statuses,
+    set_node_output,
+    set_node_status,
+    set_node_statuses,
+)
+
+EXECUTION_ID = "bench-state"
+
+
+def run(node_count: int):
+    redis_client.flush()
+    node_ids = [f"node-{i}" for i in range(node_count)]
+    for node_id in node_ids:
+        set_node_output(EXECUTION_ID, node_id, {"value": node_id})
+
+    rows = [("operation", "round trips", "seconds")]
+    cases = [
+        ("set status (per node)", lambda: [set_node_status(EXECUTION_ID, n, NodeStatus.PENDING) for n in node_ids]),
+        ("set_node_statuses", lambda: set_node_statuses(EXECUTION_ID, {n: NodeStatus.PENDING for n in node_ids})),
+        ("get status (per node)", lambda: [get_node_status(EXECUTION_ID, n) for n in node_ids]),
+        ("get_node_statuses", lambda: get_node_statuses(EXECUTION_ID, node_ids)),
+        ("get output (per node)", lambda: [get_node_output(EXECUTION_ID, n) for n in node_ids]),
+        ("get_node_outputs", lambda: get_node_outputs(EXECUTION_ID, node_ids)),
+    ]
+    for name, case in cases:
+        with count_round_trips() as counter, timed() as elapsed:
+            case()
+        rows.append((name, counter.count, f"{elapsed['seconds']:.4f}"))
+
+    report(f"State access for {node_count} nodes", rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
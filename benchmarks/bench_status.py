@@ -0,0 +1,92 @@
+"""Compare a dashboard refresh through per-execution status polls and one batch.
+
+The per-execution refresh issues ``GET /workflows/{id}`` for every tracked
+execution, ``concurrency`` at a time, and only gets the workflow status.
+``POST /workflows/status:batch`` also returns node counts and reads all of
+it with one pipeline. Requests go through httpx's in-process ASGI transport;
+Redis load is the ``total_commands_processed`` delta.
+
+Usage:
+    python -m benchmarks.bench_status [executions] [nodes_per_workflow] [concurrency]
+"""
+
+import asyncio
+import sys
+import uuid
+
+import httpx
+
+from api.schemas.workflow import WorkflowRequest
+from benchmarks.common import report, timed
+from clients import codecs
+from clients.redis_client import redis_client
+from config import settings
+from main import app, lifespan
+from orchestrator.submission import Submission, store_submissions
+from orchestrator.topology import compute_topology
+
+
+def _commands_processed() -> int:
+    return int(redis_client._redis.info("stats")["total_commands_processed"])
+
+
+def _store_executions(execution_count: int, node_count: int) -> list[str]:
+    redis_client.flush()
+    nodes = [{"id": "n0", "handler": "noop", "dependencies": []}]
+    nodes += [{"id": f"n{i}", "handler": "noop", "dependencies": [f"n{i - 1}"]} for i in range(1, node_count)]
+    req = WorkflowRequest.model_validate({"name": "bench-status", "dag": {"nodes": nodes}})
+    definition, topology = codecs.codec.dumps_model(req), compute_topology(req.dag.nodes)
+    submissions = [
+        Submission(str(uuid.uuid4()), req.name, definition, req.dag.nodes, topology)
+        for _ in range(execution_count)
+    ]
+    store_submissions(submissions)
+    return [submission.execution_id for submission in submissions]
+
+
+async def _each(http: httpx.AsyncClient, execution_ids: list[str], concurrency: int) -> int:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(execution_id: str):
+        async with semaphore:
+            (await http.get(f"/workflows/{execution_id}")).raise_for_status()
+
+    await asyncio.gather(*(one(execution_id) for execution_id in execution_ids))
+    return len(execution_ids)
+
+
+async def _batch(http: httpx.AsyncClient, execution_ids: list[str], concurrency: int) -> int:
+    response = await http.post("/workflows/status:batch", json={"execution_ids": execution_ids})
+    response.raise_for_status()
+    assert len(response.json()["statuses"]) == len(execution_ids)
+    return 1
+
+
+async def _refresh(execution_ids: list[str], concurrency: int) -> list[tuple]:
+    rows = []
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+            for name, refresh in (("GET /workflows/{id} each", _each), ("POST /workflows/status:batch", _batch)):
+                before = _commands_processed()
+                with timed() as t:
+                    requests = await refresh(http, execution_ids, concurrency)
+                rows.append((name, requests, _commands_processed() - before - 1, f"{t['seconds']:.3f}"))
+    return rows
+
+
+def run(execution_count: int, node_count: int, concurrency: int):
+    settings.WORKFLOW_STATUS_BATCH_MAX_SIZE = max(settings.WORKFLOW_STATUS_BATCH_MAX_SIZE, execution_count)
+    execution_ids = _store_executions(execution_count, node_count)
+    rows = [("method", "HTTP requests", "Redis commands", "seconds")]
+    rows += asyncio.run(_refresh(execution_ids, concurrency))
+    report(f"Refreshing {execution_count} executions of {node_count} nodes", rows)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(
+        int(args[0]) if len(args) > 0 else 5000,
+        int(args[1]) if len(args) > 1 else 10,
+        int(args[2]) if len(args) > 2 else 100,
+    )
@@ -0,0 +1,48 @@
+"""Time DAG validation (cycle check and topology) on large generated DAGs.
+
+Usage:
+    python -m benchmarks.bench_validate [node_count]
+"""
+
+import random
+import sys
+
+from api.schemas.workflow import Node
+from api.validator import validate_workflow
+from benchmarks.common import report, timed
+
+
+def chain(node_count: int) -> list[Node]:
+    """One dependency per node: the deepest possible DAG."""
+    return [
+        Node(id=f"n{i}", handler="noop", dependencies=[f"n{i - 1}"] if i else [])
+        for i in range(node_count)
+    ]
+
+
+def layered(node_count: int, width: int = 100, fan_in: int = 3) -> list[Node]:
+    """Layers of ``width`` nodes, each depending on up to ``fan_in`` nodes of the previous layer."""
+    rng = random.Random(0)
+    nodes = []
+    for i in range(node_count):
+        layer_start = (i // width - 1) * width
+        deps = [] if layer_start < 0 else [
+            f"n{layer_start + j}" for j in rng.sample(range(width), fan_in)
+        ]
+        nodes.append(Node(id=f"n{i}", handler="noop", dependencies=deps))
+    return nodes
+
+
+def run(node_count: int):
+    rows = [("dag", "nodes", "edges", "levels", "seconds")]
+    for name, build in (("chain", chain), ("layered", layered)):
+        nodes = build(node_count)
+        with timed() as elapsed:
+            topology = validate_workflow(nodes)
+        edges = sum(len(node.dependencies) for node in nodes)
+        rows.append((name, node_count, edges, max(topology.levels.values()) + 1, f"{elapsed['seconds']:.4f}"))
+    report(f"Validation of {node_count}-node DAGs", rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
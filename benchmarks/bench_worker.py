@@ -0,0 +1,75 @@
+"""Compare serial and threaded workers on an I/O-bound handler.
+
+Also reports the Redis round trips a serial worker spends per ``noop`` task,
+which bound throughput when handlers take no time.
+
+Usage:
+    python -m benchmarks.bench_worker [task_count] [handler_ms] [concurrency]
+"""
+
+import sys
+import time
+
+from benchmarks.common import count_round_trips, report, timed
+from clients.redis_client import redis_client
+from orchestrator.models import NodeStatus
+from orchestrator.state import set_node_statuses
+from orchestrator.task_queue import push_task
+from workers import registry
+from workers.lanes import LaneReader
+from workers.threaded_worker import ThreadedWorker
+from workers.worker import GROUP, handle_message
+
+EXECUTION_ID = "bench-worker"
+
+
+def _queue(task_count: int, handler: str = "bench_io") -> LaneReader:
+    redis_client.flush()
+    lanes = LaneReader(GROUP, "bench-consumer")
+    lanes.ensure_groups()
+    node_ids = [f"node-{i}" for i in range(task_count)]
+    set_node_statuses(EXECUTION_ID, {node_id: NodeStatus.QUEUED for node_id in node_ids})
+    for node_id in node_ids:
+        push_task(EXECUTION_ID, node_id, {"handler": handler, "config": {}})
+    return lanes
+
+
+def run(task_count: int, handler_ms: float, concurrency: int):
+    registry.HANDLER_REGISTRY["bench_io"] = lambda config: time.sleep(handler_ms / 1000) or {"status": "ok"}
+    rows = [("mode", "tasks", "seconds", "tasks/s")]
+
+    lanes = _queue(task_count)
+    with timed() as elapsed:
+        while messages := lanes.read(block_ms=10):
+            for stream, msg_id, fields in messages:
+                handle_message(stream, msg_id, fields)
+    rows.append(("serial", task_count, f"{elapsed['seconds']:.3f}", f"{task_count / elapsed['seconds']:.1f}"))
+
+    lanes = _queue(task_count)
+    worker = ThreadedWorker(concurrency=concurrency, lanes=lanes)
+    with timed() as elapsed:
+        while worker.poll(block_ms=10):
+            pass
+        worker.drain()
+    worker.close()
+    rows.append((f"threaded x{concurrency}", task_count, f"{elapsed['seconds']:.3f}", f"{task_count / elapsed['seconds']:.1f}"))
+
+    report(f"Worker throughput with a {handler_ms:g} ms handler", rows)
+
+    lanes = _queue(task_count, handler="noop")
+    with count_round_trips() as trips, timed() as elapsed:
+        for stream, msg_id, fields in lanes.read(block_ms=10, count=task_count):
+            handle_message(stream, msg_id, fields)
+    report("Serial worker on noop tasks (excluding the read)", [
+        ("tasks", "round trips/task", "tasks/s"),
+        (task_count, f"{(trips.count - 1) / task_count:.1f}", f"{task_count / elapsed['seconds']:.1f}"),
+    ])
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(
+        int(args[0]) if len(args) > 0 else 200,
+        float(args[1]) if len(args) > 1 else 100,
+        int(args[2]) if len(args) > 2 else 64,
+    )
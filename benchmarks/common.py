@@ -0,0 +1,80 @@
+"""Helpers shared by the benchmark scripts.
+
+Benchmarks talk to the Redis instance configured in ``config.py`` and flush it
+before running, exactly like the test suite. Never point them at a production
+deployment.
+"""
+
+import time
+from contextlib import contextmanager
+
+from redis.asyncio.client import Pipeline as AsyncPipeline, Redis as AsyncRedis
+from redis.client import Pipeline, Redis
+
+
+class RoundTripCounter:
+    """Count client/server round trips issued through redis-py.
+
+    Every command sent outside a pipeline is one round trip; a pipeline
+    ``execute`` is one round trip no matter how many commands it carries.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+
+@contextmanager
+def count_round_trips():
+    """Patch redis-py, sync and ``redis.asyncio``, for the duration of the block and yield a counter."""
+    counter = RoundTripCounter()
+    original_execute_command = Redis.execute_command
+    original_pipeline_execute = Pipeline.execute
+    original_async_execute_command = AsyncRedis.execute_command
+    original_async_pipeline_execute = AsyncPipeline.execute
+
+    def execute_command(self, *args, **kwargs):
+        counter.count += 1
+        return original_execute_command(self, *args, **kwargs)
+
+    def pipeline_execute(self, *args, **kwargs):
+        counter.count += 1
+        return original_pipeline_execute(self, *args, **kwargs)
+
+    async def async_execute_command(self, *args, **kwargs):
+        counter.count += 1
+        return await original_async_execute_command(self, *args, **kwargs)
+
+    async def async_pipeline_execute(self, *args, **kwargs):
+        counter.count += 1
+        return await original_async_pipeline_execute(self, *args, **kwargs)
+
+    Redis.execute_command = execute_command
+    Pipeline.execute = pipeline_execute
+    AsyncRedis.execute_command = async_execute_command
+    AsyncPipeline.execute = async_pipeline_execute
+    try:
+        yield counter
+    finally:
+        Redis.execute_command = original_execute_command
+        Pipeline.execute = original_pipeline_execute
+        AsyncRedis.execute_command = original_async_execute_command
+        AsyncPipeline.execute = original_async_pipeline_execute
+
+
+@contextmanager
+def timed():
+    """Yield a dict whose ``seconds`` entry holds the elapsed wall time on exit."""
+    result = {"seconds": 0.0}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["seconds"] = time.perf_counter() - start
+
+
+def report(title: str, rows: list[tuple]):
+    """Print a small aligned table of benchmark results."""
+    print(f"\n{title}")
+    widths = [max(len(str(row[i])) for row in rows) for i in range(len(rows[0]))]
+    for row in rows:
+        print("  ".join(str(cell).ljust(width) for cell, width in zip(row, widths)))
@@ -0,0 +1,158 @@
+import redis.asyncio as aioredis
+from typing import Any, Optional
+from logging_config import get_logger
+from clients import codecs
+from config import settings
+
+logger = get_logger(__name__)
+
+
+class AsyncRedisClient:
+    """asyncio counterpart of ``RedisClient`` built on ``redis.asyncio``.
+
+    Commands share a ``BlockingConnectionPool`` of at most ``max_connections``
+    connections: when all are busy, callers wait up to ``REDIS_POOL_TIMEOUT``
+    seconds for one instead of opening more. Connections belong to the event
+    loop that opened them, so create one client per loop (e.g. inside
+    ``asyncio.run`` or the FastAPI lifespan) and ``close`` it when done.
+    """
+
+    def __init__(self, max_connections: Optional[int] = None):
+        max_connections = max_connections or settings.REDIS_MAX_CONNECTIONS
+        logger.info(
+            "Initializing async Redis client host=%s port=%s db=%s max_connections=%d",
+            settings.REDIS_HOST,
+            settings.REDIS_PORT,
+            settings.REDIS_DB,
+            max_connections,
+        )
+        pool = aioredis.BlockingConnectionPool(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            max_connections=max_connections,
+            timeout=settings.REDIS_POOL_TIMEOUT,
+            decode_responses=True,
+            encoding_errors="surrogateescape",
+            socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+        )
+        self._redis = aioredis.Redis.from_pool(pool)
+        self._scripts = {}
+
+    async def ping(self) -> bool:
+        return await self._redis.ping()
+
+    async def get(self, key: str) -> Optional[str]:
+        logger.info("Getting value for key=%s", key)
+        return await self._redis.get(key)
+
+    async def mget(self, keys: list[str]) -> list[Optional[str]]:
+        logger.info("Getting %d raw values", len(keys))
+        return await self._redis.mget(keys)
+
+    async def exists(self, key: str) -> bool:
+        logger.info("Checking existence for key=%s", key)
+        return await self._redis.exists(key) > 0
+
+    async def hgetall_json(self, key: str) -> dict[str, Any]:
+        """Fetch and decode every field of a hash; undecodable values become ``None``."""
+        logger.info("Getting all JSON hash fields for key=%s", key)
+        decoded = {}
+        for field, val in (await self._redis.hgetall(key)).items():
+            try:
+                decoded[field] = codecs.decode(val)
+            except ValueError:
+                logger.error("Failed to decode value for key=%s field=%s", key, field)
+                decoded[field] = None
+        return decoded
+
+    async def hgetall(self, key: str) -> dict[str, str]:
+        logger.info("Getting all hash fields for key=%s", key)
+        return await self._redis.hgetall(key)
+
+    async def hmget_json(self, key: str, fields: list[str]) -> list[Optional[Any]]:
+        """Fetch and decode several hash fields with one HMGET; missing or undecodable values become ``None``."""
+        logger.info("Getting %d JSON hash fields for key=%s", len(fields), key)
+        if not fields:
+            return []
+        decoded = []
+        for field, val in zip(fields, await self._redis.hmget(key, fields)):
+            try:
+                decoded.append(codecs.decode(val) if val is not None else None)
+            except ValueError:
+                logger.error("Failed to decode value for key=%s field=%s", key, field)
+                decoded.append(None)
+        return decoded
+
+    async def hexists(self, key: str, field: str) -> bool:
+        logger.info("Checking hash field %s for key=%s", field, key)
+        return bool(await self._redis.hexists(key, field))
+
+    async def hset(self, key: str, mapping: dict):
+        logger.info("Setting hash fields for key=%s", key)
+        return await self._redis.hset(key, mapping=mapping)
+
+    async def zrevrangebyscore(self, key: str, max_score, min_score, start: int = 0, num: int = 100) -> list[tuple[str, float]]:
+        """Return ``(member, score)`` pairs scored within the bounds, highest first."""
+        logger.info("Reading sorted set key=%s in reverse", key)
+        return await self._redis.zrevrangebyscore(key, max_score, min_score, start=start, num=num, withscores=True)
+
+    async def lindex(self, key: str, index: int) -> Optional[str]:
+        logger.info("Getting list element %d for key=%s", index, key)
+        return await self._redis.lindex(key, index)
+
+    async def lrange(self, key: str, start: int = 0, end: int = -1) -> list[str]:
+        logger.info("Getting list range for key=%s", key)
+        return await self._redis.lrange(key, start, end)
+
+    async def smembers(self, key: str):
+        logger.info("Retrieving set members for key=%s", key)
+        return await self._redis.smembers(key)
+
+    async def sismember(self, key: str, value: str) -> bool:
+        logger.info("Checking set membership for key=%s", key)
+        return bool(await self._redis.sismember(key, value))
+
+    async def sadd(self, key: str, value: str):
+        logger.info("Adding value to set key=%s", key)
+        await self._redis.sadd(key, value)
+
+    async def srem(self, key: str, value: str):
+        logger.info("Removing value from set key=%s", key)
+        await self._redis.srem(key, value)
+
+    async def xread(self, streams: dict, count: Optional[int] = None, block: Optional[int] = None):
+        logger.debug("Reading from streams=%s", list(streams.keys()))
+        return await self._redis.xread(streams=streams, count=count, block=block)
+
+    async def xreadgroup(self, groupname: str, consumername: str, streams: dict, count: int = 1, block: Optional[int] = None):
+        logger.debug("Reading from stream with group=%s consumer=%s", groupname, consumername)
+        return await self._redis.xreadgroup(
+            groupname=groupname, consumername=consumername, streams=streams, count=count, block=block
+        )
+
+    async def xack(self, stream: str, group: str, *ids: str) -> int:
+        logger.debug("Acknowledging %d messages on stream=%s", len(ids), stream)
+        return await self._redis.xack(stream, group, *ids)
+
+    def register_script(self, script: str):
+        """Return a callable running ``script`` with EVALSHA, awaited like any command.
+
+        Scripts are registered once per client, so callers may ask for one on
+        every request.
+        """
+        if script not in self._scripts:
+            self._scripts[script] = self._redis.register_script(script)
+        return self._scripts[script]
+
+    def pipeline(self, transaction: bool = False):
+        """Return a raw redis.asyncio pipeline for batching commands in one round trip."""
+        logger.info("Opening async Redis pipeline transaction=%s", transaction)
+        return self._redis.pipeline(transaction=transaction)
+
+    async def close(self):
+        """Close the client and disconnect every pooled connection."""
+        logger.info("Closing async Redis client")
+        await self._redis.aclose()
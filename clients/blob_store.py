@@ -0,0 +1,146 @@
+"""Blob storage for node outputs too large to keep inline in Redis.
+
+An output whose encoded size exceeds ``BLOB_OFFLOAD_BYTES`` is compressed
+with zlib and written to the blob store once, by the worker that produced
+it. Redis keeps a small reference in its place (``{"$blob": key, ...}``),
+which the orchestrator passes on to downstream tasks unchanged; only the
+worker that consumes the output loads it, right before calling its handler.
+
+The default backend is a local directory. Every process that reads or
+writes outputs (workers, orchestrators, the API) must see the same
+directory, e.g. a shared volume.
+"""
+
+import os
+import tempfile
+import uuid
+import zlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any
+from logging_config import get_logger
+from clients import codecs
+from config import settings
+
+logger = get_logger(__name__)
+
+BLOB_REF = "$blob"
+
+
+class BlobStore(ABC):
+    """Store opaque byte strings under slash-separated keys."""
+
+    @abstractmethod
+    def put(self, key: str, data: bytes):
+        ...
+
+    @abstractmethod
+    def get(self, key: str) -> bytes:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str):
+        ...
+
+
+class LocalBlobStore(BlobStore):
+    """Blob store backed by files under ``root``."""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root.resolve()):
+            raise ValueError(f"Invalid blob key: {key}")
+        return path
+
+    def put(self, key: str, data: bytes):
+        """Write a blob atomically, so readers never see a partial file."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def get(self, key: str) -> bytes:
+        """Read a blob.
+
+        Raises:
+            ValueError: If no blob is stored under ``key``.
+        """
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            raise ValueError(f"Blob not found: {key}")
+
+    def delete(self, key: str):
+        self._path(key).unlink(missing_ok=True)
+
+
+blob_store: BlobStore = LocalBlobStore(settings.BLOB_STORE_PATH)
+
+
+def is_blob_ref(value: Any) -> bool:
+    """Return True if ``value`` is a reference to an offloaded output."""
+    return isinstance(value, dict) and isinstance(value.get(BLOB_REF), str)
+
+
+def should_offload(encoded: str) -> bool:
+    """Return True if ``offload`` would move ``encoded`` to the blob store."""
+    threshold = settings.BLOB_OFFLOAD_BYTES
+    return bool(threshold) and len(encoded) > threshold
+
+
+def offload(encoded: str, key_prefix: str) -> str:
+    """Move an encoded value to the blob store if it is over the size threshold.
+
+    Args:
+        encoded: Value encoded with ``clients.codecs``.
+        key_prefix: Prefix of the blob key, e.g. ``<execution_id>/<node_id>``.
+
+    Returns:
+        str: ``encoded`` itself if it is small enough, otherwise the encoded
+        reference to store in its place.
+    """
+    if not should_offload(encoded):
+        return encoded
+    data = encoded.encode("utf-8", "surrogateescape")
+    compressed = zlib.compress(data, settings.BLOB_COMPRESSION_LEVEL)
+    key = f"{key_prefix}/{uuid.uuid4().hex}.z"
+    blob_store.put(key, compressed)
+    logger.info("Offloaded %d bytes (%d compressed) to blob %s", len(data), len(compressed), key)
+    return codecs.encode({BLOB_REF: key, "size": len(data)})
+
+
+def load(ref: dict) -> Any:
+    """Fetch, decompress and decode the value a blob reference points to.
+
+    Raises:
+        ValueError: If the blob is missing or cannot be decoded.
+    """
+    try:
+        data = zlib.decompress(blob_store.get(ref[BLOB_REF]))
+    except zlib.error as e:
+        raise ValueError(f"Corrupt blob {ref[BLOB_REF]}: {e}") from e
+    return codecs.decode(data.decode("utf-8", "surrogateescape"))
+
+
+def resolve(value: Any) -> Any:
+    """Return ``value`` with a blob reference replaced by the value it points to."""
+    return load(value) if is_blob_ref(value) else value
+
+
+def discard(encoded: str):
+    """Delete the blob behind an encoded reference that was never committed."""
+    try:
+        value = codecs.decode(encoded)
+    except ValueError:
+        return
+    if is_blob_ref(value):
+        blob_store.delete(value[BLOB_REF])
@@ -0,0 +1,160 @@
+"""Serialization codecs for values stored in Redis.
+
+Two kinds of values are stored:
+
+* Values Lua scripts decode with ``cjson`` (node records, the readiness
+  index) must be JSON. They go through ``json_codec``, the standard
+  library's encoder, whatever else is installed.
+* Opaque values that only Python reads (workflow definitions, topology,
+  task payloads, node outputs) go through ``codec``, selected with the
+  ``REDIS_CODEC`` setting. ``orjson`` is only used when named there: it
+  writes NaN and infinities as ``null`` where the standard library keeps
+  them, so switching to it is a deliberate choice.
+
+JSON is stored untagged, so data written before codecs existed stays
+readable. Binary formats start with a one-character tag, and ``decode``
+dispatches on it, so data written with different codecs can be read side by
+side. Binary values travel through the ``decode_responses`` Redis client as
+``str`` decoded with ``surrogateescape``, which round-trips arbitrary bytes.
+"""
+
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+from pydantic import BaseModel
+from logging_config import get_logger
+from config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - depends on the environment
+    msgpack = None
+
+logger = get_logger(__name__)
+
+MSGPACK_TAG = "\x01"
+
+
+def _to_text(data: bytes) -> str:
+    return data.decode("utf-8", "surrogateescape")
+
+
+def _to_bytes(text: str) -> bytes:
+    return text.encode("utf-8", "surrogateescape")
+
+
+class Codec(ABC):
+    """Encode values to the ``str`` stored in Redis and decode them back."""
+
+    name = ""
+
+    @abstractmethod
+    def dumps(self, value: Any) -> str:
+        ...
+
+    @abstractmethod
+    def loads(self, data: str) -> Any:
+        ...
+
+    def dumps_model(self, model: BaseModel) -> str:
+        """Encode a pydantic model in one pass."""
+        return self.dumps(model.model_dump(mode="json"))
+
+
+class JsonCodec(Codec):
+    """Compact JSON via the standard library."""
+
+    name = "json"
+
+    def dumps(self, value: Any) -> str:
+        return json.dumps(value, separators=(",", ":"))
+
+    def loads(self, data: str) -> Any:
+        return json.loads(data)
+
+    def dumps_model(self, model: BaseModel) -> str:
+        return model.model_dump_json()
+
+
+class OrjsonCodec(JsonCodec):
+    """JSON via ``orjson``, several times faster than ``JsonCodec``.
+
+    Non-string keys are stringified like the standard library does, but NaN
+    and infinities are written as ``null``.
+    """
+
+    name = "orjson"
+
+    def dumps(self, value: Any) -> str:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, data: str) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackCodec(Codec):
+    """Tagged MessagePack: smaller than JSON, but opaque to Lua scripts."""
+
+    name = "msgpack"
+
+    def dumps(self, value: Any) -> str:
+        return MSGPACK_TAG + _to_text(msgpack.packb(value))
+
+    def loads(self, data: str) -> Any:
+        return msgpack.unpackb(_to_bytes(data[len(MSGPACK_TAG):]), raw=False)
+
+
+_REQUIREMENTS = {"orjson": orjson, "msgpack": msgpack}
+_CODECS = {codec.name: codec for codec in (JsonCodec, OrjsonCodec, MsgpackCodec)}
+
+
+def available_codecs() -> list[str]:
+    """Return the names of the codecs whose libraries are installed."""
+    return [name for name in _CODECS if _REQUIREMENTS.get(name, json) is not None]
+
+
+def get_codec(name: str) -> Codec:
+    """Return the codec called ``name``; ``auto`` is an alias of ``json``.
+
+    Raises:
+        ValueError: If the codec is unknown or its library is not installed.
+    """
+    if name == "auto":
+        name = "json"
+    if name not in _CODECS:
+        raise ValueError(f"Unknown codec: {name}")
+    if name not in available_codecs():
+        raise ValueError(f"Codec {name} requires the {name} package")
+    return _CODECS[name]()
+
+
+json_codec = get_codec("json")
+codec = get_codec(settings.REDIS_CODEC)
+_msgpack_codec: Optional[Codec] = MsgpackCodec() if msgpack is not None else None
+
+
+def decode(data: str) -> Any:
+    """Decode a value written by any codec, dispatching on its format tag.
+
+    Raises:
+        ValueError: If the value is not valid in its format, or was written
+            with a codec whose library is not installed here.
+    """
+    if data.startswith(MSGPACK_TAG):
+        if _msgpack_codec is None:
+            raise ValueError("Value is msgpack-encoded but msgpack is not installed")
+        try:
+            return _msgpack_codec.loads(data)
+        except Exception as e:
+            raise ValueError(f"Invalid msgpack value: {e}") from e
+    return json_codec.loads(data)
+
+
+def encode(value: Any) -> str:
+    """Encode an opaque value with the configured codec."""
+    return codec.dumps(value)
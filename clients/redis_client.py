@@ -1,7 +1,7 @@
 import redis
-import json
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 from logging_config import get_logger
+from clients import codecs
 from config import settings
 
 logger = get_logger(__name__)
@@ -20,8 +20,11 @@ class RedisClient:
             port=settings.REDIS_PORT,
             db=settings.REDIS_DB,
             decode_responses=True,
-            socket_connect_timeout=5,
-            socket_timeout=5
+            # Lets binary codec values round-trip through str responses
+            encoding_errors="surrogateescape",
+            socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
         )
 
     def get_json(self, key: str) -> Optional[dict]:
@@ -31,19 +34,109 @@ class RedisClient:
             logger.info("Key %s not found", key)
             return None
         try:
-            return json.loads(val)
-        except json.JSONDecodeError:
-            logger.error("Failed to decode JSON for key=%s", key)
+            return codecs.decode(val)
+        except ValueError:
+            logger.error("Failed to decode value for key=%s", key)
             return None
 
     def set_json(self, key: str, value: dict, ex: Optional[int] = None) -> bool:
         logger.info("Setting JSON value for key=%s", key)
         try:
-            return self._redis.set(key, json.dumps(value), ex=ex)
+            return self._redis.set(key, codecs.json_codec.dumps(value), ex=ex)
         except (TypeError, ValueError):
             logger.error("Invalid JSON value provided for key=%s", key)
             return False
 
+    def set_encoded(self, key: str, value: Any) -> bool:
+        """Store a value only Python reads, encoded with the configured codec."""
+        logger.info("Setting encoded value for key=%s", key)
+        return self._redis.set(key, codecs.encode(value))
+
+    def mget_json(self, keys: list[str]) -> list[Optional[dict]]:
+        """Fetch and decode several values with a single MGET.
+
+        Values may be JSON or written by any codec. Missing keys and values
+        that fail to decode come back as ``None``.
+        """
+        logger.info("Getting JSON values for %d keys", len(keys))
+        if not keys:
+            return []
+        decoded = []
+        for key, val in zip(keys, self._redis.mget(keys)):
+            if val is None:
+                decoded.append(None)
+                continue
+            try:
+                decoded.append(codecs.decode(val))
+            except ValueError:
+                logger.error("Failed to decode value for key=%s", key)
+                decoded.append(None)
+        return decoded
+
+    def mset_json(self, mapping: dict[str, Any]) -> bool:
+        """Encode and store several JSON values with a single MSET."""
+        logger.info("Setting JSON values for %d keys", len(mapping))
+        if not mapping:
+            return True
+        return self._redis.mset({key: codecs.json_codec.dumps(value) for key, value in mapping.items()})
+
+    def hget_json(self, key: str, field: str) -> Optional[dict]:
+        logger.info("Getting JSON hash field %s for key=%s", field, key)
+        val = self._redis.hget(key, field)
+        if val is None:
+            return None
+        try:
+            return codecs.decode(val)
+        except ValueError:
+            logger.error("Failed to decode value for key=%s field=%s", key, field)
+            return None
+
+    def hmget_json(self, key: str, fields: list[str]) -> list[Optional[dict]]:
+        """Fetch and decode several hash fields with a single HMGET.
+
+        Values may be JSON or written by any codec. Missing fields and values
+        that fail to decode come back as ``None``.
+        """
+        logger.info("Getting %d JSON hash fields for key=%s", len(fields), key)
+        if not fields:
+            return []
+        decoded = []
+        for field, val in zip(fields, self._redis.hmget(key, fields)):
+            if val is None:
+                decoded.append(None)
+                continue
+            try:
+                decoded.append(codecs.decode(val))
+            except ValueError:
+                logger.error("Failed to decode value for key=%s field=%s", key, field)
+                decoded.append(None)
+        return decoded
+
+    def hgetall_json(self, key: str) -> dict[str, Optional[dict]]:
+        """Fetch and decode every field of a hash with HGETALL.
+
+        Values may be JSON or written by any codec; values that fail to
+        decode come back as ``None``.
+        """
+        logger.info("Getting all JSON hash fields for key=%s", key)
+        decoded = {}
+        for field, val in self._redis.hgetall(key).items():
+            try:
+                decoded[field] = codecs.decode(val)
+            except ValueError:
+                logger.error("Failed to decode value for key=%s field=%s", key, field)
+                decoded[field] = None
+        return decoded
+
+    def hset_json(self, key: str, field: str, value: dict) -> int:
+        logger.info("Setting JSON hash field %s for key=%s", field, key)
+        return self._redis.hset(key, field, codecs.json_codec.dumps(value))
+
+    def hset_encoded(self, key: str, field: str, value: Any) -> int:
+        """Store a hash field only Python reads, encoded with the configured codec."""
+        logger.info("Setting encoded hash field %s for key=%s", field, key)
+        return self._redis.hset(key, field, codecs.encode(value))
+
     def exists(self, key: str) -> bool:
         logger.info("Checking existence for key=%s", key)
         return self._redis.exists(key) > 0
@@ -51,28 +144,49 @@ class RedisClient:
     def set(self, key: str, value: Any, ex: Optional[int] = None) -> bool:
         logger.info("Setting value for key=%s", key)
         if isinstance(value, (dict, list)):
-            value = json.dumps(value)
+            value = codecs.json_codec.dumps(value)
         return self._redis.set(key, value, ex=ex)
 
     def get(self, key: str) -> Optional[str]:
         logger.info("Getting value for key=%s", key)
         return self._redis.get(key)
 
+    def mget(self, keys: list[str]) -> list[Optional[str]]:
+        logger.info("Getting %d raw values", len(keys))
+        return self._redis.mget(keys)
+
     def xadd(self, stream: str, fields: dict, maxlen: Optional[int] = None) -> str:
         logger.info("Adding entry to stream=%s with fields=%s", stream, list(fields.keys()))
         safe_fields = {
-            k: json.dumps(v) if isinstance(v, (dict, list)) else str(v)
+            k: codecs.json_codec.dumps(v) if isinstance(v, (dict, list)) else str(v)
             for k, v in fields.items()
         }
         return self._redis.xadd(name=stream, fields=safe_fields, maxlen=maxlen)
 
+    def xread(self, streams: dict, count: Optional[int] = None, block: Optional[int] = None):
+        logger.debug("Reading from streams=%s", list(streams.keys()))
+        return self._redis.xread(streams=streams, count=count, block=block)
+
+    def xrevrange(self, stream: str, max: str = "+", min: str = "-", count: Optional[int] = None):
+        logger.info("Reading stream=%s in reverse", stream)
+        return self._redis.xrevrange(name=stream, max=max, min=min, count=count)
+
     def flush(self):
         logger.warning("Flushing all Redis keys")
         self._redis.flushall()
 
+    def scan_iter(self, pattern: str = "*", count: int = 1000) -> Iterator[str]:
+        """Iterate over matching keys with SCAN, a batch of ``count`` at a time.
+
+        Unlike ``KEYS`` this never blocks Redis for long, but keys written
+        or deleted during the iteration may or may not be returned.
+        """
+        logger.info("Scanning keys with pattern=%s", pattern)
+        return self._redis.scan_iter(match=pattern, count=count)
+
     def keys(self, pattern: str = "*") -> list:
-        logger.info("Listing keys with pattern=%s", pattern)
-        return self._redis.keys(pattern)
+        """Return every key matching ``pattern``, collected with SCAN rather than KEYS."""
+        return list(self.scan_iter(pattern))
 
     def xreadgroup(
             self,
@@ -84,7 +198,7 @@ class RedisClient:
             noack: bool = False,
             claim_min_idle_time: Optional[int] = None,
     ):
-        logger.info(
+        logger.debug(
             "Reading from stream with group=%s consumer=%s", groupname, consumername
         )
         return self._redis.xreadgroup(
@@ -114,10 +228,39 @@ class RedisClient:
             else:
                 raise
 
+    def hset(self, key: str, mapping: dict):
+        logger.info("Setting hash fields for key=%s", key)
+        return self._redis.hset(key, mapping=mapping)
+
+    def hexists(self, key: str, field: str) -> bool:
+        logger.info("Checking hash field %s for key=%s", field, key)
+        return bool(self._redis.hexists(key, field))
+
+    def hgetall(self, key: str) -> dict:
+        logger.info("Retrieving hash for key=%s", key)
+        return self._redis.hgetall(key)
+
+    def pipeline(self, transaction: bool = False):
+        """Return a raw redis-py pipeline for batching several commands in one round trip."""
+        logger.info("Opening Redis pipeline transaction=%s", transaction)
+        return self._redis.pipeline(transaction=transaction)
+
+    def register_script(self, source: str):
+        """Register a Lua script; it is loaded lazily and invoked via EVALSHA."""
+        return self._redis.register_script(source)
+
+    def zrem(self, key: str, *members: str):
+        logger.info("Removing %d members from sorted set key=%s", len(members), key)
+        return self._redis.zrem(key, *members)
+
     def smembers(self, key: str):
         logger.info("Retrieving set members for key=%s", key)
         return self._redis.smembers(key)
 
+    def sismember(self, key: str, value: str) -> bool:
+        logger.info("Checking set membership for key=%s", key)
+        return bool(self._redis.sismember(key, value))
+
     def sadd(self, key: str, value: str):
         logger.info("Adding value to set key=%s", key)
         self._redis.sadd(key, value)
@@ -1,3 +1,4 @@
+import os
 import socket
 
 from pydantic_settings import BaseSettings
@@ -9,15 +10,93 @@ class Settings(BaseSettings):
     REDIS_HOST: str = Field(default="localhost", validation_alias="REDIS_HOST")
     REDIS_PORT: int = Field(default=6379, validation_alias="REDIS_PORT")
     REDIS_DB: int = Field(default=0, validation_alias="REDIS_DB")
+    REDIS_SOCKET_TIMEOUT: float = Field(default=5, validation_alias="REDIS_SOCKET_TIMEOUT")
+    REDIS_CONNECT_TIMEOUT: float = Field(default=5, validation_alias="REDIS_CONNECT_TIMEOUT")
+    # Idle connections are PINGed before reuse after this many seconds (0 disables)
+    REDIS_HEALTH_CHECK_INTERVAL: float = Field(default=30, validation_alias="REDIS_HEALTH_CHECK_INTERVAL")
+    # Async pool (API service): at most MAX_CONNECTIONS, callers wait up to
+    # POOL_TIMEOUT seconds for a free connection
+    REDIS_MAX_CONNECTIONS: int = Field(default=100, validation_alias="REDIS_MAX_CONNECTIONS")
+    REDIS_POOL_TIMEOUT: float = Field(default=20, validation_alias="REDIS_POOL_TIMEOUT")
+
+    # Codec for values only Python reads (definitions, payloads, outputs):
+    # "json", "orjson" or "msgpack" ("auto" is kept as an alias of "json")
+    REDIS_CODEC: str = Field(default="json", validation_alias="REDIS_CODEC")
+
+    # Node outputs whose encoded size exceeds OFFLOAD_BYTES (0 disables) are
+    # compressed and written to the blob store; Redis keeps a reference
+    BLOB_OFFLOAD_BYTES: int = Field(default=64 * 1024, validation_alias="BLOB_OFFLOAD_BYTES")
+    BLOB_COMPRESSION_LEVEL: int = Field(default=6, validation_alias="BLOB_COMPRESSION_LEVEL")
+    BLOB_STORE_PATH: str = Field(default="/tmp/workflow-blobs", validation_alias="BLOB_STORE_PATH")
 
     # Optional app-wide settings
     ENVIRONMENT: str = Field(default="development", validation_alias="ENVIRONMENT")
     DEBUG: bool = Field(default=True, validation_alias="DEBUG")
 
+    # API: maximum number of workflows in one POST /workflow/batch
+    WORKFLOW_BATCH_MAX_SIZE: int = Field(default=1000, validation_alias="WORKFLOW_BATCH_MAX_SIZE")
+    # API: maximum number of execution ids in one POST /workflows/status:batch
+    WORKFLOW_STATUS_BATCH_MAX_SIZE: int = Field(default=5000, validation_alias="WORKFLOW_STATUS_BATCH_MAX_SIZE")
+    # Server-sent events: the per-process reader blocks up to READ_BLOCK_MS
+    # (a new subscriber's first live event may wait that long); subscribers
+    # more than QUEUE_SIZE events behind are disconnected and must resume
+    SSE_READ_BLOCK_MS: int = Field(default=500, validation_alias="SSE_READ_BLOCK_MS")
+    SSE_QUEUE_SIZE: int = Field(default=1000, validation_alias="SSE_QUEUE_SIZE")
+    SSE_KEEPALIVE_SECONDS: float = Field(default=15, validation_alias="SSE_KEEPALIVE_SECONDS")
+
     # Workers configuration
     STREAM: str = Field(default="workflow:tasks", validation_alias="WORKER_STREAM")
     GROUP: str = Field(default="workflow_group", validation_alias="WORKER_GROUP")
     CONSUMER: str = f"worker-{socket.gethostname()}"
+    # "serial" handles one message at a time; "threaded" runs a bounded pool
+    WORKER_MODE: str = Field(default="serial", validation_alias="WORKER_MODE")
+    WORKER_CONCURRENCY: int = Field(default=64, validation_alias="WORKER_CONCURRENCY")
+    WORKER_BATCH_SIZE: int = Field(default=16, validation_alias="WORKER_BATCH_SIZE")
+    WORKER_ASYNC_CONCURRENCY: int = Field(default=1000, validation_alias="WORKER_ASYNC_CONCURRENCY")
+    # Process-class handlers: pool size (0 = one per core) and recycling
+    WORKER_PROCESSES: int = Field(default=0, validation_alias="WORKER_PROCESSES")
+    WORKER_MAX_TASKS_PER_CHILD: int = Field(default=1000, validation_alias="WORKER_MAX_TASKS_PER_CHILD")
+    # Crash recovery: pending messages idle longer than the claim timeout are
+    # reclaimed by other workers; live workers heartbeat their in-flight ones
+    WORKER_HEARTBEAT_SECONDS: float = Field(default=2, validation_alias="WORKER_HEARTBEAT_SECONDS")
+    WORKER_CLAIM_IDLE_SECONDS: float = Field(default=10, validation_alias="WORKER_CLAIM_IDLE_SECONDS")
+    WORKER_RECLAIM_INTERVAL_SECONDS: float = Field(default=5, validation_alias="WORKER_RECLAIM_INTERVAL_SECONDS")
+    WORKER_MAX_DELIVERIES: int = Field(default=3, validation_alias="WORKER_MAX_DELIVERIES")
+    # Priority lanes: "weighted" (smooth weighted round-robin) or "edf"
+    WORKER_LANE_POLICY: str = Field(default="weighted", validation_alias="WORKER_LANE_POLICY")
+    WORKER_LANE_WEIGHTS: dict[str, int] = Field(
+        default={"high": 8, "normal": 3, "low": 1},
+        validation_alias="WORKER_LANE_WEIGHTS",
+    )
+    # EDF: deadline assumed for tasks without one, in seconds after enqueueing
+    WORKER_LANE_SLACK_SECONDS: dict[str, float] = Field(
+        default={"high": 1, "normal": 30, "low": 300},
+        validation_alias="WORKER_LANE_SLACK_SECONDS",
+    )
+
+    # Orchestrator configuration
+    SCHEDULER_SWEEP_SECONDS: float = Field(default=5, validation_alias="SCHEDULER_SWEEP_SECONDS")
+    EVENT_STREAM_MAXLEN: int = Field(default=10000, validation_alias="EVENT_STREAM_MAXLEN")
+    # Approximate cap on each execution's transition stream; SSE clients
+    # resuming from a trimmed event get a fresh snapshot instead
+    EXECUTION_EVENT_STREAM_MAXLEN: int = Field(default=1000, validation_alias="EXECUTION_EVENT_STREAM_MAXLEN")
+    # Task stream retention: acked entries are trimmed every TRIM_SECONDS;
+    # MAXLEN is a hard ceiling applied by the same pass (0 disables it): the
+    # oldest entries past it are dropped even if unacked and their nodes
+    # fail, so size it well above the expected backlog
+    TASK_STREAM_TRIM_SECONDS: float = Field(default=30, validation_alias="TASK_STREAM_TRIM_SECONDS")
+    TASK_STREAM_MAXLEN: int = Field(default=1_000_000, validation_alias="TASK_STREAM_MAXLEN")
+    EVENT_BATCH_SIZE: int = Field(default=100, validation_alias="EVENT_BATCH_SIZE")
+    DAG_CACHE_SIZE: int = Field(default=1024, validation_alias="DAG_CACHE_SIZE")
+    DEFINITION_CACHE_SIZE: int = Field(default=1024, validation_alias="DEFINITION_CACHE_SIZE")
+    SCHEDULER_MODE: str = Field(default="sync", validation_alias="SCHEDULER_MODE")
+    SCHEDULER_CONCURRENCY: int = Field(default=32, validation_alias="SCHEDULER_CONCURRENCY")
+    SCHEDULER_SHARDS: int = Field(default=64, validation_alias="SCHEDULER_SHARDS")
+    SHARD_LEASE_SECONDS: float = Field(default=5, validation_alias="SHARD_LEASE_SECONDS")
+    ORCHESTRATOR_ID: str = Field(
+        default=f"orchestrator-{socket.gethostname()}-{os.getpid()}",
+        validation_alias="ORCHESTRATOR_ID",
+    )
 
     model_config = {
         "populate_by_name": True
@@ -1,22 +1,53 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from api.routers import workflow, workflows
+from api.event_hub import EventHub
+from api.routers import definitions, workflow, workflows
+from clients.async_redis_client import AsyncRedisClient
 from config import settings
 from logging_config import get_logger
+from orchestrator.dag_cache import definition_cache, workflow_cache
+from orchestrator.retention import stream_metrics
 
 logger = get_logger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the async Redis connection pool and the event hub for the app's lifetime."""
+    app.state.redis = AsyncRedisClient()
+    app.state.events = EventHub(app.state.redis)
+    try:
+        yield
+    finally:
+        await app.state.events.close()
+        await app.state.redis.close()
+
+
 app = FastAPI(
     title="Workflow Orchestration Engine",
     version="1.0.0",
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    lifespan=lifespan,
 )
 
 
 app.include_router(workflow.router, prefix="/workflow", tags=["Workflow"])
 app.include_router(workflows.router, prefix="/workflows", tags=["Workflows"])
+app.include_router(definitions.router, prefix="/definitions", tags=["Definitions"])
 
 
 @app.get("/health")
-def health_check():
+async def health_check():
     logger.info("Health check endpoint called")
     return {"status": "ok"}
+
+
+@app.get("/metrics")
+async def metrics():
+    logger.info("Metrics endpoint called")
+    return {
+        "dag_cache": workflow_cache.stats(),
+        "definition_cache": definition_cache.stats(),
+        "task_streams": await asyncio.to_thread(stream_metrics),
+    }
@@ -0,0 +1,284 @@
+import asyncio
+import time
+from typing import Iterable, Optional
+from logging_config import get_logger
+from clients.async_redis_client import AsyncRedisClient
+from config import settings
+from orchestrator.dag_cache import workflow_cache
+from orchestrator.events import EVENT_STREAM, latest_event_id, parse_event_response
+from orchestrator.loader import load_workflow_async
+from orchestrator.migration import migrate_legacy_node_keys
+from orchestrator.models import DAGNode, NodeStatus, Workflow
+from orchestrator.readiness import (
+    queue_missing_readiness_index,
+    queue_readiness_checks,
+    resolve_completed_nodes_call,
+)
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.retention import trim_task_streams
+from orchestrator.scripts import (
+    DISPATCH_NODES,
+    RESOLVE_COMPLETED_NODES,
+    SET_NODE_STATUSES,
+    SET_WORKFLOW_STATUS,
+)
+from orchestrator.sharding import (
+    ShardLeaseManager,
+    active_set_key,
+    migrate_legacy_active_set,
+)
+from orchestrator.starter import get_final_workflow_status, group_node_events
+from orchestrator.state import (
+    count_node_statuses,
+    final_status_from_counters,
+    parse_node_records,
+    set_node_statuses_call,
+    set_workflow_status_call,
+)
+from orchestrator.task_queue import QueuedTask, dispatch_tasks_call
+from orchestrator.template import build_task_inputs, referenced_outputs
+
+logger = get_logger(__name__)
+
+
+class AsyncScheduler:
+    """Evaluate many executions concurrently from a single asyncio event loop.
+
+    Execution passes are coroutines on ``redis.asyncio``. Loading the
+    workflow, the completion check, readiness resolution, status writes and
+    dispatch are all awaited on the pooled async client, so a pass waiting
+    on Redis holds neither a thread nor a dedicated connection. Up to
+    ``concurrency`` passes run at once, and a batch takes about as long as its
+    slowest execution instead of the sum of all of them.
+
+    The passes mirror ``starter.process_execution`` and ``executor`` step for
+    step. They call the same Lua scripts with keys and args built by the same
+    ``*_call`` helpers, so completion and dispatch rules cannot drift apart
+    between the two modes. Only executions stored before node counters
+    existed fall back to the synchronous completion check, in a thread.
+    """
+
+    def __init__(self, client: AsyncRedisClient, concurrency: Optional[int] = None):
+        self.client = client
+        self.concurrency = concurrency or settings.SCHEDULER_CONCURRENCY
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._resolve_completed_nodes = client.register_script(RESOLVE_COMPLETED_NODES)
+        self._set_node_statuses = client.register_script(SET_NODE_STATUSES)
+        self._set_workflow_status = client.register_script(SET_WORKFLOW_STATUS)
+        self._dispatch_nodes = client.register_script(DISPATCH_NODES)
+
+    async def discover_active_workflow_ids(self, shards: Iterable[int]) -> list[str]:
+        """Return the execution IDs in the given active-set shards."""
+        pipe = self.client.pipeline()
+        for shard in sorted(shards):
+            pipe.smembers(RedisKeyTemplates.WORKFLOWS_ACTIVE_SHARD.format(shard=shard))
+        return [id for members in await pipe.execute() for id in members]
+
+    async def process_execution(self, execution_id: str, completed_node_ids: Optional[list[str]] = None):
+        """Re-evaluate one execution once a concurrency slot is free: retire it if finished, else dispatch.
+
+        Args:
+            execution_id: Execution to re-evaluate.
+            completed_node_ids: Nodes reported complete by events; when
+                omitted the whole execution is reconciled.
+        """
+        async with self._semaphore:
+            if await self.check_completion(execution_id):
+                return
+            try:
+                logger.info(f"[async-starter] Dispatching workflow: {execution_id}")
+                await self.execute_workflow(execution_id, completed_node_ids)
+            except Exception as e:
+                logger.error(f"[async-starter] Error executing {execution_id}: {e}")
+
+    async def check_completion(self, execution_id: str) -> bool:
+        """Retire the execution if its node counters show it finished, like ``starter.check_completion``."""
+        counters_key = RedisKeyTemplates.WORKFLOW_NODE_COUNTERS.format(execution_id=execution_id)
+        counters = {field: int(value) for field, value in (await self.client.hgetall(counters_key)).items()}
+        if "total" in counters:
+            final_status = final_status_from_counters(counters)
+        else:
+            # Executions stored before node counters existed
+            final_status = await asyncio.to_thread(get_final_workflow_status, execution_id)
+        if final_status is None:
+            return False
+        await self.set_workflow_status(execution_id, final_status)
+        await self.client.srem(active_set_key(execution_id), execution_id)
+        workflow_cache.invalidate(execution_id)
+        logger.info(f"[async-starter] Workflow {execution_id} marked as {final_status.value}")
+        return True
+
+    async def set_workflow_status(self, execution_id: str, status: NodeStatus, error: Optional[str] = None):
+        """Async counterpart of ``state.set_workflow_status``."""
+        keys, args = set_workflow_status_call(execution_id, status, error)
+        await self._set_workflow_status(keys=keys, args=args)
+
+    async def execute_workflow(self, execution_id: str, completed_node_ids: Optional[list[str]] = None):
+        """Dispatch the nodes of an execution whose dependencies are satisfied, like ``executor.execute_workflow``."""
+        workflow = await load_workflow_async(self.client, execution_id)
+        nodes_by_id = {node.id: node for node in workflow.nodes}
+        if completed_node_ids is not None:
+            candidates = await self._resolve_completed(workflow, completed_node_ids)
+        else:
+            candidates = await self._reconcile_workflow(workflow)
+        await self._dispatch(workflow, [nodes_by_id[node_id] for node_id in candidates])
+
+    async def _resolve_completed(self, workflow: Workflow, node_ids: list[str]) -> list[str]:
+        if not node_ids:
+            return []
+        keys, args = resolve_completed_nodes_call(workflow.execution_id, node_ids, workflow.definition_digest)
+        return await self._resolve_completed_nodes(keys=keys, args=args)
+
+    async def _reconcile_workflow(self, workflow: Workflow) -> list[str]:
+        """Propagate every completed node and return all pending nodes with no blockers."""
+        execution_id = workflow.execution_id
+        nodes = workflow.nodes
+        children = workflow.topology.children if workflow.topology else None
+        pipe = self.client.pipeline()
+        queue_readiness_checks(pipe, execution_id, workflow.definition_digest)
+        exists = await pipe.execute()
+        pipe = self.client.pipeline()
+        if queue_missing_readiness_index(pipe, execution_id, nodes, children, workflow.definition_digest, exists):
+            await pipe.execute()
+
+        nodes_key = RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id)
+        stored = parse_node_records(await self.client.hgetall_json(nodes_key))
+        statuses = {node.id: stored.get(node.id) for node in nodes}
+        missing = [node_id for node_id, status in statuses.items() if status is None]
+        if missing:
+            # First-time run: treat as PENDING
+            records = {node_id: {"status": NodeStatus.PENDING.value} for node_id in missing}
+            keys, args = set_node_statuses_call(execution_id, records)
+            await self._set_node_statuses(keys=keys, args=args)
+            statuses.update({node_id: NodeStatus.PENDING for node_id in missing})
+        counters_key = RedisKeyTemplates.WORKFLOW_NODE_COUNTERS.format(execution_id=execution_id)
+        if not await self.client.hexists(counters_key, "total"):
+            await self.client.hset(counters_key, count_node_statuses(statuses))
+
+        completed = [node_id for node_id, status in statuses.items() if status == NodeStatus.COMPLETED]
+        pending = [node_id for node_id, status in statuses.items() if status == NodeStatus.PENDING]
+        await self._resolve_completed(workflow, completed)
+        remaining_key = RedisKeyTemplates.WORKFLOW_DEPS_REMAINING.format(execution_id=execution_id)
+        remaining = {node_id: int(count) for node_id, count in (await self.client.hgetall(remaining_key)).items()}
+        return [node_id for node_id in pending if remaining.get(node_id, 0) <= 0]
+
+    async def _dispatch(self, workflow: Workflow, nodes: list[DAGNode]):
+        """Resolve the configs of ``nodes`` with one HMGET and queue those still runnable with one script call."""
+        if not nodes:
+            return
+        execution_id = workflow.execution_id
+        referenced = sorted({
+            node_id for node in nodes for node_id in referenced_outputs(node.config, workflow.params)
+        })
+        outputs_key = RedisKeyTemplates.WORKFLOW_OUTPUTS.format(execution_id=execution_id)
+        stored = dict(zip(referenced, await self.client.hmget_json(outputs_key, referenced)))
+        tasks = [
+            QueuedTask(node.id, node.dependencies, {
+                "handler": node.handler,
+                **build_task_inputs(node.config, stored, workflow.params),
+            }, *workflow.lane_for(node))
+            for node in nodes
+        ]
+        keys, args = dispatch_tasks_call(execution_id, tasks)
+        dispatched = set(await self._dispatch_nodes(keys=keys, args=args))
+        for node in nodes:
+            if node.id in dispatched:
+                logger.info("Scheduled node %s for execution_id=%s", node.id, execution_id)
+            else:
+                logger.info(
+                    "Skipping node %s for execution_id=%s (no longer pending or dependencies incomplete)",
+                    node.id,
+                    execution_id,
+                )
+
+    async def process_executions(self, work: dict[str, Optional[list[str]]]):
+        """Process several executions concurrently and wait for all of them."""
+        results = await asyncio.gather(
+            *(self.process_execution(execution_id, completed) for execution_id, completed in work.items()),
+            return_exceptions=True,
+        )
+        for execution_id, result in zip(work, results):
+            if isinstance(result, Exception):
+                logger.error(f"[async-starter] Error processing {execution_id}: {result}")
+
+    async def sweep(self, shards: Iterable[int]):
+        """Re-evaluate every active execution in ``shards``."""
+        execution_ids = await self.discover_active_workflow_ids(shards)
+        logger.info(f"[async-starter] Discovered {len(execution_ids)} workflows")
+        await self.process_executions({execution_id: None for execution_id in execution_ids})
+
+    async def handle_node_events(self, events: list[dict], shards: Optional[set[int]] = None):
+        """Re-evaluate every active execution referenced by ``events`` concurrently."""
+        grouped = group_node_events(events, shards)
+        if not grouped:
+            return
+        pipe = self.client.pipeline()
+        for execution_id in grouped:
+            pipe.sismember(active_set_key(execution_id), execution_id)
+        memberships = await pipe.execute()
+
+        work = {}
+        for (execution_id, completed), is_active in zip(grouped.items(), memberships):
+            if is_active:
+                work[execution_id] = completed
+            else:
+                logger.info(f"[async-starter] Ignoring event for inactive workflow {execution_id}")
+                workflow_cache.invalidate(execution_id)
+        await self.process_executions(work)
+
+    async def read_node_events(self, last_id: str, block_ms: int) -> tuple[str, list[dict]]:
+        """Wait for node events newer than ``last_id`` without blocking the loop."""
+        response = await self.client.xread(
+            {EVENT_STREAM: last_id}, count=settings.EVENT_BATCH_SIZE, block=block_ms
+        )
+        return parse_event_response(response, last_id)
+
+
+async def async_main_loop(sleep_seconds: float = settings.SCHEDULER_SWEEP_SECONDS):
+    """asyncio variant of ``starter.main_loop`` (``SCHEDULER_MODE=async``).
+
+    Args:
+        sleep_seconds: Interval between full sweeps of the owned shards.
+    """
+    logger.info(
+        f"[async-starter] Starting asyncio scheduler as {settings.ORCHESTRATOR_ID} "
+        f"with concurrency {settings.SCHEDULER_CONCURRENCY}..."
+    )
+    client = AsyncRedisClient()
+    scheduler = AsyncScheduler(client)
+    leases = ShardLeaseManager(settings.ORCHESTRATOR_ID)
+    await asyncio.to_thread(migrate_legacy_active_set)
+    await asyncio.to_thread(migrate_legacy_node_keys)
+    last_event_id = await asyncio.to_thread(latest_event_id)
+    next_sweep = 0.0
+    next_lease_refresh = 0.0
+    next_trim = 0.0
+
+    try:
+        while True:
+            try:
+                if time.monotonic() >= next_trim:
+                    await asyncio.to_thread(trim_task_streams)
+                    next_trim = time.monotonic() + settings.TASK_STREAM_TRIM_SECONDS
+
+                if time.monotonic() >= next_lease_refresh:
+                    acquired = await asyncio.to_thread(leases.refresh)
+                    next_lease_refresh = time.monotonic() + leases.refresh_interval
+                    if acquired:
+                        await scheduler.sweep(acquired)
+
+                if time.monotonic() >= next_sweep:
+                    await scheduler.sweep(leases.owned)
+                    next_sweep = time.monotonic() + sleep_seconds
+
+                wake_at = min(next_sweep, next_lease_refresh, next_trim)
+                block_ms = max(1, int((wake_at - time.monotonic()) * 1000))
+                last_event_id, events = await scheduler.read_node_events(last_event_id, block_ms)
+                if events:
+                    await scheduler.handle_node_events(events, set(leases.owned))
+            except Exception as e:
+                logger.critical(f"[async-starter] Fatal error in main loop: {e}")
+                await asyncio.sleep(1)
+    finally:
+        await asyncio.to_thread(leases.release_all)
+        await client.close()
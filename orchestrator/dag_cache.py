@@ -0,0 +1,76 @@
+import threading
+from collections import OrderedDict
+from typing import Optional, Union
+from logging_config import get_logger
+from config import settings
+from orchestrator.models import Definition, Workflow
+
+
+logger = get_logger(__name__)
+
+
+class WorkflowCache:
+    """Bounded, thread-safe LRU cache of parsed workflow definitions.
+
+    Definitions never change once submitted, so a parsed ``Workflow`` can be
+    shared by every scheduler pass for the same execution, and a registered
+    ``Definition`` by every execution of it. Cached entries are frozen
+    dataclasses whose containers are frozen too (see ``models.freeze``), so
+    no caller can modify what other executions share.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, Union[Workflow, Definition]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, execution_id: str) -> Optional[Union[Workflow, Definition]]:
+        """Return the cached workflow and mark it as recently used, or None."""
+        with self._lock:
+            workflow = self._entries.get(execution_id)
+            if workflow is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(execution_id)
+            self.hits += 1
+            return workflow
+
+    def put(self, execution_id: str, workflow: Union[Workflow, Definition]):
+        """Cache a workflow, evicting the least recently used entries past the bound."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[execution_id] = workflow
+            self._entries.move_to_end(execution_id)
+            while len(self._entries) > self.maxsize:
+                evicted, _ = self._entries.popitem(last=False)
+                logger.debug("Evicted workflow %s from DAG cache", evicted)
+
+    def invalidate(self, execution_id: str):
+        """Drop a single execution, e.g. once it leaves the active set."""
+        with self._lock:
+            self._entries.pop(execution_id, None)
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Return hit/miss counters together with the current and maximum size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+workflow_cache = WorkflowCache(settings.DAG_CACHE_SIZE)
+# Registered definitions, keyed by content digest; they are never invalidated
+definition_cache = WorkflowCache(settings.DEFINITION_CACHE_SIZE)
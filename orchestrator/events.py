@@ -0,0 +1,73 @@
+from logging_config import get_logger
+from clients.redis_client import redis_client
+from config import settings
+from orchestrator.models import NodeStatus
+from orchestrator.redis_keys import RedisKeyTemplates
+
+EVENT_STREAM = RedisKeyTemplates.WORKFLOW_EVENT_STREAM
+
+
+logger = get_logger(__name__)
+
+
+def publish_node_event(execution_id: str, node_id: str, status: NodeStatus):
+    """Announce that a node reached a new status so the scheduler can react.
+
+    Events are appended to a capped Redis stream; the orchestrator blocks on
+    it and re-evaluates only the affected execution.
+    """
+    logger.info("Publishing %s event for %s/%s", status.value, execution_id, node_id)
+    redis_client.xadd(
+        EVENT_STREAM,
+        {
+            "execution_id": execution_id,
+            "node_id": node_id,
+            "status": status.value,
+        },
+        maxlen=settings.EVENT_STREAM_MAXLEN,
+    )
+
+
+def trigger_event(execution_id: str) -> dict:
+    """Return the fields of an event asking the owning orchestrator to start an execution.
+
+    Trigger events carry no node id; ``group_node_events`` turns them into a
+    full reconcile, which dispatches the root nodes of the execution.
+    """
+    return {"execution_id": execution_id, "node_id": "", "status": NodeStatus.RUNNING.value}
+
+
+def latest_event_id() -> str:
+    """Return the id of the newest event, or ``0-0`` if the stream is empty."""
+    entries = redis_client.xrevrange(EVENT_STREAM, count=1)
+    return entries[0][0] if entries else "0-0"
+
+
+def read_node_events(last_id: str, block_ms: int, count: int = None) -> tuple[str, list[dict]]:
+    """Block until node events newer than ``last_id`` arrive or the timeout expires.
+
+    Args:
+        last_id: Stream id of the last event already handled.
+        block_ms: Maximum time to wait for new events in milliseconds.
+        count: Maximum number of events to return.
+
+    Returns:
+        tuple: The id of the last event read (``last_id`` if none arrived) and
+        the list of event field dicts in stream order.
+    """
+    response = redis_client.xread(
+        {EVENT_STREAM: last_id},
+        count=count or settings.EVENT_BATCH_SIZE,
+        block=block_ms,
+    )
+    return parse_event_response(response, last_id)
+
+
+def parse_event_response(response, last_id: str) -> tuple[str, list[dict]]:
+    """Flatten an XREAD reply on the event stream into ``(last_id, events)``."""
+    events = []
+    for _stream, entries in response or []:
+        for event_id, fields in entries:
+            last_id = event_id
+            events.append(fields)
+    return last_id, events
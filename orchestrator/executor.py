@@ -1,50 +1,91 @@
+from typing import Optional
 from logging_config import get_logger
 from orchestrator.loader import load_workflow
-from orchestrator.models import NodeStatus
-from orchestrator.state import get_node_status, all_dependencies_succeeded, set_node_status
-from orchestrator.task_queue import push_task
-from orchestrator.template import resolve_templates
+from orchestrator.models import DAGNode, NodeStatus, Workflow
+from orchestrator.readiness import (
+    ensure_readiness_index,
+    get_remaining_dependencies,
+    resolve_completed_nodes,
+)
+from orchestrator.state import ensure_node_counters, get_all_node_statuses, set_node_statuses
+from orchestrator.task_queue import QueuedTask, dispatch_tasks
+from orchestrator.template import task_inputs
 
 
 logger = get_logger(__name__)
 
 
-def execute_workflow(execution_id: str):
+def execute_workflow(execution_id: str, completed_node_ids: Optional[list[str]] = None):
     """Dispatch tasks for a workflow whose dependencies are satisfied.
 
-    The function loads the workflow DAG for the provided execution ID, checks
-    the status of each node, and pushes runnable tasks onto the task queue.
-    Nodes are marked as queued once scheduled.
+    Readiness is tracked incrementally: every node keeps a counter of
+    dependencies that have not completed yet, and completing a node decrements
+    the counters of its children. A node is dispatched once its counter reaches
+    zero while it is still pending.
+
+    When ``completed_node_ids`` is given (the event-driven path) only those
+    completions are propagated, so the work done scales with their children.
+    Otherwise every node status is inspected to reconcile completions that were
+    never propagated, which is what triggers and periodic sweeps rely on.
 
     Args:
         execution_id: Unique identifier for the workflow execution.
+        completed_node_ids: Nodes known to have just reached ``COMPLETED``.
     """
     logger.info("Executing workflow %s", execution_id)
     workflow = load_workflow(execution_id)
-    for node in workflow.nodes:
-        try:
-            status = get_node_status(execution_id, node.id)
-        except ValueError:
-            # First-time run: treat as PENDING
-            set_node_status(execution_id, node.id, NodeStatus.PENDING)
-            status = NodeStatus.PENDING
-
-        if status == NodeStatus.PENDING and all_dependencies_succeeded(execution_id, node.dependencies):
-            logger.info("Scheduling node %s for execution_id=%s", node.id, execution_id)
-            inputs = resolve_templates(execution_id, node.config)
-            set_node_status(execution_id, node.id, NodeStatus.QUEUED)
-            push_task(
-                execution_id=execution_id,
-                node_id=node.id,
-                payload={
-                    "handler": node.handler,
-                    "config": inputs
-                }
-            )
+    nodes_by_id = {node.id: node for node in workflow.nodes}
+
+    if completed_node_ids is not None:
+        candidates = resolve_completed_nodes(execution_id, completed_node_ids, workflow.definition_digest)
+    else:
+        candidates = _reconcile_workflow(execution_id, workflow)
+
+    _dispatch_nodes(workflow, [nodes_by_id[node_id] for node_id in candidates])
+
+
+def _reconcile_workflow(execution_id: str, workflow: Workflow) -> list[str]:
+    """Propagate every completed node and return all pending nodes with no blockers."""
+    nodes = workflow.nodes
+    children = workflow.topology.children if workflow.topology else None
+    ensure_readiness_index(execution_id, nodes, children, workflow.definition_digest)
+
+    stored = get_all_node_statuses(execution_id)
+    statuses = {node.id: stored.get(node.id) for node in nodes}
+    missing = [node_id for node_id, status in statuses.items() if status is None]
+    if missing:
+        # First-time run: treat as PENDING
+        set_node_statuses(execution_id, {node_id: NodeStatus.PENDING for node_id in missing})
+        statuses.update({node_id: NodeStatus.PENDING for node_id in missing})
+    ensure_node_counters(execution_id, statuses)
+
+    completed = [node_id for node_id, status in statuses.items() if status == NodeStatus.COMPLETED]
+    pending = [node_id for node_id, status in statuses.items() if status == NodeStatus.PENDING]
+
+    resolve_completed_nodes(execution_id, completed, workflow.definition_digest)
+    remaining = get_remaining_dependencies(execution_id)
+    return [node_id for node_id in pending if remaining.get(node_id, 0) <= 0]
+
+
+def _dispatch_nodes(workflow: Workflow, nodes: list[DAGNode]):
+    """Resolve templated configs and atomically queue every node still runnable."""
+    if not nodes:
+        return
+    execution_id = workflow.execution_id
+    tasks = [
+        QueuedTask(node.id, node.dependencies, {
+            "handler": node.handler,
+            **task_inputs(execution_id, node.config, workflow.params)
+        }, *workflow.lane_for(node))
+        for node in nodes
+    ]
+    dispatched = set(dispatch_tasks(execution_id, tasks))
+    for node in nodes:
+        if node.id in dispatched:
+            logger.info("Scheduled node %s for execution_id=%s", node.id, execution_id)
         else:
             logger.info(
-                "Skipping node %s for execution_id=%s (status=%s or dependencies incomplete)",
+                "Skipping node %s for execution_id=%s (no longer pending or dependencies incomplete)",
                 node.id,
                 execution_id,
-                status,
             )
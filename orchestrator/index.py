@@ -0,0 +1,263 @@
+"""Secondary indexes for listing executions without scanning the keyspace.
+
+Every execution is a member of three sorted sets scored by its creation
+time in milliseconds: ``workflows:index:created``, the index of its name and
+the index of its current status. Submission adds it to all three in the
+pipeline that stores the execution; status changes move it between status indexes in the same
+script call that writes the status, including the completion written by
+node transitions. Listing is then a ``ZREVRANGEBYSCORE`` on the most
+selective index plus one pipelined read of the page's metadata.
+"""
+
+import time
+from typing import Iterator, Optional
+from logging_config import get_logger
+from clients import codecs
+from clients.async_redis_client import AsyncRedisClient
+from clients.redis_client import redis_client
+from orchestrator.models import NodeStatus
+from orchestrator.redis_keys import RedisKeyTemplates
+
+logger = get_logger(__name__)
+
+# Workflow statuses with an index; must match INDEXED_STATUSES in the scripts.
+INDEXED_STATUSES = (NodeStatus.PENDING, NodeStatus.RUNNING, NodeStatus.COMPLETED, NodeStatus.FAILED)
+
+# Index entries read per step while filling a page.
+LIST_BATCH_SIZE = 200
+# Index entries a single page may skip over before it is returned short.
+LIST_MAX_SCANNED = 5000
+
+_STATUS_PREFIX, _STATUS_SUFFIX = RedisKeyTemplates.WORKFLOW_STATUS.split("{execution_id}")
+
+
+def status_index_keys() -> list[str]:
+    """Return the created-at index followed by the index of every indexed status."""
+    return [RedisKeyTemplates.WORKFLOWS_BY_CREATED] + [
+        RedisKeyTemplates.WORKFLOWS_BY_STATUS.format(status=status.value) for status in INDEXED_STATUSES
+    ]
+
+
+def register_workflow(execution_id: str, name: str, created_at: Optional[int] = None) -> int:
+    """Index a newly submitted execution and set its status to ``PENDING``.
+
+    Args:
+        execution_id: Workflow execution identifier.
+        name: Workflow name from the definition.
+        created_at: Creation time in epoch milliseconds; defaults to now.
+
+    Returns:
+        int: The creation time used as index score.
+    """
+    created_at = created_at if created_at is not None else int(time.time() * 1000)
+    pipe = redis_client.pipeline(transaction=True)
+    queue_registration(pipe, execution_id, name, created_at)
+    pipe.execute()
+    logger.info("Indexed workflow %s (%s) created at %d", execution_id, name, created_at)
+    return created_at
+
+
+def queue_registration(
+    pipe,
+    execution_id: str,
+    name: str,
+    created_at: int,
+    status: NodeStatus = NodeStatus.PENDING,
+):
+    """Add the metadata, index entries and first status of a new execution to a pipeline."""
+    pipe.hset(
+        RedisKeyTemplates.WORKFLOW_META.format(execution_id=execution_id),
+        mapping={"name": name, "created_at": created_at},
+    )
+    pipe.zadd(RedisKeyTemplates.WORKFLOWS_BY_CREATED, {execution_id: created_at})
+    pipe.zadd(RedisKeyTemplates.WORKFLOWS_BY_NAME.format(name=name), {execution_id: created_at})
+    pipe.zadd(RedisKeyTemplates.WORKFLOWS_BY_STATUS.format(status=status.value), {execution_id: created_at})
+    pipe.set(RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id=execution_id), status.value)
+
+
+def iter_execution_ids(batch_size: int = 1000) -> Iterator[str]:
+    """Iterate over the id of every stored execution with SCAN, for admin tools.
+
+    Walks the whole keyspace in steps of ``batch_size`` without blocking
+    Redis; prefer ``list_workflows`` wherever the indexes can answer.
+    """
+    pattern = RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id="*")
+    for key in redis_client.scan_iter(pattern, count=batch_size):
+        execution_id = key[len(_STATUS_PREFIX):-len(_STATUS_SUFFIX)]
+        # The pattern also matches legacy node keys of a node called "status"
+        if ":" not in execution_id:
+            yield execution_id
+
+
+def reindex_workflows(batch_size: int = 500) -> int:
+    """Index executions submitted before the indexes existed.
+
+    Their creation time is unknown, so they are scored 0 and sort last.
+    Executions already indexed are left alone, so this can be repeated.
+
+    Returns:
+        int: Number of executions indexed.
+    """
+    indexed = 0
+    batch = []
+    for execution_id in iter_execution_ids(batch_size):
+        batch.append(execution_id)
+        if len(batch) >= batch_size:
+            indexed += _reindex_batch(batch)
+            batch = []
+    if batch:
+        indexed += _reindex_batch(batch)
+    if indexed:
+        logger.info("Indexed %d executions submitted before the indexes existed", indexed)
+    return indexed
+
+
+def _reindex_batch(execution_ids: list[str]) -> int:
+    pipe = redis_client.pipeline()
+    for execution_id in execution_ids:
+        pipe.zscore(RedisKeyTemplates.WORKFLOWS_BY_CREATED, execution_id)
+    missing = [execution_id for execution_id, score in zip(execution_ids, pipe.execute()) if score is None]
+    if not missing:
+        return 0
+
+    pipe = redis_client.pipeline()
+    for execution_id in missing:
+        pipe.get(RedisKeyTemplates.WORKFLOW.format(execution_id=execution_id))
+        pipe.get(RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id=execution_id))
+    values = pipe.execute()
+
+    pipe = redis_client.pipeline()
+    for execution_id, raw, status in zip(missing, values[::2], values[1::2]):
+        try:
+            name = codecs.decode(raw).get("name", "unnamed") if raw else "unnamed"
+        except ValueError:
+            name = "unnamed"
+        pipe.hsetnx(RedisKeyTemplates.WORKFLOW_META.format(execution_id=execution_id), "name", name)
+        pipe.zadd(RedisKeyTemplates.WORKFLOWS_BY_CREATED, {execution_id: 0})
+        pipe.zadd(RedisKeyTemplates.WORKFLOWS_BY_NAME.format(name=name), {execution_id: 0})
+        if status in {indexed.value for indexed in INDEXED_STATUSES}:
+            pipe.zadd(RedisKeyTemplates.WORKFLOWS_BY_STATUS.format(status=status), {execution_id: 0})
+    pipe.execute()
+    return len(missing)
+
+
+def encode_cursor(score: float, execution_id: str) -> str:
+    return f"{int(score)}:{execution_id}"
+
+
+def decode_cursor(cursor: str) -> tuple[float, str]:
+    """Split a listing cursor into the score and the id of the last entry returned.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        score, execution_id = cursor.split(":", 1)
+        if not execution_id:
+            raise ValueError
+        return float(score), execution_id
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+async def list_workflows(
+    client: AsyncRedisClient,
+    status: Optional[NodeStatus] = None,
+    name: Optional[str] = None,
+    created_after: Optional[int] = None,
+    created_before: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+) -> tuple[list[dict], Optional[str]]:
+    """Return a page of executions, newest first, and the cursor of the next one.
+
+    The status index serves status filters and the name index serves name
+    filters; the creation range is a score range on either. With both status
+    and name, the status index is walked and names are checked per entry, so
+    a page may come back short after ``LIST_MAX_SCANNED`` entries; keep
+    following the cursor.
+
+    Args:
+        client: Async Redis client to read through.
+        status: Only executions currently in this status.
+        name: Only executions of workflows with this name.
+        created_after: Inclusive lower bound of the creation time (epoch ms).
+        created_before: Inclusive upper bound of the creation time (epoch ms).
+        cursor: ``next_cursor`` of the previous page.
+        limit: Maximum number of executions returned.
+
+    Returns:
+        tuple: The executions (id, name, status, creation time and error)
+        and the cursor of the next page, or ``None`` after the last page.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    if status is not None:
+        key = RedisKeyTemplates.WORKFLOWS_BY_STATUS.format(status=status.value)
+    elif name is not None:
+        key = RedisKeyTemplates.WORKFLOWS_BY_NAME.format(name=name)
+    else:
+        key = RedisKeyTemplates.WORKFLOWS_BY_CREATED
+    check_name = status is not None and name is not None
+
+    min_score = created_after if created_after is not None else "-inf"
+    if cursor:
+        max_score, after_id = decode_cursor(cursor)
+    else:
+        max_score, after_id = (created_before if created_before is not None else float("inf")), None
+
+    # Entries with equal scores come in descending id order, so the entries
+    # after the cursor are the ones scored lower, or scored the same with a
+    # smaller id, whichever status sets executions moved between meanwhile.
+    items, scanned, offset, last = [], 0, 0, None
+    while scanned < LIST_MAX_SCANNED:
+        count = LIST_BATCH_SIZE if check_name else limit - len(items)
+        entries = await client.zrevrangebyscore(key, max_score, min_score, start=offset, num=count)
+        offset += len(entries)
+        scanned += len(entries)
+        exhausted = len(entries) < count
+        if entries:
+            last = entries[-1]
+        if after_id is not None:
+            entries = [
+                (execution_id, score) for execution_id, score in entries
+                if score < max_score or execution_id < after_id
+            ]
+        page = await _read_summaries(client, [execution_id for execution_id, _ in entries])
+        for (execution_id, score), summary in zip(entries, page):
+            if not check_name or summary["name"] == name:
+                items.append(summary)
+                if len(items) == limit:
+                    return items, encode_cursor(score, execution_id)
+        if exhausted:
+            return items, None
+    execution_id, score = last
+    return items, encode_cursor(score, execution_id)
+
+
+async def _read_summaries(client: AsyncRedisClient, execution_ids: list[str]) -> list[dict]:
+    """Read the listing fields of many executions in one pipelined round trip."""
+    if not execution_ids:
+        return []
+    pipe = client.pipeline()
+    for execution_id in execution_ids:
+        pipe.hmget(RedisKeyTemplates.WORKFLOW_META.format(execution_id=execution_id), "name", "created_at", "error")
+        pipe.get(RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id=execution_id))
+    values = await pipe.execute()
+    summaries = []
+    for execution_id, (name, created_at, error), status in zip(execution_ids, values[::2], values[1::2]):
+        summary = {
+            "execution_id": execution_id,
+            "name": name,
+            "status": status,
+            "created_at": int(created_at) if created_at else None,
+        }
+        if error:
+            summary["error"] = error
+        summaries.append(summary)
+    return summaries
+
+
+if __name__ == "__main__":
+    print(f"Indexed {reindex_workflows()} executions")
@@ -1,15 +1,28 @@
-import json
+from typing import Optional
 from logging_config import get_logger
-from orchestrator.models import DAGNode, Workflow
+from clients import codecs
+from clients.async_redis_client import AsyncRedisClient
+from orchestrator.dag_cache import definition_cache, workflow_cache
+from orchestrator.models import DAGNode, Definition, Priority, Workflow
 from clients.redis_client import redis_client
 from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.topology import compute_topology, topology_from_dict
 
 
 logger = get_logger(__name__)
 
+# Field of an execution record that references a registered definition by
+# digest, in place of an inline ``dag``
+DEFINITION_REF = "definition"
+
 
 def load_workflow(execution_id: str) -> Workflow:
-    """Load a workflow definition from Redis storage.
+    """Load a workflow definition, parsing it from Redis at most once.
+
+    Parsed workflows are kept in the in-process ``workflow_cache``; only cache
+    misses read and decode the stored JSON. The topology computed at
+    validation time is fetched in the same round trip. Executions of a
+    registered definition share its parsed nodes and topology.
 
     Args:
         execution_id: Identifier for the workflow execution to load.
@@ -18,23 +31,145 @@ def load_workflow(execution_id: str) -> Workflow:
         Workflow: Parsed workflow object containing DAG nodes.
 
     Raises:
-        ValueError: If the workflow is not present in Redis.
+        ValueError: If the workflow, or the definition it references, is not
+            present in Redis.
+    """
+    workflow = workflow_cache.get(execution_id)
+    if workflow is not None:
+        logger.debug("DAG cache hit for execution_id=%s", execution_id)
+        return workflow
+
+    logger.info("Loading workflow with execution_id=%s", execution_id)
+    raw, raw_topology = redis_client.mget(_definition_keys(execution_id))
+    data = _decode_record(execution_id, raw)
+    if DEFINITION_REF in data:
+        return _build_execution(execution_id, data, load_definition(data[DEFINITION_REF]))
+    return _build_workflow(execution_id, data, raw_topology)
+
+
+async def load_workflow_async(client: AsyncRedisClient, execution_id: str) -> Workflow:
+    """``load_workflow`` for event loops, reading through an ``AsyncRedisClient``.
+
+    Shares the in-process ``workflow_cache`` with the synchronous loader.
+
+    Raises:
+        ValueError: If the workflow, or the definition it references, is not
+            present in Redis.
     """
+    workflow = workflow_cache.get(execution_id)
+    if workflow is not None:
+        logger.debug("DAG cache hit for execution_id=%s", execution_id)
+        return workflow
+
     logger.info("Loading workflow with execution_id=%s", execution_id)
-    key = RedisKeyTemplates.WORKFLOW.format(execution_id=execution_id)
-    raw = redis_client.get(key)
+    raw, raw_topology = await client.mget(_definition_keys(execution_id))
+    data = _decode_record(execution_id, raw)
+    if DEFINITION_REF in data:
+        return _build_execution(execution_id, data, await load_definition_async(client, data[DEFINITION_REF]))
+    return _build_workflow(execution_id, data, raw_topology)
+
+
+def load_definition(digest: str) -> Definition:
+    """Load a registered definition, parsing it at most once per process.
+
+    Raises:
+        ValueError: If no definition is registered under ``digest``.
+    """
+    definition = definition_cache.get(digest)
+    if definition is not None:
+        return definition
+    return _build_definition(digest, redis_client.get(RedisKeyTemplates.DEFINITION.format(digest=digest)))
+
+
+async def load_definition_async(client: AsyncRedisClient, digest: str) -> Definition:
+    """``load_definition`` reading through an ``AsyncRedisClient``."""
+    definition = definition_cache.get(digest)
+    if definition is not None:
+        return definition
+    return _build_definition(digest, await client.get(RedisKeyTemplates.DEFINITION.format(digest=digest)))
+
+
+def _definition_keys(execution_id: str) -> list[str]:
+    return [
+        RedisKeyTemplates.WORKFLOW.format(execution_id=execution_id),
+        RedisKeyTemplates.WORKFLOW_TOPOLOGY.format(execution_id=execution_id),
+    ]
+
+
+def _decode_record(execution_id: str, raw: Optional[str]) -> dict:
     if not raw:
         logger.error("Workflow %s not found in Redis", execution_id)
         raise ValueError(f"Workflow {execution_id} not found")
-
-    data = json.loads(raw)
+    data = codecs.decode(raw)
     logger.debug("Parsed workflow data for execution_id=%s", execution_id)
-    dag_nodes = [DAGNode(**node) for node in data["dag"]["nodes"]]
+    return data
+
+
+def _build_workflow(execution_id: str, data: dict, raw_topology: Optional[str]) -> Workflow:
+    """Build a workflow from an inline definition and cache it."""
+    dag_nodes = tuple(_parse_node(node) for node in data["dag"]["nodes"])
+    if raw_topology:
+        topology = topology_from_dict(codecs.decode(raw_topology))
+    else:
+        # Definitions stored before validation persisted the topology.
+        topology = compute_topology(dag_nodes)
 
     workflow = Workflow(
         execution_id=execution_id,
         name=data.get("name", "unnamed"),
-        nodes=dag_nodes
+        nodes=dag_nodes,
+        priority=Priority(data.get("priority") or Priority.NORMAL),
+        deadline=data.get("deadline"),
+        topology=topology,
     )
     logger.info("Loaded workflow '%s' with %d nodes", workflow.name, len(workflow.nodes))
+    workflow_cache.put(execution_id, workflow)
     return workflow
+
+
+def _build_execution(execution_id: str, data: dict, definition: Definition) -> Workflow:
+    """Build the workflow of an execution of a registered definition and cache it.
+
+    The nodes and topology are the definition's own objects, not copies.
+    """
+    workflow = Workflow(
+        execution_id=execution_id,
+        name=definition.name,
+        nodes=definition.nodes,
+        priority=Priority(data["priority"]) if data.get("priority") else definition.priority,
+        deadline=data.get("deadline") or definition.deadline,
+        topology=definition.topology,
+        params=data.get("params") or {},
+        definition_digest=definition.digest,
+    )
+    logger.info("Loaded execution of definition '%s' (%s)", definition.name, definition.digest)
+    workflow_cache.put(execution_id, workflow)
+    return workflow
+
+
+def _build_definition(digest: str, raw: Optional[str]) -> Definition:
+    """Parse a compiled definition and cache it by digest."""
+    if not raw:
+        logger.error("Definition %s not found in Redis", digest)
+        raise ValueError(f"Definition {digest} not found")
+    data = codecs.decode(raw)
+    spec = data["definition"]
+    definition = Definition(
+        digest=digest,
+        name=spec["name"],
+        nodes=tuple(_parse_node(node) for node in spec["dag"]["nodes"]),
+        topology=topology_from_dict(data["topology"]),
+        parameters=spec.get("parameters") or {},
+        priority=Priority(spec.get("priority") or Priority.NORMAL),
+        deadline=spec.get("deadline"),
+    )
+    logger.info("Loaded definition '%s' (%s) with %d nodes", definition.name, digest, len(definition.nodes))
+    definition_cache.put(digest, definition)
+    return definition
+
+
+def _parse_node(node: dict) -> DAGNode:
+    """Build a ``DAGNode`` from its stored JSON, coercing the optional priority."""
+    if node.get("priority"):
+        node = {**node, "priority": Priority(node["priority"])}
+    return DAGNode(**node)
@@ -0,0 +1,67 @@
+from typing import Optional
+from logging_config import get_logger
+from clients.redis_client import redis_client
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.scripts import migrate_legacy_node_keys_script
+
+logger = get_logger(__name__)
+
+LEGACY_NODE_KEY_PATTERN = RedisKeyTemplates.WORKFLOW_NODE.format(execution_id="*", node_id="*")
+_PREFIX = RedisKeyTemplates.WORKFLOW.format(execution_id="")
+_NODE_SEPARATOR = ":node:"
+_OUTPUT_SUFFIX = ":output"
+
+
+def parse_legacy_node_key(key: str) -> Optional[tuple[str, str, bool]]:
+    """Split a legacy per-node key into its parts.
+
+    Returns:
+        tuple: Execution ID, node ID and whether the key holds the node's
+        output rather than its status, or ``None`` for any other key.
+    """
+    if not key.startswith(_PREFIX) or _NODE_SEPARATOR not in key:
+        return None
+    execution_id, node_id = key[len(_PREFIX):].split(_NODE_SEPARATOR, 1)
+    if not execution_id or not node_id:
+        return None
+    if node_id.endswith(_OUTPUT_SUFFIX):
+        return execution_id, node_id[:-len(_OUTPUT_SUFFIX)], True
+    return execution_id, node_id, False
+
+
+def migrate_legacy_node_keys(batch_size: int = 500) -> int:
+    """Move node statuses and outputs from one key per node into per-execution hashes.
+
+    Scans for ``workflow:{id}:node:{node_id}`` and ``...:output`` keys and
+    moves each batch with one script call. Values already present in the
+    hashes win, so the migration can run while executions progress and can
+    be repeated safely.
+
+    Args:
+        batch_size: Keys requested per SCAN step and moved per script call.
+
+    Returns:
+        int: Number of values moved.
+    """
+    moved = 0
+    batch_keys, batch_args = [], []
+    for key in redis_client._redis.scan_iter(match=LEGACY_NODE_KEY_PATTERN, count=batch_size):
+        parsed = parse_legacy_node_key(key)
+        if parsed is None:
+            continue
+        execution_id, node_id, is_output = parsed
+        template = RedisKeyTemplates.WORKFLOW_OUTPUTS if is_output else RedisKeyTemplates.WORKFLOW_NODES
+        batch_keys.extend([key, template.format(execution_id=execution_id)])
+        batch_args.extend([node_id, "output" if is_output else "status"])
+        if len(batch_args) >= 2 * batch_size:
+            moved += migrate_legacy_node_keys_script(keys=batch_keys, args=batch_args)
+            batch_keys, batch_args = [], []
+    if batch_keys:
+        moved += migrate_legacy_node_keys_script(keys=batch_keys, args=batch_args)
+    if moved:
+        logger.info("Migrated %d legacy node keys into execution hashes", moved)
+    return moved
+
+
+if __name__ == "__main__":
+    print(f"Migrated {migrate_legacy_node_keys()} legacy node keys")
@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Mapping, Optional, Sequence
 
 
 class NodeStatus(str, Enum):
@@ -11,19 +12,110 @@ class NodeStatus(str, Enum):
     QUEUED = "QUEUED"
 
 
-@dataclass
+class Priority(str, Enum):
+    HIGH = "high"
+    NORMAL = "normal"
+    LOW = "low"
+
+
+def freeze(value: Any) -> Any:
+    """Return a read-only copy of ``value``: dicts become mapping proxies and lists tuples, recursively."""
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return a mutable copy of a frozen value with plain dicts and lists, e.g. to encode it."""
+    if isinstance(value, (dict, MappingProxyType)):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+def _freeze_fields(instance, *names: str):
+    for name in names:
+        object.__setattr__(instance, name, freeze(getattr(instance, name)))
+
+
+# The models below are shared through the DAG and definition caches, so their
+# containers are frozen too: ``freeze`` runs on construction and callers get
+# tuples and mapping proxies they cannot modify. ``thaw`` before encoding.
+
+
+@dataclass(frozen=True)
 class DAGNode:
     id: str
     handler: str
-    dependencies: List[str] = field(default_factory=list)
-    config: Dict = field(default_factory=dict)
+    dependencies: Sequence[str] = ()
+    config: Mapping = field(default_factory=dict)
+    priority: Optional[Priority] = None
+    deadline: Optional[float] = None
 
+    def __post_init__(self):
+        _freeze_fields(self, "dependencies", "config")
 
-@dataclass
+
+@dataclass(frozen=True)
+class Topology:
+    """Precomputed shape of a DAG: a topological order, each node's depth
+    (longest path from a root) and the node -> children index."""
+    order: Sequence[str]
+    levels: Mapping[str, int]
+    children: Mapping[str, Sequence[str]]
+
+    def __post_init__(self):
+        # The shape is known, so skip the generic ``freeze`` walk over large DAGs
+        object.__setattr__(self, "order", tuple(self.order))
+        object.__setattr__(self, "levels", MappingProxyType(dict(self.levels)))
+        object.__setattr__(self, "children", MappingProxyType({
+            node_id: tuple(child_ids) for node_id, child_ids in self.children.items()
+        }))
+
+
+@dataclass(frozen=True)
+class Definition:
+    """A registered workflow definition, shared by every execution of it.
+
+    ``parameters`` maps each declared parameter to its default; ``None``
+    marks a required parameter.
+    """
+    digest: str
+    name: str
+    nodes: Sequence[DAGNode]
+    topology: Topology
+    parameters: Mapping[str, Any] = field(default_factory=dict)
+    priority: Priority = Priority.NORMAL
+    deadline: Optional[float] = None
+
+    def __post_init__(self):
+        object.__setattr__(self, "nodes", tuple(self.nodes))
+        _freeze_fields(self, "parameters")
+
+
+@dataclass(frozen=True)
 class Workflow:
     execution_id: str
     name: str
-    nodes: List[DAGNode]
+    nodes: Sequence[DAGNode]
+    priority: Priority = Priority.NORMAL
+    deadline: Optional[float] = None
+    topology: Optional[Topology] = None
+    # Parameters of an execution of a registered definition
+    params: Mapping[str, Any] = field(default_factory=dict)
+    # Digest of the registered definition this is an execution of, if any
+    definition_digest: Optional[str] = None
+
+    def __post_init__(self):
+        object.__setattr__(self, "nodes", tuple(self.nodes))
+        _freeze_fields(self, "params")
+
+    def lane_for(self, node: DAGNode) -> tuple[Priority, Optional[float]]:
+        """Return the priority lane and deadline of ``node``, inheriting the workflow's."""
+        return node.priority or self.priority, node.deadline or self.deadline
 
 
 @dataclass
@@ -0,0 +1,177 @@
+from typing import Mapping, Optional, Sequence
+from logging_config import get_logger
+from clients import codecs
+from clients.redis_client import redis_client
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.scripts import resolve_completed_nodes_script
+
+
+logger = get_logger(__name__)
+
+
+def build_children_index(nodes: list) -> dict[str, list[str]]:
+    """Invert the dependency lists of ``nodes`` into a node -> children mapping."""
+    children = {node.id: [] for node in nodes}
+    for node in nodes:
+        for dep in node.dependencies:
+            children.setdefault(dep, []).append(node.id)
+    return children
+
+
+def children_index_key(execution_id: str, definition_digest: Optional[str] = None) -> str:
+    """Return the key of the children index an execution resolves completions through.
+
+    Executions of a registered definition share the index stored once with
+    the definition; other executions have their own.
+    """
+    if definition_digest is not None:
+        return RedisKeyTemplates.DEFINITION_CHILDREN.format(digest=definition_digest)
+    return RedisKeyTemplates.WORKFLOW_CHILDREN.format(execution_id=execution_id)
+
+
+def encode_children_index(children: Mapping[str, Sequence[str]]) -> dict[str, str]:
+    """Encode a children index as the hash fields Lua scripts decode with cjson."""
+    return {node_id: codecs.json_codec.dumps(list(child_ids)) for node_id, child_ids in children.items()}
+
+
+def init_readiness_index(
+    execution_id: str,
+    nodes: list,
+    children: Optional[Mapping[str, Sequence[str]]] = None,
+    store_children: bool = True,
+):
+    """Store the children index and per-node remaining-dependency counters.
+
+    Counters are written with HSETNX so that re-initializing an execution that
+    has already started propagating completions never resets its progress.
+
+    Args:
+        execution_id: Workflow execution identifier.
+        nodes: Workflow nodes exposing ``id`` and ``dependencies``.
+        children: Precomputed children index, built from ``nodes`` if omitted.
+        store_children: False for executions of a registered definition,
+            which share the definition's children index.
+    """
+    logger.info("Initializing readiness index for execution_id=%s", execution_id)
+    pipe = redis_client.pipeline()
+    queue_readiness_index(pipe, execution_id, nodes, children, store_children)
+    pipe.execute()
+
+
+def queue_readiness_index(
+    pipe,
+    execution_id: str,
+    nodes: list,
+    children: Optional[Mapping[str, Sequence[str]]] = None,
+    store_children: bool = True,
+):
+    """Add the writes of ``init_readiness_index`` to a pipeline without executing it."""
+    remaining_key = RedisKeyTemplates.WORKFLOW_DEPS_REMAINING.format(execution_id=execution_id)
+    for node in nodes:
+        pipe.hsetnx(remaining_key, node.id, len(node.dependencies))
+    if not store_children:
+        return
+    if children is None:
+        children = build_children_index(nodes)
+    if children:
+        pipe.hset(children_index_key(execution_id), mapping=encode_children_index(children))
+
+
+def ensure_readiness_index(
+    execution_id: str,
+    nodes: list,
+    children: Optional[Mapping[str, Sequence[str]]] = None,
+    definition_digest: Optional[str] = None,
+):
+    """Initialize the readiness index for executions stored without one.
+
+    For an execution of a registered definition, this also stores the
+    definition's children index if the definition was registered before it
+    had one.
+    """
+    pipe = redis_client.pipeline()
+    queue_readiness_checks(pipe, execution_id, definition_digest)
+    exists = pipe.execute()
+    pipe = redis_client.pipeline()
+    if queue_missing_readiness_index(pipe, execution_id, nodes, children, definition_digest, exists):
+        pipe.execute()
+
+
+def queue_readiness_checks(pipe, execution_id: str, definition_digest: Optional[str] = None):
+    """Add the existence checks of ``ensure_readiness_index`` to a pipeline."""
+    pipe.exists(RedisKeyTemplates.WORKFLOW_DEPS_REMAINING.format(execution_id=execution_id))
+    if definition_digest is not None:
+        pipe.exists(children_index_key(execution_id, definition_digest))
+
+
+def queue_missing_readiness_index(
+    pipe,
+    execution_id: str,
+    nodes: list,
+    children: Optional[Mapping[str, Sequence[str]]],
+    definition_digest: Optional[str],
+    exists: list,
+) -> bool:
+    """Add the writes ``ensure_readiness_index`` needs to a pipeline.
+
+    Args:
+        exists: Results of the commands queued by ``queue_readiness_checks``.
+
+    Returns:
+        bool: Whether any write was queued.
+    """
+    has_counters, *has_shared_children = exists
+    queued = False
+    if definition_digest is not None and not has_shared_children[0]:
+        logger.info("Storing children index of definition %s", definition_digest)
+        shared = children if children is not None else build_children_index(nodes)
+        if shared:
+            pipe.hset(children_index_key(execution_id, definition_digest), mapping=encode_children_index(shared))
+            queued = True
+    if not has_counters:
+        logger.info("Initializing readiness index for execution_id=%s", execution_id)
+        queue_readiness_index(pipe, execution_id, nodes, children, store_children=definition_digest is None)
+        queued = True
+    return queued
+
+
+def resolve_completed_nodes(
+    execution_id: str, node_ids: list[str], definition_digest: Optional[str] = None
+) -> list[str]:
+    """Propagate completed nodes to their children and return newly ready children.
+
+    Each node is propagated at most once per execution, so replayed events or
+    overlapping sweeps never decrement a counter twice. The work done is
+    proportional to the number of children of ``node_ids``.
+
+    Args:
+        execution_id: Workflow execution identifier.
+        node_ids: Nodes that reached ``COMPLETED``.
+        definition_digest: Registered definition the execution runs, whose
+            children index it shares.
+    """
+    if not node_ids:
+        return []
+    logger.info("Resolving completed nodes for execution_id=%s: %s", execution_id, node_ids)
+    keys, args = resolve_completed_nodes_call(execution_id, node_ids, definition_digest)
+    ready = resolve_completed_nodes_script(keys=keys, args=args)
+    logger.info("Nodes ready after resolution for execution_id=%s: %s", execution_id, ready)
+    return ready
+
+
+def resolve_completed_nodes_call(
+    execution_id: str, node_ids: list[str], definition_digest: Optional[str] = None
+) -> tuple[list, list]:
+    """Return the keys and args of the ``RESOLVE_COMPLETED_NODES`` call of ``resolve_completed_nodes``."""
+    keys = [
+        RedisKeyTemplates.WORKFLOW_RESOLVED.format(execution_id=execution_id),
+        RedisKeyTemplates.WORKFLOW_DEPS_REMAINING.format(execution_id=execution_id),
+        children_index_key(execution_id, definition_digest),
+    ]
+    return keys, list(node_ids)
+
+
+def get_remaining_dependencies(execution_id: str) -> dict[str, int]:
+    """Return the remaining-dependency counter for every node in an execution."""
+    key = RedisKeyTemplates.WORKFLOW_DEPS_REMAINING.format(execution_id=execution_id)
+    return {node_id: int(count) for node_id, count in redis_client.hgetall(key).items()}
@@ -11,7 +11,41 @@ class RedisKeyTemplates:
 
     WORKFLOW = "workflow:{execution_id}"
     WORKFLOW_STATUS = "workflow:{execution_id}:status"
+    # Hashes keyed by node id holding every node's JSON status record and
+    # JSON output, so an execution costs two keys whatever its size
+    WORKFLOW_NODES = "workflow:{execution_id}:nodes"
+    WORKFLOW_OUTPUTS = "workflow:{execution_id}:outputs"
+    # Legacy one-key-per-node layout, only read by ``orchestrator.migration``
     WORKFLOW_NODE = "workflow:{execution_id}:node:{node_id}"
     WORKFLOW_NODE_OUTPUT = "workflow:{execution_id}:node:{node_id}:output"
+    WORKFLOW_NODE_COUNTERS = "workflow:{execution_id}:counters"
+    WORKFLOW_CHILDREN = "workflow:{execution_id}:children"
+    WORKFLOW_DEPS_REMAINING = "workflow:{execution_id}:deps_remaining"
+    WORKFLOW_RESOLVED = "workflow:{execution_id}:resolved"
+    WORKFLOW_TOPOLOGY = "workflow:{execution_id}:topology"
+    # Name and creation time (ms) of an execution, plus its error if any
+    WORKFLOW_META = "workflow:{execution_id}:meta"
+    # Capped stream of an execution's node transitions and workflow status
+    # changes, written by the state scripts and served to SSE clients
+    WORKFLOW_EXECUTION_EVENTS = "workflow:{execution_id}:events"
     WORKFLOWS_ACTIVE = "workflows:active"
+    # Secondary indexes for listing executions: sorted sets of execution ids
+    # scored by creation time (ms), overall, per status and per name
+    WORKFLOWS_BY_CREATED = "workflows:index:created"
+    WORKFLOWS_BY_STATUS = "workflows:index:status:{status}"
+    WORKFLOWS_BY_NAME = "workflows:index:name:{name}"
+    # Registered definitions: the compiled definition stored once per content
+    # digest, its children index shared by every execution of it, the digests
+    # of a name's versions in order (version n at index n - 1) and the set of
+    # registered names
+    DEFINITION = "definition:{digest}"
+    DEFINITION_CHILDREN = "definition:{digest}:children"
+    DEFINITION_VERSIONS = "definitions:{name}:versions"
+    DEFINITION_NAMES = "definitions:names"
+    WORKFLOWS_ACTIVE_SHARD = "workflows:active:{shard}"
+    ORCHESTRATOR_INSTANCES = "orchestrators:instances"
+    ORCHESTRATOR_SHARD_LEASE = "orchestrators:shard:{shard}:lease"
+    WORKER_HEARTBEATS = "workers:heartbeats"
     WORKFLOW_TASK_STREAM = "workflow:tasks"
+    WORKFLOW_EVENT_STREAM = "workflow:events"
+    STREAM_METRICS = "metrics:streams"
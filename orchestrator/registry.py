@@ -0,0 +1,172 @@
+"""Registry of reusable, versioned workflow definitions.
+
+A definition is validated and compiled (its topology computed) once, when
+it is registered, and stored under the SHA-256 digest of its canonical JSON
+at ``definition:{digest}``. Each name keeps the digests of its versions in
+order, so version ``n`` is the ``n``-th distinct content registered under
+it; registering content that is already a version returns that version.
+
+The children index the scheduler resolves completions through is stored
+once per digest too, at ``definition:{digest}:children``. An execution of a
+definition stores only a small record at ``workflow:{execution_id}`` (the
+digest, the version and its parameters) plus its own progress: node
+states, counters and remaining-dependency counts.
+The loader parses each digest once per process and every execution of it
+shares the parsed nodes and topology (see ``loader.load_definition``).
+Node configs refer to parameters with ``{{ params.<name> }}`` templates,
+substituted when the node is dispatched.
+"""
+
+import hashlib
+import json
+import uuid
+from typing import Optional
+from logging_config import get_logger
+from clients import codecs
+from clients.async_redis_client import AsyncRedisClient
+from orchestrator.loader import DEFINITION_REF
+from orchestrator.models import Definition, Priority, Topology, thaw
+from orchestrator.readiness import encode_children_index
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.scripts import REGISTER_DEFINITION, register_definition_script
+from orchestrator.submission import Submission
+from orchestrator.topology import topology_to_dict
+
+logger = get_logger(__name__)
+
+
+def definition_digest(definition: dict) -> str:
+    """Return the SHA-256 hex digest of a definition's canonical JSON."""
+    canonical = json.dumps(definition, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def register_definition(definition: dict, topology: Topology) -> tuple[int, str, bool]:
+    """Store a validated definition as the next version of its name.
+
+    Args:
+        definition: The definition as JSON-compatible data, including its
+            ``name`` and declared ``parameters``.
+        topology: Topology computed by validation.
+
+    Returns:
+        tuple: The version number, the content digest and whether the
+        definition was new (False if this content was already a version).
+    """
+    digest, keys, args = register_definition_call(definition, topology)
+    return _registered(definition["name"], digest, register_definition_script(keys=keys, args=args))
+
+
+async def register_definition_async(
+    client: AsyncRedisClient, definition: dict, topology: Topology
+) -> tuple[int, str, bool]:
+    """``register_definition`` on an ``AsyncRedisClient``."""
+    digest, keys, args = register_definition_call(definition, topology)
+    result = await client.register_script(REGISTER_DEFINITION)(keys=keys, args=args)
+    return _registered(definition["name"], digest, result)
+
+
+def register_definition_call(definition: dict, topology: Topology) -> tuple[str, list, list]:
+    """Return the digest of a definition and the keys and args of its ``REGISTER_DEFINITION`` call."""
+    name = definition["name"]
+    digest = definition_digest(definition)
+    compiled = codecs.encode({"definition": definition, "topology": topology_to_dict(topology)})
+    children = [field for pair in encode_children_index(topology.children).items() for field in pair]
+    keys = [
+        RedisKeyTemplates.DEFINITION.format(digest=digest),
+        RedisKeyTemplates.DEFINITION_VERSIONS.format(name=name),
+        RedisKeyTemplates.DEFINITION_NAMES,
+        RedisKeyTemplates.DEFINITION_CHILDREN.format(digest=digest),
+    ]
+    return digest, keys, [digest, compiled, name, *children]
+
+
+def _registered(name: str, digest: str, result: list) -> tuple[int, str, bool]:
+    version, created = result
+    logger.info(
+        "%s definition %s version %d (%s)",
+        "Registered" if created else "Found existing", name, version, digest,
+    )
+    return int(version), digest, bool(created)
+
+
+async def resolve_version(client: AsyncRedisClient, name: str, version: Optional[int] = None) -> tuple[int, str]:
+    """Return the version number and digest of a definition, the latest by default.
+
+    Raises:
+        ValueError: If the name or version is not registered.
+    """
+    key = RedisKeyTemplates.DEFINITION_VERSIONS.format(name=name)
+    if version is None:
+        pipe = client.pipeline()
+        pipe.llen(key)
+        pipe.lindex(key, -1)
+        version, digest = await pipe.execute()
+    elif version >= 1:
+        digest = await client.lindex(key, version - 1)
+    else:
+        digest = None
+    if not digest:
+        raise ValueError(f"Definition {name} version {version or 'latest'} not found")
+    return version, digest
+
+
+async def list_versions(client: AsyncRedisClient, name: str) -> list[dict]:
+    """Return ``{"version", "digest"}`` for every version of a definition, oldest first."""
+    digests = await client.lrange(RedisKeyTemplates.DEFINITION_VERSIONS.format(name=name))
+    return [{"version": index, "digest": digest} for index, digest in enumerate(digests, start=1)]
+
+
+def bind_parameters(declared: dict, given: dict) -> dict:
+    """Merge the parameters of a run with the declared defaults.
+
+    Raises:
+        ValueError: If a parameter is not declared, or a required one
+            (declared with a ``None`` default) is missing.
+    """
+    unknown = sorted(set(given) - set(declared))
+    if unknown:
+        raise ValueError(f"Unknown parameters: {', '.join(unknown)}")
+    missing = sorted(name for name, default in declared.items() if default is None and given.get(name) is None)
+    if missing:
+        raise ValueError(f"Missing required parameters: {', '.join(missing)}")
+    return {**thaw(declared), **given}
+
+
+def run_submission(
+    definition: Definition,
+    version: int,
+    params: dict,
+    priority: Optional[Priority] = None,
+    deadline: Optional[float] = None,
+) -> Submission:
+    """Prepare a new execution of a registered definition for ``store_submissions``.
+
+    Args:
+        definition: The definition to run.
+        version: Its version number, recorded for reference.
+        params: Parameters of the run, checked against the declared ones.
+        priority: Overrides the definition's priority.
+        deadline: Overrides the definition's deadline.
+
+    Raises:
+        ValueError: If the parameters do not match the declared ones.
+    """
+    record = {
+        "name": definition.name,
+        DEFINITION_REF: definition.digest,
+        "version": version,
+        "params": bind_parameters(definition.parameters, params),
+    }
+    if priority is not None:
+        record["priority"] = priority.value
+    if deadline is not None:
+        record["deadline"] = deadline
+    return Submission(
+        execution_id=str(uuid.uuid4()),
+        name=definition.name,
+        definition=codecs.encode(record),
+        nodes=definition.nodes,
+        topology=definition.topology,
+        registered=True,
+    )
@@ -0,0 +1,106 @@
+from typing import Iterable, Optional
+from logging_config import get_logger
+from clients.redis_client import redis_client
+from config import settings
+from orchestrator.models import NodeStatus
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.scripts import trim_acked_entries_script
+from orchestrator.state import commit_node_run
+from orchestrator.task_queue import LANE_STREAMS, stream_cap
+
+logger = get_logger(__name__)
+
+# Entries over the ceiling dropped per stream and trim pass
+DROP_BATCH_SIZE = 1000
+
+
+def trim_acked_entries(stream: str) -> tuple[int, int]:
+    """Delete the entries of ``stream`` that every consumer group has acked.
+
+    Entries still pending in any group, or not yet read by one, are kept, so
+    trimming never loses work. Past the ``TASK_STREAM_MAXLEN`` ceiling the
+    oldest entries are dropped as well (see ``drop_overflow``). Runs as one
+    script call per stream, plus one round per dropped batch.
+
+    Returns:
+        tuple: Number of entries trimmed and the stream length afterwards.
+    """
+    trimmed, length = trim_acked_entries_script(
+        keys=[stream, RedisKeyTemplates.STREAM_METRICS], args=[""]
+    )
+    if trimmed:
+        logger.info("Trimmed %d acked entries from %s, %d left", trimmed, stream, length)
+    cap = stream_cap()
+    if cap is not None and length > cap:
+        length = drop_overflow(stream, length - cap)
+    return trimmed, length
+
+
+def drop_overflow(stream: str, count: int) -> int:
+    """Drop the oldest ``count`` entries of ``stream`` (at most ``DROP_BATCH_SIZE``) whatever their state.
+
+    Each dropped task's node is first committed as ``FAILED`` through
+    ``commit_node_run``, so counters and completion detection see it and a
+    result committed earlier still wins; only then are the entries deleted
+    and their pending copies acked. A crash in between leaves the entries in
+    place for the next pass.
+
+    Returns:
+        int: Stream length afterwards.
+    """
+    entries = redis_client._redis.xrange(stream, count=min(count, DROP_BATCH_SIZE))
+    if not entries:
+        return 0
+    logger.error("Dropping %d entries of %s over the TASK_STREAM_MAXLEN ceiling", len(entries), stream)
+    for msg_id, fields in entries:
+        if "execution_id" not in fields or "node_id" not in fields:
+            continue
+        commit_node_run(
+            fields["execution_id"], fields["node_id"], msg_id, stream, settings.GROUP, NodeStatus.FAILED,
+            error=f"Task dropped by the TASK_STREAM_MAXLEN ceiling of {stream}",
+        )
+    _trimmed, length = trim_acked_entries_script(
+        keys=[stream, RedisKeyTemplates.STREAM_METRICS], args=[_next_stream_id(entries[-1][0])]
+    )
+    return length
+
+
+def _next_stream_id(msg_id: str) -> str:
+    """Return the smallest stream id greater than ``msg_id``."""
+    ms, seq = msg_id.split("-")
+    return f"{ms}-{int(seq) + 1}"
+
+
+def trim_task_streams(streams: Optional[Iterable[str]] = None) -> dict[str, int]:
+    """Trim acked entries from every task lane.
+
+    Args:
+        streams: Streams to trim; every priority lane when omitted.
+
+    Returns:
+        dict[str, int]: Entries trimmed per stream.
+    """
+    streams = LANE_STREAMS.values() if streams is None else streams
+    return {stream: trim_acked_entries(stream)[0] for stream in streams}
+
+
+def stream_metrics(streams: Optional[Iterable[str]] = None) -> dict[str, dict[str, int]]:
+    """Return the length, total trimmed and total dropped entries of every task lane.
+
+    Args:
+        streams: Streams to report; every priority lane when omitted.
+    """
+    streams = list(LANE_STREAMS.values() if streams is None else streams)
+    pipe = redis_client.pipeline()
+    for stream in streams:
+        pipe.xlen(stream)
+    pipe.hgetall(RedisKeyTemplates.STREAM_METRICS)
+    *lengths, counters = pipe.execute()
+    return {
+        stream: {
+            "length": length,
+            "trimmed": int(counters.get(f"{stream}:trimmed", 0)),
+            "dropped": int(counters.get(f"{stream}:dropped", 0)),
+        }
+        for stream, length in zip(streams, lengths)
+    }
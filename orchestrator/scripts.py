@@ -0,0 +1,572 @@
+"""Centralized Lua scripts executed server-side by Redis.
+
+Scripts are registered lazily through ``redis_client.register_script`` and
+invoked with EVALSHA, so each call costs a single round trip and runs
+atomically with respect to other clients.
+"""
+
+from clients.redis_client import redis_client
+
+
+# KEYS[1] resolved set, KEYS[2] remaining-dependency hash, KEYS[3] children
+#         hash of the execution, or of its registered definition
+# ARGV    ids of nodes that reached COMPLETED
+# Returns the children whose remaining-dependency counter dropped to zero.
+RESOLVE_COMPLETED_NODES = """
+local ready = {}
+for _, node_id in ipairs(ARGV) do
+    if redis.call('SADD', KEYS[1], node_id) == 1 then
+        local children = redis.call('HGET', KEYS[3], node_id)
+        if children then
+            for _, child in ipairs(cjson.decode(children)) do
+                if redis.call('HINCRBY', KEYS[2], child, -1) == 0 then
+                    table.insert(ready, child)
+                end
+            end
+        end
+    end
+end
+return ready
+"""
+
+
+# Shared helpers prepended to the scripts that change node statuses.
+#
+# node_record   decodes a node's record from the execution's node hash (JSON,
+#               or a legacy plain status string)
+# node_status   returns just the status of that record
+# record_transition keeps the per-status counters of an execution in step with
+#               every node transition
+# index_workflow_status moves an execution to the index of its new status;
+#               index_keys holds the created-at index followed by the index
+#               of every status in INDEXED_STATUSES (see orchestrator.index)
+# publish_transition appends a node transition (with node_id) or a workflow
+#               status change (without) to the execution's event stream
+# finalize_workflow writes the final workflow status and retires the execution
+#               from the active set once no node is queued or running and
+#               either every node is terminal or one of them failed
+NODE_STATE_HELPERS = """
+local INDEXED_STATUSES = {'PENDING', 'RUNNING', 'COMPLETED', 'FAILED'}
+
+local function index_keys_from(first)
+    return {unpack(KEYS, first, first + #INDEXED_STATUSES)}
+end
+
+local function index_workflow_status(index_keys, execution_id, status)
+    local created_at = redis.call('ZSCORE', index_keys[1], execution_id)
+    if not created_at then
+        return
+    end
+    for i, indexed in ipairs(INDEXED_STATUSES) do
+        if indexed == status then
+            redis.call('ZADD', index_keys[i + 1], created_at, execution_id)
+        else
+            redis.call('ZREM', index_keys[i + 1], execution_id)
+        end
+    end
+end
+
+local function node_record(nodes_key, node_id)
+    local raw = redis.call('HGET', nodes_key, node_id)
+    if not raw then
+        return nil
+    end
+    local ok, record = pcall(cjson.decode, raw)
+    if ok and type(record) == 'table' then
+        return record
+    end
+    return {status = raw}
+end
+
+local function node_status(nodes_key, node_id)
+    local record = node_record(nodes_key, node_id)
+    return record and record['status']
+end
+
+local function record_transition(counters_key, old_status, new_status)
+    if old_status == new_status then
+        return
+    end
+    if old_status then
+        redis.call('HINCRBY', counters_key, old_status, -1)
+    end
+    redis.call('HINCRBY', counters_key, new_status, 1)
+end
+
+local function publish_transition(events_key, cap, status, node_id)
+    if node_id then
+        redis.call('XADD', events_key, 'MAXLEN', '~', cap, '*', 'node_id', node_id, 'status', status)
+    else
+        redis.call('XADD', events_key, 'MAXLEN', '~', cap, '*', 'status', status)
+    end
+end
+
+local function finalize_workflow(counters_key, workflow_status_key, active_key, execution_id, index_keys, events_key, cap)
+    local counters = redis.call('HMGET', counters_key, 'total', 'QUEUED', 'RUNNING', 'COMPLETED', 'FAILED')
+    if not counters[1] then
+        return false
+    end
+    local total = tonumber(counters[1])
+    local in_flight = (tonumber(counters[2]) or 0) + (tonumber(counters[3]) or 0)
+    local completed = tonumber(counters[4]) or 0
+    local failed = tonumber(counters[5]) or 0
+    if in_flight > 0 or (failed == 0 and completed < total) then
+        return false
+    end
+    local final_status = 'COMPLETED'
+    if failed > 0 then
+        final_status = 'FAILED'
+    end
+    redis.call('SET', workflow_status_key, final_status)
+    redis.call('SREM', active_key, execution_id)
+    index_workflow_status(index_keys, execution_id, final_status)
+    publish_transition(events_key, cap, final_status)
+    return final_status
+end
+"""
+
+
+# KEYS[1] counters hash, KEYS[2] workflow status key, KEYS[3] active set,
+#         KEYS[4] node hash, KEYS[5..9] workflow index keys,
+#         KEYS[10] execution event stream
+# ARGV[1] execution id, ARGV[2] approximate execution event stream cap,
+#         then a node id and its encoded record per node
+# Stores every record, updates the counters, publishes status changes and
+# returns the final workflow status if these transitions finished the
+# execution, false otherwise.
+SET_NODE_STATUSES = NODE_STATE_HELPERS + """
+for index = 3, #ARGV, 2 do
+    local node_id = ARGV[index]
+    local record = ARGV[index + 1]
+    local old_status = node_status(KEYS[4], node_id)
+    local new_status = cjson.decode(record)['status']
+    redis.call('HSET', KEYS[4], node_id, record)
+    record_transition(KEYS[1], old_status, new_status)
+    if old_status ~= new_status then
+        publish_transition(KEYS[10], ARGV[2], new_status, node_id)
+    end
+end
+return finalize_workflow(KEYS[1], KEYS[2], KEYS[3], ARGV[1], index_keys_from(5), KEYS[10], ARGV[2])
+"""
+
+
+# KEYS[1] counters hash, KEYS[2] node hash, KEYS[3] execution event stream
+# ARGV[1] node id, ARGV[2] id of the stream message that carries the task,
+#         ARGV[3] approximate execution event stream cap
+# Atomically moves a QUEUED node to RUNNING, recording the message id and the
+# start time. A node already RUNNING under the same message id (a message
+# reclaimed from a dead worker) may run again; any other status means another
+# delivery owns or finished the node. Returns 1 if the caller should run it.
+START_NODE_RUN = NODE_STATE_HELPERS + """
+local record = node_record(KEYS[2], ARGV[1])
+if not record then
+    return 0
+end
+if record['status'] == 'RUNNING' and record['msg_id'] == ARGV[2] then
+    return 1
+end
+if record['status'] ~= 'QUEUED' then
+    return 0
+end
+local now = redis.call('TIME')
+redis.call('HSET', KEYS[2], ARGV[1], cjson.encode({
+    status = 'RUNNING',
+    msg_id = ARGV[2],
+    started_at = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000),
+}))
+record_transition(KEYS[1], 'QUEUED', 'RUNNING')
+publish_transition(KEYS[3], ARGV[3], 'RUNNING', ARGV[1])
+return 1
+"""
+
+
+# KEYS[1] counters hash, KEYS[2] workflow status key, KEYS[3] active set,
+#         KEYS[4] node hash, KEYS[5] output hash, KEYS[6] task
+#         stream, KEYS[7] node event stream, KEYS[8..12] workflow index keys,
+#         KEYS[13] execution event stream
+# ARGV[1] execution id, ARGV[2] node id, ARGV[3] message id, ARGV[4] consumer
+#         group, ARGV[5] final status, ARGV[6] encoded output ('' for none),
+#         ARGV[7] error ('' for none), ARGV[8] approximate event stream cap,
+#         ARGV[9] approximate execution event stream cap
+# Commits a finished run in one call: output, final node record with
+# timestamps, counters, workflow finalization, XACK and the node event. The
+# first terminal write wins: if the node is already COMPLETED or FAILED (a
+# stalled worker finishing after its reclaimed message did) the writes are
+# skipped, but the message is still acked.
+# Returns {1 if committed else 0, final workflow status or ''}.
+COMMIT_NODE_RUN = NODE_STATE_HELPERS + """
+local record = node_record(KEYS[4], ARGV[2]) or {}
+local old_status = record['status']
+local applied = 0
+local final_status = ''
+if old_status ~= 'COMPLETED' and old_status ~= 'FAILED' then
+    local now = redis.call('TIME')
+    local finished = {
+        status = ARGV[5],
+        started_at = record['started_at'],
+        finished_at = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000),
+    }
+    if ARGV[7] ~= '' then
+        finished['error'] = ARGV[7]
+    end
+    if ARGV[6] ~= '' then
+        redis.call('HSET', KEYS[5], ARGV[2], ARGV[6])
+    end
+    redis.call('HSET', KEYS[4], ARGV[2], cjson.encode(finished))
+    record_transition(KEYS[1], old_status, ARGV[5])
+    publish_transition(KEYS[13], ARGV[9], ARGV[5], ARGV[2])
+    final_status = finalize_workflow(KEYS[1], KEYS[2], KEYS[3], ARGV[1], index_keys_from(8), KEYS[13], ARGV[9]) or ''
+    redis.call('XADD', KEYS[7], 'MAXLEN', '~', ARGV[8], '*',
+        'execution_id', ARGV[1], 'node_id', ARGV[2], 'status', ARGV[5])
+    applied = 1
+end
+redis.call('XACK', KEYS[6], ARGV[4], ARGV[3])
+return {applied, final_status}
+"""
+
+
+# KEYS[1] workflow status key, KEYS[2] workflow metadata hash,
+#         KEYS[3..7] workflow index keys, KEYS[8] execution event stream
+# ARGV[1] execution id, ARGV[2] status, ARGV[3] error ('' for none),
+#         ARGV[4] approximate execution event stream cap
+# Writes a workflow status, moves the execution to that status' index and
+# publishes the change unless the status was already set.
+SET_WORKFLOW_STATUS = NODE_STATE_HELPERS + """
+if redis.call('GET', KEYS[1]) ~= ARGV[2] then
+    publish_transition(KEYS[8], ARGV[4], ARGV[2])
+end
+redis.call('SET', KEYS[1], ARGV[2])
+if ARGV[3] ~= '' then
+    redis.call('HSET', KEYS[2], 'error', ARGV[3])
+end
+index_workflow_status(index_keys_from(3), ARGV[1], ARGV[2])
+return 1
+"""
+
+
+# KEYS[1] counters hash, KEYS[2] node hash, KEYS[3] execution event stream,
+#         then the task stream of every node's priority lane
+# ARGV[1] execution id, ARGV[2] approximate execution event stream cap, then
+#         for every node: node id, encoded payload, deadline ('' when it has
+#         none), the number of dependencies and their ids
+# Each node still PENDING whose dependencies are all COMPLETED is flipped to
+# QUEUED and appended to its lane. Returns the ids of the dispatched nodes.
+DISPATCH_NODES = NODE_STATE_HELPERS + """
+local queued = cjson.encode({status = 'QUEUED'})
+local dispatched = {}
+local key_index = 4
+local arg_index = 3
+while arg_index <= #ARGV do
+    local node_id = ARGV[arg_index]
+    local payload = ARGV[arg_index + 1]
+    local deadline = ARGV[arg_index + 2]
+    local dep_count = tonumber(ARGV[arg_index + 3])
+    local stream_key = KEYS[key_index]
+
+    local old_status = node_status(KEYS[2], node_id)
+    local ready = (old_status or 'PENDING') == 'PENDING'
+    for dep_index = arg_index + 4, arg_index + 3 + dep_count do
+        if ready and node_status(KEYS[2], ARGV[dep_index]) ~= 'COMPLETED' then
+            ready = false
+        end
+    end
+
+    if ready then
+        redis.call('HSET', KEYS[2], node_id, queued)
+        record_transition(KEYS[1], old_status, 'QUEUED')
+        local xadd = {'XADD', stream_key}
+        for _, value in ipairs({'*', 'execution_id', ARGV[1], 'node_id', node_id, 'payload', payload}) do
+            table.insert(xadd, value)
+        end
+        if deadline ~= '' then
+            table.insert(xadd, 'deadline')
+            table.insert(xadd, deadline)
+        end
+        redis.call(unpack(xadd))
+        publish_transition(KEYS[3], ARGV[2], 'QUEUED', node_id)
+        table.insert(dispatched, node_id)
+    end
+
+    key_index = key_index + 1
+    arg_index = arg_index + 4 + dep_count
+end
+return dispatched
+"""
+
+
+# KEYS    task streams, ARGV[1] consumer group
+# For every stream returns the id and deadline field ('' if absent) of the
+# oldest entry not yet delivered to the group, or an empty table when the
+# group has nothing left to read. Read-only, so workers can call it freely.
+PEEK_STREAM_HEADS = """
+local heads = {}
+for index, key in ipairs(KEYS) do
+    heads[index] = {}
+    if redis.call('EXISTS', key) == 1 then
+        local last_delivered = nil
+        for _, group in ipairs(redis.call('XINFO', 'GROUPS', key)) do
+            local info = {}
+            for field = 1, #group, 2 do
+                info[group[field]] = group[field + 1]
+            end
+            if info['name'] == ARGV[1] then
+                last_delivered = info['last-delivered-id']
+            end
+        end
+        if last_delivered then
+            local entries = redis.call('XRANGE', key, '(' .. last_delivered, '+', 'COUNT', 1)
+            if #entries > 0 then
+                local deadline = ''
+                local fields = entries[1][2]
+                for field = 1, #fields, 2 do
+                    if fields[field] == 'deadline' then
+                        deadline = fields[field + 1]
+                    end
+                end
+                heads[index] = {entries[1][1], deadline}
+            end
+        end
+    end
+end
+return heads
+"""
+
+
+# KEYS[1] task stream, KEYS[2] stream metrics hash
+# ARGV[1] id before which entries are dropped whatever their state ('' for
+#         none); their nodes must already have been failed by the caller
+# Deletes the entries every consumer group is done with: for each group the
+# oldest pending entry, or else the first entry it has not read yet, must be
+# kept, and XTRIM MINID drops everything older than the lowest of those. A
+# stream every group has fully acked is emptied; a stream without groups is
+# left alone since nobody knows who will read it. Pending entries whose body
+# is gone (dropped here, or deleted by hand) can never be processed and would
+# pin the trim point, so they are acked, up to 100 per group and call.
+# Returns {entries trimmed, stream length afterwards}.
+TRIM_ACKED_ENTRIES = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return {0, 0}
+end
+if ARGV[1] ~= '' then
+    local dropped = redis.call('XTRIM', KEYS[1], 'MINID', ARGV[1])
+    if dropped > 0 then
+        redis.call('HINCRBY', KEYS[2], KEYS[1] .. ':dropped', dropped)
+    end
+end
+local groups = redis.call('XINFO', 'GROUPS', KEYS[1])
+if #groups == 0 then
+    return {0, redis.call('XLEN', KEYS[1])}
+end
+
+local function id_less(a, b)
+    local a_ms, a_seq = string.match(a, '(%d+)-(%d+)')
+    local b_ms, b_seq = string.match(b, '(%d+)-(%d+)')
+    if tonumber(a_ms) ~= tonumber(b_ms) then
+        return tonumber(a_ms) < tonumber(b_ms)
+    end
+    return tonumber(a_seq) < tonumber(b_seq)
+end
+
+local first = redis.call('XRANGE', KEYS[1], '-', '+', 'COUNT', 1)
+local dangling_end = '+'
+if #first > 0 then
+    dangling_end = '(' .. first[1][1]
+end
+
+local min_id = nil
+for _, group in ipairs(groups) do
+    local info = {}
+    for field = 1, #group, 2 do
+        info[group[field]] = group[field + 1]
+    end
+    local keep = nil
+    local pending = tonumber(info['pending'])
+    if pending > 0 then
+        for _, entry in ipairs(redis.call('XPENDING', KEYS[1], info['name'], '-', dangling_end, 100)) do
+            redis.call('XACK', KEYS[1], info['name'], entry[1])
+            pending = pending - 1
+        end
+    end
+    if pending > 0 then
+        keep = redis.call('XPENDING', KEYS[1], info['name'])[2]
+    else
+        local unread = redis.call('XRANGE', KEYS[1], '(' .. info['last-delivered-id'], '+', 'COUNT', 1)
+        if #unread > 0 then
+            keep = unread[1][1]
+        end
+    end
+    if keep and (min_id == nil or id_less(keep, min_id)) then
+        min_id = keep
+    end
+end
+
+local trimmed
+if min_id then
+    trimmed = redis.call('XTRIM', KEYS[1], 'MINID', min_id)
+else
+    trimmed = redis.call('XTRIM', KEYS[1], 'MAXLEN', 0)
+end
+if trimmed > 0 then
+    redis.call('HINCRBY', KEYS[2], KEYS[1] .. ':trimmed', trimmed)
+end
+return {trimmed, redis.call('XLEN', KEYS[1])}
+"""
+
+
+# KEYS    pairs of a legacy per-node key and the hash it moves into
+# ARGV    for every pair the node id and 'status' or 'output'
+# Moves each legacy value into its execution's hash unless the hash already
+# has the node (a write in the new layout wins), then deletes the legacy key.
+# Plain status strings are rewritten as JSON records. Returns the number of
+# values moved.
+MIGRATE_LEGACY_NODE_KEYS = """
+local moved = 0
+for index = 1, #KEYS, 2 do
+    local value = redis.call('GET', KEYS[index])
+    if value then
+        local node_id = ARGV[index]
+        if ARGV[index + 1] == 'status' then
+            local ok, record = pcall(cjson.decode, value)
+            if not ok or type(record) ~= 'table' then
+                value = cjson.encode({status = value})
+            end
+        end
+        moved = moved + redis.call('HSETNX', KEYS[index + 1], node_id, value)
+        redis.call('DEL', KEYS[index])
+    end
+end
+return moved
+"""
+
+
+# KEYS[1] compiled definition key, KEYS[2] version list of the name,
+#         KEYS[3] set of registered names, KEYS[4] children index of the definition
+# ARGV[1] content digest, ARGV[2] encoded compiled definition, ARGV[3] name,
+# ARGV[4..] pairs of node id, JSON list of its children
+# Registers a definition unless the same content is already a version of the
+# name. The children index is written if missing, including for content
+# registered before definitions had one. Returns {version, 1 if newly
+# registered else 0}.
+REGISTER_DEFINITION = """
+if redis.call('EXISTS', KEYS[4]) == 0 then
+    for index = 4, #ARGV, 2 do
+        redis.call('HSET', KEYS[4], ARGV[index], ARGV[index + 1])
+    end
+end
+local existing = redis.call('LPOS', KEYS[2], ARGV[1])
+if existing then
+    return {existing + 1, 0}
+end
+redis.call('SET', KEYS[1], ARGV[2], 'NX')
+local version = redis.call('RPUSH', KEYS[2], ARGV[1])
+redis.call('SADD', KEYS[3], ARGV[3])
+return {version, 1}
+"""
+
+
+# KEYS[1] sorted set of instances (orchestrators or workers) scored by last
+#         heartbeat (ms)
+# ARGV[1] instance id, ARGV[2] heartbeat timeout in milliseconds
+# Uses the Redis clock so instances never disagree because of clock skew.
+# Returns the ids of every instance that heartbeated within the timeout.
+HEARTBEAT_INSTANCE = """
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+redis.call('ZADD', KEYS[1], now_ms, ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now_ms - tonumber(ARGV[2]))
+return redis.call('ZRANGE', KEYS[1], 0, -1)
+"""
+
+
+# KEYS[1] task stream
+# ARGV[1] consumer group, ARGV[2] consumer, ARGV[3..] message ids
+# Resets the idle time of every message still pending for this consumer
+# (XCLAIM JUSTID does not bump the delivery counter), so reclaimers leave the
+# in-flight work of live workers alone. Messages another consumer has already
+# reclaimed are left untouched. Returns the number of messages touched.
+TOUCH_PENDING_MESSAGES = """
+local touched = 0
+for index = 3, #ARGV do
+    local owned = redis.call('XPENDING', KEYS[1], ARGV[1], ARGV[index], ARGV[index], 1, ARGV[2])
+    if #owned > 0 then
+        redis.call('XCLAIM', KEYS[1], ARGV[1], ARGV[2], 0, ARGV[index], 'JUSTID')
+        touched = touched + 1
+    end
+end
+return touched
+"""
+
+
+# KEYS[1] task stream, KEYS[2] worker heartbeats sorted set
+# ARGV[1] consumer group, ARGV[2] claiming consumer, ARGV[3] minimum idle time
+#         and heartbeat timeout in milliseconds, ARGV[4] first pending id to
+#         look at ('-' or an exclusive '(id'), ARGV[5] maximum entries
+# Claims pending entries idle for at least ARGV[3] ms whose consumer has not
+# heartbeated within that time either, so a live worker's entries are never
+# taken even if it failed to refresh them. Entries whose body was trimmed are
+# skipped. Returns the cursor of the next call ('-' once the pending list is
+# exhausted) and {id, fields, deliveries} for every claimed entry.
+CLAIM_ABANDONED_MESSAGES = """
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local pending = redis.call('XPENDING', KEYS[1], ARGV[1], 'IDLE', ARGV[3], ARGV[4], '+', ARGV[5])
+local claimed = {}
+for _, entry in ipairs(pending) do
+    local beat = redis.call('ZSCORE', KEYS[2], entry[2])
+    if not beat or tonumber(beat) < now_ms - tonumber(ARGV[3]) then
+        local messages = redis.call('XCLAIM', KEYS[1], ARGV[1], ARGV[2], ARGV[3], entry[1])
+        if messages[1] then
+            table.insert(claimed, {entry[1], messages[1][2], entry[4] + 1})
+        end
+    end
+end
+local cursor = '-'
+if #pending == tonumber(ARGV[5]) then
+    cursor = '(' .. pending[#pending][1]
+end
+return {cursor, claimed}
+"""
+
+
+# KEYS    lease keys, ARGV[1] owner id, ARGV[2] lease duration in milliseconds
+# Extends every lease still held by the owner. Returns 1/0 per key.
+RENEW_LEASES = """
+local renewed = {}
+for index, key in ipairs(KEYS) do
+    if redis.call('GET', key) == ARGV[1] then
+        renewed[index] = redis.call('PEXPIRE', key, ARGV[2])
+    else
+        renewed[index] = 0
+    end
+end
+return renewed
+"""
+
+
+# KEYS    lease keys, ARGV[1] owner id
+# Deletes every lease still held by the owner.
+RELEASE_LEASES = """
+for _, key in ipairs(KEYS) do
+    if redis.call('GET', key) == ARGV[1] then
+        redis.call('DEL', key)
+    end
+end
+return 1
+"""
+
+
+resolve_completed_nodes_script = redis_client.register_script(RESOLVE_COMPLETED_NODES)
+set_node_statuses_script = redis_client.register_script(SET_NODE_STATUSES)
+start_node_run_script = redis_client.register_script(START_NODE_RUN)
+commit_node_run_script = redis_client.register_script(COMMIT_NODE_RUN)
+set_workflow_status_script = redis_client.register_script(SET_WORKFLOW_STATUS)
+dispatch_nodes_script = redis_client.register_script(DISPATCH_NODES)
+register_definition_script = redis_client.register_script(REGISTER_DEFINITION)
+touch_pending_messages_script = redis_client.register_script(TOUCH_PENDING_MESSAGES)
+claim_abandoned_messages_script = redis_client.register_script(CLAIM_ABANDONED_MESSAGES)
+peek_stream_heads_script = redis_client.register_script(PEEK_STREAM_HEADS)
+trim_acked_entries_script = redis_client.register_script(TRIM_ACKED_ENTRIES)
+migrate_legacy_node_keys_script = redis_client.register_script(MIGRATE_LEGACY_NODE_KEYS)
+heartbeat_instance_script = redis_client.register_script(HEARTBEAT_INSTANCE)
+renew_leases_script = redis_client.register_script(RENEW_LEASES)
+release_leases_script = redis_client.register_script(RELEASE_LEASES)
@@ -0,0 +1,137 @@
+import hashlib
+import zlib
+from logging_config import get_logger
+from clients.redis_client import redis_client
+from config import settings
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.scripts import (
+    heartbeat_instance_script,
+    release_leases_script,
+    renew_leases_script,
+)
+
+
+logger = get_logger(__name__)
+
+
+def shard_for(execution_id: str) -> int:
+    """Return the shard an execution belongs to."""
+    return zlib.crc32(execution_id.encode()) % settings.SCHEDULER_SHARDS
+
+
+def active_set_key(execution_id: str) -> str:
+    """Return the key of the active set holding ``execution_id``."""
+    return RedisKeyTemplates.WORKFLOWS_ACTIVE_SHARD.format(shard=shard_for(execution_id))
+
+
+def all_shards() -> set[int]:
+    """Return every shard number."""
+    return set(range(settings.SCHEDULER_SHARDS))
+
+
+def migrate_legacy_active_set():
+    """Move executions from the unsharded ``workflows:active`` set into shard sets."""
+    legacy_ids = redis_client.smembers(RedisKeyTemplates.WORKFLOWS_ACTIVE)
+    if not legacy_ids:
+        return
+    logger.info("Migrating %d executions from the legacy active set", len(legacy_ids))
+    pipe = redis_client.pipeline(transaction=True)
+    for execution_id in legacy_ids:
+        pipe.sadd(active_set_key(execution_id), execution_id)
+    pipe.srem(RedisKeyTemplates.WORKFLOWS_ACTIVE, *legacy_ids)
+    pipe.execute()
+
+
+def _rendezvous_owner(shard: int, instances: list[str]) -> str:
+    """Pick the instance with the highest hash for ``shard`` (rendezvous hashing)."""
+    return max(
+        instances,
+        key=lambda instance: hashlib.md5(f"{instance}:{shard}".encode()).digest(),
+    )
+
+
+class ShardLeaseManager:
+    """Split shards of the active set between live orchestrator instances.
+
+    Every instance heartbeats into a shared sorted set. Shards are assigned to
+    live instances with rendezvous hashing, so adding or losing an instance
+    only moves that instance's share. Ownership is enforced by leases that
+    expire after ``lease_seconds``: a dead instance stops renewing and its
+    shards are picked up by the new rendezvous owners once the leases lapse.
+    """
+
+    def __init__(self, instance_id: str, lease_seconds: float = None):
+        self.instance_id = instance_id
+        self.lease_seconds = lease_seconds or settings.SHARD_LEASE_SECONDS
+        self.owned: set[int] = set()
+
+    @property
+    def refresh_interval(self) -> float:
+        """Seconds between refreshes; leases are renewed well before they expire."""
+        return self.lease_seconds / 3
+
+    def _lease_key(self, shard: int) -> str:
+        return RedisKeyTemplates.ORCHESTRATOR_SHARD_LEASE.format(shard=shard)
+
+    def live_instances(self) -> list[str]:
+        """Heartbeat this instance and return every instance seen within a lease period."""
+        return heartbeat_instance_script(
+            keys=[RedisKeyTemplates.ORCHESTRATOR_INSTANCES],
+            args=[self.instance_id, int(self.lease_seconds * 1000)],
+        )
+
+    def refresh(self) -> set[int]:
+        """Heartbeat, renew or release current leases and acquire newly assigned shards.
+
+        Returns:
+            set[int]: Shards acquired by this call, which the caller should
+            sweep right away to pick up work left by their previous owner.
+        """
+        lease_ms = int(self.lease_seconds * 1000)
+        instances = self.live_instances()
+        desired = {
+            shard for shard in all_shards()
+            if _rendezvous_owner(shard, instances) == self.instance_id
+        }
+
+        surplus = sorted(self.owned - desired)
+        if surplus:
+            release_leases_script(
+                keys=[self._lease_key(shard) for shard in surplus],
+                args=[self.instance_id],
+            )
+            logger.info("Released shards %s", surplus)
+        kept = sorted(self.owned & desired)
+        if kept:
+            renewed = renew_leases_script(
+                keys=[self._lease_key(shard) for shard in kept],
+                args=[self.instance_id, lease_ms],
+            )
+            lost = {shard for shard, ok in zip(kept, renewed) if not ok}
+            if lost:
+                logger.warning("Lost leases for shards %s", sorted(lost))
+            kept = [shard for shard in kept if shard not in lost]
+
+        wanted = sorted(desired - set(kept))
+        acquired = set()
+        if wanted:
+            pipe = redis_client.pipeline()
+            for shard in wanted:
+                pipe.set(self._lease_key(shard), self.instance_id, nx=True, px=lease_ms)
+            acquired = {shard for shard, ok in zip(wanted, pipe.execute()) if ok}
+            if acquired:
+                logger.info("Acquired shards %s", sorted(acquired))
+
+        self.owned = set(kept) | acquired
+        return acquired
+
+    def release_all(self):
+        """Give up every lease, e.g. on shutdown, so others take over immediately."""
+        if self.owned:
+            release_leases_script(
+                keys=[self._lease_key(shard) for shard in sorted(self.owned)],
+                args=[self.instance_id],
+            )
+        redis_client.zrem(RedisKeyTemplates.ORCHESTRATOR_INSTANCES, self.instance_id)
+        logger.info("Released all shards for %s", self.instance_id)
+        self.owned = set()
@@ -1,13 +1,31 @@
 import json
 import time
 import re
+from typing import Iterable, Optional
 from logging_config import get_logger
 from clients.redis_client import redis_client
+from config import settings
+from orchestrator.dag_cache import workflow_cache
+from orchestrator.events import latest_event_id, read_node_events
 from orchestrator.executor import execute_workflow
 from orchestrator.loader import load_workflow
+from orchestrator.migration import migrate_legacy_node_keys
 from orchestrator.models import NodeStatus
-from orchestrator.state import get_node_status
+from orchestrator.state import (
+    final_status_from_counters,
+    get_node_counters,
+    get_node_statuses,
+    set_workflow_status,
+)
 from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.retention import trim_task_streams
+from orchestrator.sharding import (
+    ShardLeaseManager,
+    active_set_key,
+    all_shards,
+    migrate_legacy_active_set,
+    shard_for,
+)
 
 logger = get_logger(__name__)
 
@@ -16,88 +34,216 @@ WORKFLOW_KEY_PATTERN = re.compile(
 )
 
 
-def discover_active_workflow_ids() -> list[str]:
-    """Return all execution IDs currently tracked as active in Redis."""
-    logger.info("Discovering active workflow ids")
-    ids = redis_client.smembers(RedisKeyTemplates.WORKFLOWS_ACTIVE)
+def discover_active_workflow_ids(shards: Optional[Iterable[int]] = None) -> list[str]:
+    """Return the execution IDs tracked as active in the given shards.
+
+    Args:
+        shards: Shards to scan; every shard when omitted.
+    """
+    shards = sorted(all_shards() if shards is None else shards)
+    logger.info("Discovering active workflow ids in %d shards", len(shards))
+    pipe = redis_client.pipeline()
+    for shard in shards:
+        pipe.smembers(RedisKeyTemplates.WORKFLOWS_ACTIVE_SHARD.format(shard=shard))
+    ids = [id for members in pipe.execute() for id in members]
     logger.info("Found %d active workflow ids", len(ids))
     return [id.decode() if isinstance(id, bytes) else id for id in ids]
 
 
-def workflow_is_complete(execution_id: str) -> bool:
-    """Determine whether a workflow has reached a terminal state."""
+def get_final_workflow_status(execution_id: str) -> Optional[NodeStatus]:
+    """Return ``COMPLETED``/``FAILED`` if the workflow has finished, else None.
+
+    Uses the execution's node counters, which makes the check O(1). Executions
+    stored without counters fall back to inspecting every node status.
+    """
     logger.info("Checking if workflow %s is complete", execution_id)
+    counters = get_node_counters(execution_id)
+    if "total" in counters:
+        return final_status_from_counters(counters)
+
     workflow = load_workflow(execution_id)
 
     has_failed_node = False
-    all_node_statuses = [get_node_status(execution_id, n.id) for n in workflow.nodes]
+    all_node_statuses = list(
+        get_node_statuses(execution_id, [n.id for n in workflow.nodes]).values()
+    )
     for status in all_node_statuses:
         if status == NodeStatus.FAILED:
             has_failed_node = True
 
         if status in (NodeStatus.RUNNING, NodeStatus.QUEUED):
             logger.info("Workflow %s still active with status %s", execution_id, status)
-            return False  # workflow still active
+            return None  # workflow still active
 
     # If all nodes are terminal (COMPLETED or FAILED)
     terminal_states = {NodeStatus.COMPLETED, NodeStatus.FAILED}
     if all(status in terminal_states for status in all_node_statuses):
         logger.info("Workflow %s reached terminal state", execution_id)
-        return True
+        return NodeStatus.FAILED if has_failed_node else NodeStatus.COMPLETED
 
     # If any FAILED node exists and all others are not running/queued
     if has_failed_node:
         logger.info("Workflow %s completed with failures", execution_id)
-        return True
+        return NodeStatus.FAILED
 
     logger.info("Workflow %s is not complete yet", execution_id)
-    return False
+    return None
+
+
+def workflow_is_complete(execution_id: str) -> bool:
+    """Determine whether a workflow has reached a terminal state."""
+    return get_final_workflow_status(execution_id) is not None
 
 
 def check_completion(execution_id: str) -> bool:
     """
     If the workflow is complete, remove it from the active set.
     Returns True if completed, False otherwise.
+
+    Node status transitions already finalize executions as they finish; this
+    catches executions finished by a transition that raced their activation.
     """
     logger.info("Checking completion for workflow %s", execution_id)
-    if workflow_is_complete(execution_id):
-        redis_client.set(
-            RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id=execution_id),
-            NodeStatus.COMPLETED,
-        )
-        redis_client.srem(RedisKeyTemplates.WORKFLOWS_ACTIVE, execution_id)
-        logger.info("Workflow %s marked as complete and removed from active set", execution_id)
+    final_status = get_final_workflow_status(execution_id)
+    if final_status is not None:
+        set_workflow_status(execution_id, final_status)
+        redis_client.srem(active_set_key(execution_id), execution_id)
+        workflow_cache.invalidate(execution_id)
+        logger.info("Workflow %s marked as %s and removed from active set", execution_id, final_status.value)
         return True
     logger.info("Workflow %s still active", execution_id)
     return False
 
 
-def main_loop(sleep_seconds: int = 5):
-    """Continuously schedule workflows, dispatching eligible tasks in a loop.
+def process_execution(execution_id: str, completed_node_ids: Optional[list[str]] = None):
+    """Re-evaluate one active execution: retire it if finished, else dispatch.
 
     Args:
-        sleep_seconds: Delay between scheduler iterations.
+        execution_id: Execution to re-evaluate.
+        completed_node_ids: Nodes reported complete by events; when omitted the
+            whole execution is reconciled.
     """
-    logger.info("[starter] Starting orchestrator scheduler loop...")
+    if check_completion(execution_id) is True:
+        return
+    try:
+        logger.info(f"[starter] Dispatching workflow: {execution_id}")
+        execute_workflow(execution_id, completed_node_ids)
+    except Exception as e:
+        logger.error(f"[starter] Error executing {execution_id}: {e}")
 
-    while True:
-        try:
-            execution_ids = discover_active_workflow_ids()
-            logger.info(f"[starter] Discovered {len(execution_ids)} workflows")
 
-            for execution_id in execution_ids:
-                if check_completion(execution_id) is True:
-                    continue
-                try:
-                    logger.info(f"[starter] Dispatching workflow: {execution_id}")
-                    execute_workflow(execution_id)
-                except Exception as e:
-                    logger.error(f"[starter] Error executing {execution_id}: {e}")
-        except Exception as e:
-            logger.critical(f"[starter] Fatal error in main loop: {e}")
+def sweep_active_workflows(shards: Optional[Iterable[int]] = None):
+    """Re-evaluate every active execution in the given shards (all by default).
 
-        time.sleep(sleep_seconds)
+    Events drive scheduling in the common case; the sweep is a safety net for
+    events lost while the orchestrator was down, for executions triggered
+    before any node finished, and for shards taken over from another instance.
+    """
+    execution_ids = discover_active_workflow_ids(shards)
+    logger.info(f"[starter] Discovered {len(execution_ids)} workflows")
+    logger.info(f"[starter] DAG cache stats: {workflow_cache.stats()}")
+    for execution_id in execution_ids:
+        process_execution(execution_id)
+
+
+def group_node_events(
+    events: list[dict], shards: Optional[set[int]] = None
+) -> dict[str, Optional[list[str]]]:
+    """Group node events by execution, keeping completed node IDs per execution.
+
+    An execution with a trigger event (no node id, see
+    ``events.trigger_event``) maps to ``None`` instead, asking for a full
+    reconcile so its root nodes get dispatched.
+
+    Args:
+        events: Node events read from the event stream.
+        shards: Shards owned by this orchestrator; events for executions in
+            other shards are left to their owner. Every shard when omitted.
+    """
+    completed_by_execution: dict[str, Optional[list[str]]] = {}
+    for event in events:
+        execution_id = event["execution_id"]
+        if shards is not None and shard_for(execution_id) not in shards:
+            continue
+        if not event.get("node_id"):
+            completed_by_execution[execution_id] = None
+            continue
+        completed = completed_by_execution.setdefault(execution_id, [])
+        if completed is not None and event["status"] == NodeStatus.COMPLETED.value:
+            completed.append(event["node_id"])
+    return completed_by_execution
+
+
+def handle_node_events(events: list[dict], shards: Optional[set[int]] = None):
+    """Re-evaluate each active execution referenced by a batch of node events.
+
+    Args:
+        events: Node events read from the event stream.
+        shards: Shards owned by this orchestrator; every shard when omitted.
+    """
+    for execution_id, completed_node_ids in group_node_events(events, shards).items():
+        if not redis_client.sismember(active_set_key(execution_id), execution_id):
+            logger.info(f"[starter] Ignoring event for inactive workflow {execution_id}")
+            workflow_cache.invalidate(execution_id)
+            continue
+        process_execution(execution_id, completed_node_ids)
+
+
+def main_loop(sleep_seconds: float = settings.SCHEDULER_SWEEP_SECONDS):
+    """Schedule workflows as node events arrive, sweeping periodically as a fallback.
+
+    Several orchestrators can run side by side: each one leases a share of the
+    active-set shards and only schedules executions in the shards it owns.
+    Every ``TASK_STREAM_TRIM_SECONDS`` it also trims acked task stream
+    entries; trimming is idempotent, so instances need not coordinate.
+
+    Args:
+        sleep_seconds: Interval between full sweeps of the owned shards.
+            Between sweeps the loop blocks on the node event stream.
+    """
+    logger.info(f"[starter] Starting orchestrator scheduler loop as {settings.ORCHESTRATOR_ID}...")
+    leases = ShardLeaseManager(settings.ORCHESTRATOR_ID)
+    migrate_legacy_active_set()
+    migrate_legacy_node_keys()
+    last_event_id = latest_event_id()
+    next_sweep = 0.0
+    next_lease_refresh = 0.0
+    next_trim = 0.0
+
+    try:
+        while True:
+            try:
+                if time.monotonic() >= next_trim:
+                    trim_task_streams()
+                    next_trim = time.monotonic() + settings.TASK_STREAM_TRIM_SECONDS
+
+                if time.monotonic() >= next_lease_refresh:
+                    acquired = leases.refresh()
+                    next_lease_refresh = time.monotonic() + leases.refresh_interval
+                    if acquired:
+                        sweep_active_workflows(acquired)
+
+                if time.monotonic() >= next_sweep:
+                    sweep_active_workflows(leases.owned)
+                    next_sweep = time.monotonic() + sleep_seconds
+
+                wake_at = min(next_sweep, next_lease_refresh, next_trim)
+                block_ms = max(1, int((wake_at - time.monotonic()) * 1000))
+                last_event_id, events = read_node_events(last_event_id, block_ms)
+                if events:
+                    handle_node_events(events, leases.owned)
+            except Exception as e:
+                logger.critical(f"[starter] Fatal error in main loop: {e}")
+                time.sleep(1)
+    finally:
+        leases.release_all()
 
 
 if __name__ == "__main__":
-    main_loop()
+    if settings.SCHEDULER_MODE == "async":
+        import asyncio
+        from orchestrator.async_engine import async_main_loop
+
+        asyncio.run(async_main_loop())
+    else:
+        main_loop()
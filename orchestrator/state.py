@@ -1,7 +1,19 @@
+from typing import Optional
 from logging_config import get_logger
+from clients import codecs
+from clients.async_redis_client import AsyncRedisClient
 from clients.redis_client import redis_client
+from config import settings
 from orchestrator.models import NodeStatus
 from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.index import status_index_keys
+from orchestrator.scripts import (
+    commit_node_run_script,
+    set_node_statuses_script,
+    set_workflow_status_script,
+    start_node_run_script,
+)
+from orchestrator.sharding import active_set_key
 
 
 logger = get_logger(__name__)
@@ -10,6 +22,9 @@ logger = get_logger(__name__)
 def set_workflow_status(execution_id: str, status: NodeStatus, error: str = None):
     """Persist the overall workflow status to Redis.
 
+    The execution moves to the listing index of its new status in the same
+    script call.
+
     Args:
         execution_id: Workflow execution identifier.
         status: New status to store for the workflow.
@@ -21,11 +36,19 @@ def set_workflow_status(execution_id: str, status: NodeStatus, error: str = None
         status,
         f" with error: {error}" if error else "",
     )
-    key = RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id=execution_id)
-    value = {"status": status.value}
-    if error:
-        value["error"] = error
-    redis_client.set_json(key, value)
+    keys, args = set_workflow_status_call(execution_id, status, error)
+    set_workflow_status_script(keys=keys, args=args)
+
+
+def set_workflow_status_call(execution_id: str, status: NodeStatus, error: Optional[str] = None) -> tuple[list, list]:
+    """Return the keys and args of the ``SET_WORKFLOW_STATUS`` call of ``set_workflow_status``."""
+    keys = [
+        RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id=execution_id),
+        RedisKeyTemplates.WORKFLOW_META.format(execution_id=execution_id),
+        *status_index_keys(),
+        RedisKeyTemplates.WORKFLOW_EXECUTION_EVENTS.format(execution_id=execution_id),
+    ]
+    return keys, [execution_id, status.value, error or "", settings.EXECUTION_EVENT_STREAM_MAXLEN]
 
 
 def get_workflow_status(execution_id: str) -> NodeStatus:
@@ -42,7 +65,15 @@ def get_workflow_status(execution_id: str) -> NodeStatus:
     """
     logger.info("Retrieving workflow status for execution_id=%s", execution_id)
     key = RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id=execution_id)
-    status = redis_client.get(key)
+    return parse_workflow_status(execution_id, redis_client.get(key))
+
+
+def parse_workflow_status(execution_id: str, status: Optional[str]) -> NodeStatus:
+    """Convert a stored workflow status value, as read by any client.
+
+    Raises:
+        ValueError: If the workflow is missing or stored status is invalid.
+    """
     if status is None:
         logger.error("Workflow status missing for execution_id=%s", execution_id)
         raise ValueError(f"Workflow not found for execution_id={execution_id}")
@@ -53,8 +84,17 @@ def get_workflow_status(execution_id: str) -> NodeStatus:
         raise ValueError(f"Invalid or missing status for workflow {execution_id}")
 
 
-def set_node_status(execution_id: str, node_id: str, status: NodeStatus, error: str = None):
-    """Persist a node's status and optional error message to Redis."""
+def set_node_status(execution_id: str, node_id: str, status: NodeStatus, error: str = None) -> Optional[NodeStatus]:
+    """Persist a node's status and optional error message to Redis.
+
+    The node's status counters are updated in the same atomic step, and if the
+    transition finishes the execution the final workflow status is written
+    immediately.
+
+    Returns:
+        NodeStatus: The final workflow status when this transition completed
+        the execution, otherwise ``None``.
+    """
     logger.info(
         "Setting node status for %s/%s to %s%s",
         execution_id,
@@ -62,13 +102,106 @@ def set_node_status(execution_id: str, node_id: str, status: NodeStatus, error:
         status,
         f" with error: {error}" if error else "",
     )
-    key = RedisKeyTemplates.WORKFLOW_NODE.format(
-        execution_id=execution_id, node_id=node_id
-    )
     value = {"status": status.value}
     if error:
         value["error"] = error
-    redis_client.set_json(key, value)
+    return _store_node_records(execution_id, {node_id: value})
+
+
+def start_node_run(execution_id: str, node_id: str, msg_id: str) -> bool:
+    """Atomically claim a QUEUED node for the task message ``msg_id``.
+
+    The node moves to ``RUNNING`` with the message id and start time in one
+    compare-and-set, so of several deliveries of the same node only one runs
+    the handler. The message that already owns a ``RUNNING`` node (reclaimed
+    after its worker died) may run it again.
+
+    Returns:
+        bool: True if the caller should run the handler.
+    """
+    keys, args = start_node_run_call(execution_id, node_id, msg_id)
+    return bool(start_node_run_script(keys=keys, args=args))
+
+
+def start_node_run_call(execution_id: str, node_id: str, msg_id: str) -> tuple[list, list]:
+    """Return the keys and args of the ``START_NODE_RUN`` call of ``start_node_run``."""
+    keys = [
+        RedisKeyTemplates.WORKFLOW_NODE_COUNTERS.format(execution_id=execution_id),
+        RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id),
+        RedisKeyTemplates.WORKFLOW_EXECUTION_EVENTS.format(execution_id=execution_id),
+    ]
+    return keys, [node_id, msg_id, settings.EXECUTION_EVENT_STREAM_MAXLEN]
+
+
+def commit_node_run(
+    execution_id: str,
+    node_id: str,
+    msg_id: str,
+    stream: str,
+    group: str,
+    status: NodeStatus,
+    output: Optional[str] = None,
+    error: Optional[str] = None,
+) -> tuple[bool, Optional[NodeStatus]]:
+    """Persist a finished run and acknowledge its message in a single call.
+
+    Writes the encoded output, the final node record with start and finish
+    timestamps, the status counters and (if this was the last node) the
+    workflow status, then XACKs the message and publishes the node event.
+
+    Args:
+        execution_id: Workflow execution identifier.
+        node_id: Node that finished.
+        msg_id: Task message that ran the node.
+        stream: Stream the message was read from.
+        group: Consumer group to acknowledge the message in.
+        status: ``COMPLETED`` or ``FAILED``.
+        output: Handler output encoded with ``clients.codecs``, if any.
+        error: Error message for failed runs.
+
+    Returns:
+        tuple: Whether the run was committed (False if the node had already
+        finished) and the final workflow status if this run finished the
+        execution.
+    """
+    keys, args = commit_node_run_call(execution_id, node_id, msg_id, stream, group, status, output, error)
+    return parse_commit_result(commit_node_run_script(keys=keys, args=args))
+
+
+def commit_node_run_call(
+    execution_id: str,
+    node_id: str,
+    msg_id: str,
+    stream: str,
+    group: str,
+    status: NodeStatus,
+    output: Optional[str] = None,
+    error: Optional[str] = None,
+) -> tuple[list, list]:
+    """Return the keys and args of the ``COMMIT_NODE_RUN`` call of ``commit_node_run``."""
+    keys = [
+        RedisKeyTemplates.WORKFLOW_NODE_COUNTERS.format(execution_id=execution_id),
+        RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id=execution_id),
+        active_set_key(execution_id),
+        RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id),
+        RedisKeyTemplates.WORKFLOW_OUTPUTS.format(execution_id=execution_id),
+        stream,
+        RedisKeyTemplates.WORKFLOW_EVENT_STREAM,
+        *status_index_keys(),
+        RedisKeyTemplates.WORKFLOW_EXECUTION_EVENTS.format(execution_id=execution_id),
+    ]
+    args = [
+        execution_id, node_id, msg_id, group, status.value,
+        output or "", error or "", settings.EVENT_STREAM_MAXLEN,
+        settings.EXECUTION_EVENT_STREAM_MAXLEN,
+    ]
+    return keys, args
+
+
+def parse_commit_result(result: list) -> tuple[bool, Optional[NodeStatus]]:
+    """Convert the result of a ``COMMIT_NODE_RUN`` call to ``(applied, final workflow status)``."""
+    applied, final_status = result
+    return bool(applied), NodeStatus(final_status) if final_status else None
 
 
 def get_node_status(execution_id: str, node_id: str) -> NodeStatus:
@@ -85,10 +218,8 @@ def get_node_status(execution_id: str, node_id: str) -> NodeStatus:
         ValueError: If the node data is missing or invalid.
     """
     logger.info("Retrieving node status for %s/%s", execution_id, node_id)
-    key = RedisKeyTemplates.WORKFLOW_NODE.format(
-        execution_id=execution_id, node_id=node_id
-    )
-    data = redis_client.get_json(key)
+    key = RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id)
+    data = redis_client.hget_json(key, node_id)
     if data is None:
         logger.error("Node status missing for %s/%s", execution_id, node_id)
         raise ValueError(f"Node not found for execution_id={execution_id}, node_id={node_id}")
@@ -99,11 +230,217 @@ def get_node_status(execution_id: str, node_id: str) -> NodeStatus:
         raise ValueError(f"Invalid or missing status for node {node_id} in execution {execution_id}")
 
 
+def _parse_node_status(data: Optional[dict]) -> Optional[NodeStatus]:
+    """Convert a stored node record to a status, or None if missing/invalid."""
+    if not isinstance(data, dict):
+        return None
+    try:
+        return NodeStatus(data["status"])
+    except (KeyError, ValueError):
+        return None
+
+
+def get_node_statuses(execution_id: str, node_ids: list[str]) -> dict[str, Optional[NodeStatus]]:
+    """Fetch the statuses of many nodes with a single HMGET.
+
+    Args:
+        execution_id: Workflow execution identifier.
+        node_ids: Identifiers of the nodes to look up.
+
+    Returns:
+        dict: Status per node ID, in the order of ``node_ids``. Nodes whose
+        data is missing or invalid map to ``None`` instead of raising.
+    """
+    logger.info("Retrieving %d node statuses for execution_id=%s", len(node_ids), execution_id)
+    key = RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id)
+    return {
+        node_id: _parse_node_status(data)
+        for node_id, data in zip(node_ids, redis_client.hmget_json(key, node_ids))
+    }
+
+
+def get_all_node_statuses(execution_id: str) -> dict[str, Optional[NodeStatus]]:
+    """Fetch the status of every node stored for an execution with one HGETALL.
+
+    Returns:
+        dict: Status per node ID; invalid records map to ``None`` and nodes
+        without a record are absent.
+    """
+    logger.info("Retrieving all node statuses for execution_id=%s", execution_id)
+    key = RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id)
+    return parse_node_records(redis_client.hgetall_json(key))
+
+
+def parse_node_records(records: dict[str, Optional[dict]]) -> dict[str, Optional[NodeStatus]]:
+    """Convert decoded node records, as read by any client, to statuses."""
+    return {node_id: _parse_node_status(data) for node_id, data in records.items()}
+
+
+def set_node_statuses(execution_id: str, statuses: dict[str, NodeStatus]) -> Optional[NodeStatus]:
+    """Persist the statuses of many nodes in a single round trip.
+
+    Behaves like ``set_node_status`` for every node, including the counter
+    updates and completion detection.
+    """
+    logger.info("Setting %d node statuses for execution_id=%s", len(statuses), execution_id)
+    return _store_node_records(execution_id, {
+        node_id: {"status": status.value} for node_id, status in statuses.items()
+    })
+
+
+def _store_node_records(execution_id: str, records: dict[str, dict]) -> Optional[NodeStatus]:
+    """Write node records and status counters atomically via a Lua script."""
+    if not records:
+        return None
+    keys, args = set_node_statuses_call(execution_id, records)
+    return parse_final_status(execution_id, set_node_statuses_script(keys=keys, args=args))
+
+
+def set_node_statuses_call(execution_id: str, records: dict[str, dict]) -> tuple[list, list]:
+    """Return the keys and args of a ``SET_NODE_STATUSES`` call writing ``records``."""
+    keys = [
+        RedisKeyTemplates.WORKFLOW_NODE_COUNTERS.format(execution_id=execution_id),
+        RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id=execution_id),
+        active_set_key(execution_id),
+        RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id),
+        *status_index_keys(),
+        RedisKeyTemplates.WORKFLOW_EXECUTION_EVENTS.format(execution_id=execution_id),
+    ]
+    args = [execution_id, settings.EXECUTION_EVENT_STREAM_MAXLEN]
+    for node_id, record in records.items():
+        args.extend([node_id, codecs.json_codec.dumps(record)])
+    return keys, args
+
+
+def parse_final_status(execution_id: str, final_status: Optional[str]) -> Optional[NodeStatus]:
+    """Convert the result of a status transition script to the final workflow status, if any."""
+    if not final_status:
+        return None
+    logger.info("Workflow %s finished with status %s", execution_id, final_status)
+    return NodeStatus(final_status)
+
+
+def init_node_counters(execution_id: str, node_count: int):
+    """Record the node count that completion detection compares counters against.
+
+    Per-status counters start empty and are incremented by the status
+    transitions themselves, including the initial ``PENDING`` writes.
+    """
+    logger.info("Initializing node counters for %s with %d nodes", execution_id, node_count)
+    key = RedisKeyTemplates.WORKFLOW_NODE_COUNTERS.format(execution_id=execution_id)
+    redis_client.hset(key, {"total": node_count})
+
+
+def queue_initial_node_states(pipe, execution_id: str, node_ids: list[str]):
+    """Add the state of a new execution with every node ``PENDING`` to a pipeline.
+
+    Equivalent to ``init_node_counters`` followed by ``set_node_statuses``
+    with ``PENDING`` for an execution that has no state yet, without the
+    script call.
+    """
+    pipe.hset(
+        RedisKeyTemplates.WORKFLOW_NODE_COUNTERS.format(execution_id=execution_id),
+        mapping={"total": len(node_ids), NodeStatus.PENDING.value: len(node_ids)},
+    )
+    if node_ids:
+        record = codecs.json_codec.dumps({"status": NodeStatus.PENDING.value})
+        pipe.hset(
+            RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id),
+            mapping={node_id: record for node_id in node_ids},
+        )
+
+
+def ensure_node_counters(execution_id: str, statuses: dict[str, Optional[NodeStatus]]):
+    """Rebuild the counters of an execution stored without them.
+
+    Executions submitted before counters existed only carry the increments of
+    later transitions; they are replaced by a full count of ``statuses``.
+    """
+    key = RedisKeyTemplates.WORKFLOW_NODE_COUNTERS.format(execution_id=execution_id)
+    if redis_client.hexists(key, "total"):
+        return
+    logger.info("Rebuilding node counters for execution_id=%s", execution_id)
+    redis_client.hset(key, count_node_statuses(statuses))
+
+
+def count_node_statuses(statuses: dict[str, Optional[NodeStatus]]) -> dict[str, int]:
+    """Return the node counters matching ``statuses``: the ``total`` and a count per status."""
+    counts = {status.value: 0 for status in NodeStatus}
+    for status in statuses.values():
+        if status is not None:
+            counts[status.value] += 1
+    return {"total": len(statuses), **counts}
+
+
+def get_node_counters(execution_id: str) -> dict[str, int]:
+    """Return the node count (``total``) and the number of nodes in each status."""
+    key = RedisKeyTemplates.WORKFLOW_NODE_COUNTERS.format(execution_id=execution_id)
+    return {field: int(value) for field, value in redis_client.hgetall(key).items()}
+
+
+def final_status_from_counters(counters: dict[str, int]) -> Optional[NodeStatus]:
+    """Return the final workflow status implied by node counters, if finished.
+
+    Mirrors the check done by the status transition script: nothing may be
+    queued or running, and either every node is terminal or one has failed.
+    """
+    if "total" not in counters:
+        return None
+    in_flight = counters.get(NodeStatus.QUEUED.value, 0) + counters.get(NodeStatus.RUNNING.value, 0)
+    completed = counters.get(NodeStatus.COMPLETED.value, 0)
+    failed = counters.get(NodeStatus.FAILED.value, 0)
+    if in_flight > 0 or (failed == 0 and completed < counters["total"]):
+        return None
+    return NodeStatus.FAILED if failed else NodeStatus.COMPLETED
+
+
+async def get_execution_statuses(client: AsyncRedisClient, execution_ids: list[str]) -> list[dict]:
+    """Read the status and node counts of many executions in one pipelined round trip.
+
+    Node counts come from the counters kept by the status transitions, so
+    the cost per execution does not depend on its size.
+
+    Args:
+        client: Async Redis client to read through.
+        execution_ids: Executions to report on.
+
+    Returns:
+        list: One entry per id, in order: ``{"execution_id", "status",
+        "nodes"}`` where ``nodes`` holds the ``total`` and the count of each
+        node status in lower case, or ``None`` for executions stored without
+        counters; ``{"execution_id", "error"}`` for unknown executions.
+    """
+    if not execution_ids:
+        return []
+    fields = ["total", *(status.value for status in NodeStatus)]
+    pipe = client.pipeline()
+    for execution_id in execution_ids:
+        pipe.get(RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id=execution_id))
+        pipe.hmget(RedisKeyTemplates.WORKFLOW_NODE_COUNTERS.format(execution_id=execution_id), fields)
+    values = await pipe.execute()
+
+    statuses = []
+    for execution_id, raw, counters in zip(execution_ids, values[::2], values[1::2]):
+        try:
+            status = parse_workflow_status(execution_id, raw)
+        except ValueError as e:
+            statuses.append({"execution_id": execution_id, "error": str(e)})
+            continue
+        nodes = None
+        if counters[0] is not None:
+            nodes = {field.lower(): int(count or 0) for field, count in zip(fields, counters)}
+        statuses.append({"execution_id": execution_id, "status": status.value, "nodes": nodes})
+    return statuses
+
+
 def all_dependencies_succeeded(execution_id: str, dependencies: list) -> bool:
     """Return True if all dependency nodes for a workflow are completed."""
     logger.info("Checking dependencies for execution_id=%s: %s", execution_id, dependencies)
-    for dep in dependencies:
-        status = get_node_status(execution_id, dep)
+    statuses = get_node_statuses(execution_id, dependencies)
+    for dep, status in statuses.items():
+        if status is None:
+            logger.error("Node status missing for %s/%s", execution_id, dep)
+            raise ValueError(f"Node not found for execution_id={execution_id}, node_id={dep}")
         if status != NodeStatus.COMPLETED:
             logger.info("Dependency %s has not completed (status=%s)", dep, status)
             return False
@@ -114,25 +451,33 @@ def all_dependencies_succeeded(execution_id: str, dependencies: list) -> bool:
 def set_node_output(execution_id: str, node_id: str, output: dict):
     """Store the output produced by a workflow node."""
     logger.info("Setting output for node %s/%s", execution_id, node_id)
-    key = RedisKeyTemplates.WORKFLOW_NODE_OUTPUT.format(
-        execution_id=execution_id, node_id=node_id
-    )
-    redis_client.set_json(key, output)
+    key = RedisKeyTemplates.WORKFLOW_OUTPUTS.format(execution_id=execution_id)
+    redis_client.hset_encoded(key, node_id, output)
 
 
 def get_node_output(execution_id: str, node_id: str) -> dict:
     """Retrieve the stored output for a workflow node, or an empty dict."""
     logger.info("Retrieving output for node %s/%s", execution_id, node_id)
-    key = RedisKeyTemplates.WORKFLOW_NODE_OUTPUT.format(
-        execution_id=execution_id, node_id=node_id
-    )
-    return redis_client.get_json(key) or {}
+    key = RedisKeyTemplates.WORKFLOW_OUTPUTS.format(execution_id=execution_id)
+    return redis_client.hget_json(key, node_id) or {}
 
 
-def get_all_node_outputs(execution_id: str, nodes: list[str]):
-    """Collect outputs for a list of nodes keyed by node ID."""
-    logger.info("Gathering outputs for workflow %s for nodes: %s", execution_id, nodes)
+def get_node_outputs(execution_id: str, node_ids: list[str]) -> dict[str, dict]:
+    """Retrieve the outputs of many nodes with a single HMGET.
+
+    Nodes without a stored output map to an empty dict.
+    """
+    logger.info("Retrieving outputs for %d nodes of execution_id=%s", len(node_ids), execution_id)
+    key = RedisKeyTemplates.WORKFLOW_OUTPUTS.format(execution_id=execution_id)
     return {
-        node_id: get_node_output(execution_id, node_id)
-        for node_id in nodes
+        node_id: output or {}
+        for node_id, output in zip(node_ids, redis_client.hmget_json(key, node_ids))
     }
+
+
+def get_all_node_outputs(execution_id: str, nodes: list[str]):
+    """Collect outputs for a list of nodes keyed by node ID with one HGETALL."""
+    logger.info("Gathering outputs for workflow %s for nodes: %s", execution_id, nodes)
+    key = RedisKeyTemplates.WORKFLOW_OUTPUTS.format(execution_id=execution_id)
+    outputs = redis_client.hgetall_json(key)
+    return {node_id: outputs.get(node_id) or {} for node_id in nodes}
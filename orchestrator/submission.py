@@ -0,0 +1,121 @@
+"""Writes that create new executions, batched into a single pipeline.
+
+Submitting an execution writes its definition, topology, initial node
+states, readiness index and listing index entries. ``store_submissions``
+queues all of them, for any number of executions, in one pipeline, so a
+submission costs one round trip however many workflows it carries. The
+workflow status is written last for each execution: an execution whose
+status key exists has every other key in place.
+
+With ``trigger``, executions start ``RUNNING`` in their active shard and a
+trigger event is appended to the event stream in the same pipeline; the
+orchestrator that owns the shard dispatches their root nodes, or its next
+sweep does if the event is missed.
+"""
+
+import time
+from typing import NamedTuple, Optional
+from logging_config import get_logger
+from clients.async_redis_client import AsyncRedisClient
+from clients.redis_client import redis_client
+from config import settings
+from orchestrator.events import EVENT_STREAM, trigger_event
+from orchestrator.index import queue_registration
+from orchestrator.models import NodeStatus, Topology
+from orchestrator.readiness import queue_readiness_index
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.sharding import active_set_key
+from orchestrator.state import queue_initial_node_states
+from orchestrator.topology import queue_topology
+
+logger = get_logger(__name__)
+
+
+class Submission(NamedTuple):
+    """A validated workflow ready to be stored as a new execution.
+
+    Attributes:
+        execution_id: Identifier of the new execution.
+        name: Workflow name, for the listing index.
+        definition: Workflow definition encoded with ``clients.codecs``, or
+            the record of an execution of a registered definition.
+        nodes: Nodes of the DAG.
+        topology: Topology computed by validation.
+        registered: True if ``definition`` references a registered
+            definition, whose topology and children index are stored with it.
+    """
+
+    execution_id: str
+    name: str
+    definition: str
+    nodes: list
+    topology: Topology
+    registered: bool = False
+
+
+def queue_submission(pipe, submission: Submission, created_at: int, trigger: bool = False):
+    """Add every write creating one execution to a pipeline without executing it."""
+    execution_id = submission.execution_id
+    pipe.set(RedisKeyTemplates.WORKFLOW.format(execution_id=execution_id), submission.definition)
+    if not submission.registered:
+        queue_topology(pipe, execution_id, submission.topology)
+    queue_initial_node_states(pipe, execution_id, [node.id for node in submission.nodes])
+    queue_readiness_index(
+        pipe, execution_id, submission.nodes, submission.topology.children, store_children=not submission.registered
+    )
+    if trigger:
+        pipe.sadd(active_set_key(execution_id), execution_id)
+    status = NodeStatus.RUNNING if trigger else NodeStatus.PENDING
+    queue_registration(pipe, execution_id, submission.name, created_at, status)
+    if trigger:
+        pipe.xadd(
+            RedisKeyTemplates.WORKFLOW_EXECUTION_EVENTS.format(execution_id=execution_id),
+            {"status": status.value},
+            maxlen=settings.EXECUTION_EVENT_STREAM_MAXLEN,
+        )
+        pipe.xadd(EVENT_STREAM, trigger_event(execution_id), maxlen=settings.EVENT_STREAM_MAXLEN)
+
+
+def store_submissions(submissions: list[Submission], trigger: bool = False, created_at: Optional[int] = None) -> int:
+    """Store new executions through a single pipeline.
+
+    Args:
+        submissions: Validated workflows to store.
+        trigger: Start the executions right away instead of leaving them
+            ``PENDING`` until ``POST /workflow/trigger``.
+        created_at: Creation time in epoch milliseconds; defaults to now.
+
+    Returns:
+        int: The creation time recorded for every execution.
+    """
+    created_at = created_at if created_at is not None else int(time.time() * 1000)
+    if not submissions:
+        return created_at
+    pipe = redis_client.pipeline()
+    for submission in submissions:
+        queue_submission(pipe, submission, created_at, trigger)
+    pipe.execute()
+    logger.info(
+        "Stored %d executions in one pipeline (trigger=%s)", len(submissions), trigger
+    )
+    return created_at
+
+
+async def store_submissions_async(
+    client: AsyncRedisClient,
+    submissions: list[Submission],
+    trigger: bool = False,
+    created_at: Optional[int] = None,
+) -> int:
+    """``store_submissions`` through the pipeline of an ``AsyncRedisClient``."""
+    created_at = created_at if created_at is not None else int(time.time() * 1000)
+    if not submissions:
+        return created_at
+    pipe = client.pipeline()
+    for submission in submissions:
+        queue_submission(pipe, submission, created_at, trigger)
+    await pipe.execute()
+    logger.info(
+        "Stored %d executions in one async pipeline (trigger=%s)", len(submissions), trigger
+    )
+    return created_at
@@ -1,7 +1,11 @@
-import json
+from typing import NamedTuple, Optional
 from logging_config import get_logger
+from clients import codecs
 from clients.redis_client import redis_client
+from config import settings
+from orchestrator.models import Priority
 from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.scripts import dispatch_nodes_script
 
 STREAM_NAME = RedisKeyTemplates.WORKFLOW_TASK_STREAM
 
@@ -9,17 +13,106 @@ STREAM_NAME = RedisKeyTemplates.WORKFLOW_TASK_STREAM
 logger = get_logger(__name__)
 
 
-def push_task(execution_id: str, node_id: str, payload: dict):
-    """Push a serialized task message onto the workflow stream."""
+def lane_streams(base_stream: str = STREAM_NAME) -> dict[Priority, str]:
+    """Return the task stream of every priority lane, highest priority first.
+
+    The normal lane keeps the unsuffixed stream name so producers and workers
+    that predate lanes keep working against it.
+    """
+    return {
+        Priority.HIGH: f"{base_stream}:{Priority.HIGH.value}",
+        Priority.NORMAL: base_stream,
+        Priority.LOW: f"{base_stream}:{Priority.LOW.value}",
+    }
+
+
+LANE_STREAMS = lane_streams()
+
+
+def stream_cap() -> Optional[int]:
+    """Return the length ``trim_task_streams`` caps task streams at, or None if disabled."""
+    return settings.TASK_STREAM_MAXLEN or None
+
+
+class QueuedTask(NamedTuple):
+    """A node offered to ``dispatch_tasks``; priority and deadline are optional."""
+    node_id: str
+    dependencies: list[str]
+    payload: dict
+    priority: Priority = Priority.NORMAL
+    deadline: Optional[float] = None
+
+
+def push_task(
+    execution_id: str,
+    node_id: str,
+    payload: dict,
+    priority: Priority = Priority.NORMAL,
+    deadline: Optional[float] = None,
+):
+    """Push a serialized task message onto the stream of its priority lane."""
+    stream = LANE_STREAMS[priority]
     logger.info(
         "Queueing task for execution_id=%s node_id=%s with payload keys=%s",
         execution_id,
         node_id,
         list(payload.keys()),
     )
-    redis_client.xadd(STREAM_NAME, {
+    fields = {
         "execution_id": execution_id,
         "node_id": node_id,
-        "payload": json.dumps(payload)
-    })
-    logger.info("Task queued on stream %s for %s/%s", STREAM_NAME, execution_id, node_id)
+        "payload": codecs.encode(payload)
+    }
+    if deadline is not None:
+        fields["deadline"] = deadline
+    redis_client.xadd(stream, fields)
+    logger.info("Task queued on stream %s for %s/%s", stream, execution_id, node_id)
+
+
+def dispatch_tasks(execution_id: str, tasks: list[tuple]) -> list[str]:
+    """Atomically queue a batch of nodes from one execution in a single round trip.
+
+    A server-side script re-checks that each node is still ``PENDING`` and
+    that all of its dependencies are ``COMPLETED``, then flips it to
+    ``QUEUED`` (updating the execution's status counters) and appends it to
+    the stream of its priority lane. Concurrent dispatchers (the trigger endpoint and the scheduler
+    loop) therefore never enqueue a node twice.
+
+    Args:
+        execution_id: Workflow execution identifier.
+        tasks: ``QueuedTask`` (or a plain ``(node_id, dependencies, payload)``
+            tuple for the normal lane) for every candidate node.
+
+    Returns:
+        list[str]: IDs of the nodes that were actually dispatched.
+    """
+    if not tasks:
+        return []
+    logger.info(
+        "Dispatching %d candidate tasks for execution_id=%s", len(tasks), execution_id
+    )
+    keys, args = dispatch_tasks_call(execution_id, tasks)
+    dispatched = dispatch_nodes_script(keys=keys, args=args)
+    logger.info("Dispatched tasks for execution_id=%s: %s", execution_id, dispatched)
+    return dispatched
+
+
+def dispatch_tasks_call(execution_id: str, tasks: list[tuple]) -> tuple[list, list]:
+    """Return the keys and args of the ``DISPATCH_NODES`` call of ``dispatch_tasks``."""
+    keys = [
+        RedisKeyTemplates.WORKFLOW_NODE_COUNTERS.format(execution_id=execution_id),
+        RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id),
+        RedisKeyTemplates.WORKFLOW_EXECUTION_EVENTS.format(execution_id=execution_id),
+    ]
+    args = [execution_id, settings.EXECUTION_EVENT_STREAM_MAXLEN]
+    for task in tasks:
+        task = QueuedTask(*task)
+        keys.append(LANE_STREAMS[task.priority])
+        args.extend([
+            task.node_id,
+            codecs.encode(task.payload),
+            "" if task.deadline is None else task.deadline,
+            len(task.dependencies),
+            *task.dependencies,
+        ])
+    return keys, args
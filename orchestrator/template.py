@@ -1,34 +1,162 @@
 import re
+from typing import Iterable, Optional
 from logging_config import get_logger
 
-from orchestrator.state import get_node_output
+from clients import blob_store
+from orchestrator.models import thaw
+from orchestrator.state import get_node_outputs
 
 TEMPLATE_PATTERN = re.compile(r"\{\{\s*([\w_]+)\.([\w_]+)\s*\}\}")
+# Templates of this namespace refer to the parameters of an execution of a
+# registered definition, e.g. ``{{ params.url }}``
+PARAMS_NAMESPACE = "params"
+# Config values whose templates refer to offloaded outputs are sent as
+# ``{"$template": [...]}``: literal text and ``[node_id, output_key]`` pairs
+# for the worker to fill in, so substituted text is never rendered again
+PLACEHOLDER_KEY = "$template"
 
 
 logger = get_logger(__name__)
 
 
-def resolve_templates(execution_id: str, config: dict) -> dict:
-    """Resolve templated values in a node's config using upstream outputs."""
-    logger.info("Resolving templates for execution_id=%s", execution_id)
-    resolved = {}
-
-    for key, value in config.items():
-        if isinstance(value, str):
-            matches = TEMPLATE_PATTERN.findall(value)
-            for node_id, output_key in matches:
-                output = get_node_output(execution_id, node_id)
-                replacement = output.get(output_key, f"<missing:{node_id}.{output_key}>")
-                logger.info(
-                    "Resolved template for key=%s using %s.%s -> %s",
-                    key,
-                    node_id,
-                    output_key,
-                    replacement,
-                )
-                value = value.replace(f"{{{{ {node_id}.{output_key} }}}}", str(replacement))
-        resolved[key] = value
+def template_references(config: dict) -> set[tuple[str, str]]:
+    """Return the ``(node_id, output_key)`` pairs referenced by a config's templates."""
+    return {
+        reference
+        for value in config.values() if isinstance(value, str)
+        for reference in TEMPLATE_PATTERN.findall(value)
+    }
+
+
+def render_templates(config: dict, outputs: dict[str, dict], deferred: Iterable[str] = ()) -> dict:
+    """Substitute the templates of nodes present in ``outputs``; others are left as is.
+
+    Values referring to a node in ``deferred`` become placeholders (see
+    ``PLACEHOLDER_KEY``) that ``fill_placeholders`` completes. Every template
+    is matched against the original text only, so an output containing
+    ``{{ node.key }}`` is substituted verbatim.
+
+    Returns a plain dict, also when ``config`` is a frozen node config.
+    """
+    deferred = set(deferred)
+    return {
+        key: _render_value(value, outputs, deferred) if isinstance(value, str) else thaw(value)
+        for key, value in config.items()
+    }
+
+
+def _render_value(value: str, outputs: dict[str, dict], deferred: set[str]):
+    parts, last = [""], 0
+    for match in TEMPLATE_PATTERN.finditer(value):
+        node_id, output_key = match.groups()
+        parts[-1] += value[last:match.start()]
+        last = match.end()
+        if node_id in deferred:
+            parts += [[node_id, output_key], ""]
+        elif node_id in outputs:
+            logger.info("Resolved template %s.%s", node_id, output_key)
+            parts[-1] += _output_value(outputs, node_id, output_key)
+        else:
+            parts[-1] += match.group(0)
+    parts[-1] += value[last:]
+    if len(parts) == 1:
+        return parts[0]
+    return {PLACEHOLDER_KEY: [part for part in parts if part != ""]}
+
+
+def _output_value(outputs: dict[str, dict], node_id: str, output_key: str) -> str:
+    return str(outputs[node_id].get(output_key, f"<missing:{node_id}.{output_key}>"))
+
+
+def fill_placeholders(config: dict, outputs: dict[str, dict]) -> dict:
+    """Complete the placeholders left by ``render_templates`` with ``outputs``."""
+    def fill(value):
+        if not (isinstance(value, dict) and value.keys() == {PLACEHOLDER_KEY}):
+            return value
+        return "".join(
+            part if isinstance(part, str) else _output_value(outputs, *part)
+            for part in value[PLACEHOLDER_KEY]
+        )
+
+    return {key: fill(value) for key, value in config.items()}
+
+
+def task_inputs(execution_id: str, config: dict, params: Optional[dict] = None) -> dict:
+    """Resolve a node's config against upstream outputs for its task payload.
+
+    The outputs of every referenced node are read with one HMGET. Inline
+    outputs are substituted right away. Outputs offloaded to the blob
+    store are passed by reference: their templates become placeholders in
+    the config and the payload lists the references under ``refs``, for the
+    worker to load just before running the handler (see ``load_task_config``).
 
+    Args:
+        execution_id: Execution the node belongs to.
+        config: The node's config.
+        params: Parameters of an execution of a registered definition, which
+            ``{{ params.<name> }}`` templates refer to.
+
+    Returns:
+        dict: ``{"config": ...}``, plus ``"refs"`` if any output is offloaded.
+    """
+    logger.info("Resolving templates for execution_id=%s", execution_id)
+    node_ids = referenced_outputs(config, params)
+    stored = get_node_outputs(execution_id, node_ids) if node_ids else {}
+    inputs = build_task_inputs(config, stored, params)
     logger.info("Template resolution complete for execution_id=%s", execution_id)
-    return resolved
+    return inputs
+
+
+def referenced_outputs(config: dict, params: Optional[dict] = None) -> list[str]:
+    """Return the sorted ids of the nodes whose outputs a config's templates need."""
+    node_ids = {node_id for node_id, _ in template_references(config)}
+    if params:
+        node_ids.discard(PARAMS_NAMESPACE)
+    return sorted(node_ids)
+
+
+def build_task_inputs(config: dict, stored: dict[str, dict], params: Optional[dict] = None) -> dict:
+    """Build the task inputs of ``task_inputs`` from already-read node outputs.
+
+    Args:
+        config: The node's config.
+        stored: Outputs by node id, including at least every node in
+            ``referenced_outputs(config, params)``, e.g. read for several
+            configs at once.
+        params: Parameters of an execution of a registered definition.
+    """
+    outputs, refs = {}, {}
+    if params:
+        outputs[PARAMS_NAMESPACE] = thaw(params)
+    for node_id in referenced_outputs(config, params):
+        output = stored.get(node_id) or {}
+        if blob_store.is_blob_ref(output):
+            refs[node_id] = output
+        else:
+            outputs[node_id] = output
+
+    inputs = {"config": render_templates(config, outputs, deferred=refs)}
+    if refs:
+        inputs["refs"] = refs
+    return inputs
+
+
+def resolve_templates(execution_id: str, config: dict) -> dict:
+    """Resolve templated values in a node's config using upstream outputs.
+
+    Templates of outputs offloaded to the blob store are left as placeholders.
+    """
+    return task_inputs(execution_id, config)["config"]
+
+
+def load_task_config(payload: dict) -> dict:
+    """Return a task's config with the offloaded outputs it references filled in.
+
+    Raises:
+        ValueError: If a referenced blob is missing or corrupt.
+    """
+    config = payload.get("config", {})
+    refs = payload.get("refs")
+    if not refs:
+        return config
+    return fill_placeholders(config, {node_id: blob_store.load(ref) for node_id, ref in refs.items()})
@@ -0,0 +1,86 @@
+from typing import Optional
+from logging_config import get_logger
+from clients import codecs
+from clients.redis_client import redis_client
+from orchestrator.models import Topology
+from orchestrator.redis_keys import RedisKeyTemplates
+
+
+logger = get_logger(__name__)
+
+
+def topological_sort(dependencies: dict[str, list[str]]) -> Topology:
+    """Order a DAG with Kahn's algorithm in O(V + E) without recursion.
+
+    Args:
+        dependencies: Mapping of every node ID to the IDs it depends on. Every
+            dependency must itself be a key of the mapping.
+
+    Returns:
+        Topology: Topological order, depth levels and children index.
+
+    Raises:
+        ValueError: If the graph contains a cycle.
+    """
+    children: dict[str, list[str]] = {node_id: [] for node_id in dependencies}
+    in_degree: dict[str, int] = {}
+    for node_id, deps in dependencies.items():
+        in_degree[node_id] = len(deps)
+        for dep in deps:
+            children[dep].append(node_id)
+
+    # The order list doubles as the FIFO queue of Kahn's algorithm.
+    order = [node_id for node_id, degree in in_degree.items() if degree == 0]
+    append = order.append
+    for node_id in order:
+        for child in children[node_id]:
+            remaining = in_degree[child] - 1
+            in_degree[child] = remaining
+            if remaining == 0:
+                append(child)
+
+    if len(order) != len(dependencies):
+        raise ValueError("Workflow DAG contains a cycle")
+
+    # Parents precede children in ``order``, so one pass settles every depth.
+    levels: dict[str, int] = {}
+    for node_id in order:
+        deps = dependencies[node_id]
+        levels[node_id] = 1 + max(levels[dep] for dep in deps) if deps else 0
+    return Topology(order=order, levels=levels, children=children)
+
+
+def compute_topology(nodes) -> Topology:
+    """Return the topology of ``nodes`` (objects exposing ``id`` and ``dependencies``)."""
+    return topological_sort({node.id: node.dependencies for node in nodes})
+
+
+def topology_to_dict(topology: Topology) -> dict:
+    return {
+        "order": list(topology.order),
+        "levels": dict(topology.levels),
+        "children": {node_id: list(child_ids) for node_id, child_ids in topology.children.items()},
+    }
+
+
+def topology_from_dict(data: dict) -> Topology:
+    return Topology(order=data["order"], levels=data["levels"], children=data["children"])
+
+
+def save_topology(execution_id: str, topology: Topology):
+    """Store a precomputed topology next to the workflow definition."""
+    key = RedisKeyTemplates.WORKFLOW_TOPOLOGY.format(execution_id=execution_id)
+    redis_client.set_encoded(key, topology_to_dict(topology))
+
+
+def queue_topology(pipe, execution_id: str, topology: Topology):
+    """Add the write of ``save_topology`` to a pipeline without executing it."""
+    key = RedisKeyTemplates.WORKFLOW_TOPOLOGY.format(execution_id=execution_id)
+    pipe.set(key, codecs.encode(topology_to_dict(topology)))
+
+
+def load_topology(execution_id: str) -> Optional[Topology]:
+    """Return the stored topology of an execution, or None if it has none."""
+    key = RedisKeyTemplates.WORKFLOW_TOPOLOGY.format(execution_id=execution_id)
+    data = redis_client.get_json(key)
+    return topology_from_dict(data) if data else None
@@ -1,15 +1,39 @@
 from logging_config import get_logger
+from clients.async_redis_client import AsyncRedisClient
+from orchestrator.async_engine import AsyncScheduler
 from orchestrator.executor import execute_workflow
+from orchestrator.loader import load_workflow, load_workflow_async
+from orchestrator.models import NodeStatus
 from clients.redis_client import redis_client
-from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.sharding import active_set_key
 
 
 logger = get_logger(__name__)
 
 
 def trigger_workflow_execution(execution_id: str):
-    """Kick off a workflow and track it as active in Redis."""
+    """Kick off a workflow and track it as active in Redis.
+
+    The execution joins the active set before its first nodes are dispatched,
+    so a node transition that finishes the workflow always finds it there.
+    """
     logger.info("Triggering workflow execution for %s", execution_id)
+    load_workflow(execution_id)
+    redis_client.sadd(active_set_key(execution_id), execution_id)
+    logger.info("Workflow %s added to active set", execution_id)
     execute_workflow(execution_id)
-    redis_client.sadd(RedisKeyTemplates.WORKFLOWS_ACTIVE, execution_id)
+
+
+async def start_workflow_async(client: AsyncRedisClient, execution_id: str):
+    """Mark a workflow ``RUNNING`` and trigger it, all on an ``AsyncRedisClient``.
+
+    Runs the same steps and scripts as ``set_workflow_status`` followed by
+    ``trigger_workflow_execution``; the dispatch is one ``AsyncScheduler`` pass.
+    """
+    scheduler = AsyncScheduler(client)
+    await scheduler.set_workflow_status(execution_id, NodeStatus.RUNNING)
+    logger.info("Triggering workflow execution for %s", execution_id)
+    await load_workflow_async(client, execution_id)
+    await client.sadd(active_set_key(execution_id), execution_id)
     logger.info("Workflow %s added to active set", execution_id)
+    await scheduler.execute_workflow(execution_id)
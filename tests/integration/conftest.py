@@ -2,15 +2,19 @@ import pytest
 from fastapi.testclient import TestClient
 
 from clients.redis_client import redis_client
+from orchestrator.dag_cache import definition_cache, workflow_cache
 
 
 @pytest.fixture(scope="session")
 def client():
     from main import app
 
-    return TestClient(app)
+    with TestClient(app) as client:
+        yield client
 
 
 @pytest.fixture(autouse=True)
 def flush_redis():
     redis_client.flush()
+    workflow_cache.clear()
+    definition_cache.clear()
@@ -75,7 +75,13 @@ def wait_for_status(execution_id: str, node_id: str, expected: NodeStatus, timeo
 
 
 def enqueue_task(execution_id: str, node_id: str, handler_name: str, config: dict | None = None):
-    set_node_status(execution_id, node_id, NodeStatus.QUEUED)
+    # A duplicate is a second message for a node that was queued once, as
+    # with a redelivery; re-queueing a node that already finished would make
+    # it genuinely runnable again.
+    try:
+        get_node_status(execution_id, node_id)
+    except ValueError:
+        set_node_status(execution_id, node_id, NodeStatus.QUEUED)
     payload = {"handler": handler_name}
     if config:
         payload["config"] = config
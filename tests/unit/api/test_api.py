@@ -9,9 +9,9 @@ VALID_WORKFLOW = {
     "name": "Test DAG",
     "dag": {
         "nodes": [
-            {"id": "input", "handler": "input", "dependencies": []},
+            {"id": "input", "handler": "noop", "dependencies": []},
             {"id": "task1", "handler": "call_external_service", "dependencies": ["input"], "config": {"url": "http://mock"}},
-            {"id": "output", "handler": "output", "dependencies": ["task1"]}
+            {"id": "output", "handler": "llm", "dependencies": ["task1"]}
         ]
     }
 }
@@ -20,9 +20,9 @@ INVALID_WORKFLOW_CYCLE = {
     "name": "Cycle DAG",
     "dag": {
         "nodes": [
-            {"id": "A", "handler": "input", "dependencies": ["C"]},
+            {"id": "A", "handler": "noop", "dependencies": ["C"]},
             {"id": "B", "handler": "call_external_service", "dependencies": ["A"]},
-            {"id": "C", "handler": "output", "dependencies": ["B"]}
+            {"id": "C", "handler": "llm", "dependencies": ["B"]}
         ]
     }
 }
@@ -82,19 +82,216 @@ def test_get_results_after_mock_output(client):
     execution_id = post_resp.json()["execution_id"]
 
     # Manually inject mock output for testing
-    redis_client.set(
-        RedisKeyTemplates.WORKFLOW_NODE_OUTPUT.format(
-            execution_id=execution_id, node_id="task1"
-        ),
+    redis_client._redis.hset(
+        RedisKeyTemplates.WORKFLOW_OUTPUTS.format(execution_id=execution_id),
+        "task1",
         json.dumps({"value": 123}),
     )
-    redis_client.set(
-        RedisKeyTemplates.WORKFLOW_NODE.format(
-            execution_id=execution_id, node_id="task1"
-        ),
+    redis_client._redis.hset(
+        RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id),
+        "task1",
         NodeStatus.COMPLETED.value,
     )
 
     results = client.get(f"/workflows/{execution_id}/results")
     assert results.status_code == 200
     assert results.json()["results"]["task1"] == {"value": 123}
+
+
+def test_submit_stores_topology(client):
+    execution_id = client.post("/workflow", json=VALID_WORKFLOW).json()["execution_id"]
+
+    topology = redis_client.get_json(RedisKeyTemplates.WORKFLOW_TOPOLOGY.format(execution_id=execution_id))
+
+    assert topology["order"] == ["input", "task1", "output"]
+    assert topology["levels"] == {"input": 0, "task1": 1, "output": 2}
+    assert topology["children"]["input"] == ["task1"]
+
+
+def test_get_results_unknown_execution(client):
+    response = client.get("/workflows/invalid-id/results")
+    assert response.status_code == 404
+
+
+def test_status_polls_are_served_concurrently():
+    import asyncio
+    import httpx
+    from main import app, lifespan
+
+    redis_client.set(RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id="exec-poll"), NodeStatus.RUNNING.value)
+
+    async def poll():
+        async with lifespan(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+                return await asyncio.gather(*(http.get("/workflows/exec-poll") for _ in range(500)))
+
+    responses = asyncio.run(poll())
+    assert {response.json()["status"] for response in responses} == {NodeStatus.RUNNING.value}
+
+
+def test_list_workflows_by_status(client):
+    first = client.post("/workflow", json=VALID_WORKFLOW).json()["execution_id"]
+    second = client.post("/workflow", json=VALID_WORKFLOW).json()["execution_id"]
+    client.post(f"/workflow/trigger/{first}")
+
+    running = client.get("/workflows", params={"status": "RUNNING"}).json()
+    pending = client.get("/workflows", params={"status": "PENDING", "name": "Test DAG"}).json()
+
+    assert [item["execution_id"] for item in running["items"]] == [first]
+    assert [item["execution_id"] for item in pending["items"]] == [second]
+    assert pending["next_cursor"] is None
+
+
+def test_list_workflows_rejects_bad_cursor(client):
+    assert client.get("/workflows", params={"cursor": "nope"}).status_code == 400
+
+
+def test_submit_batch_returns_results_in_request_order(client):
+    response = client.post("/workflow/batch", json={
+        "workflows": [VALID_WORKFLOW, INVALID_WORKFLOW_CYCLE, {"dag": {"nodes": []}}, VALID_WORKFLOW],
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    results = body["results"]
+    assert (body["accepted"], body["rejected"]) == (2, 2)
+    assert "execution_id" in results[0] and "execution_id" in results[3]
+    assert "cycle" in results[1]["error"]
+    assert results[2]["error"] == "name: Field required"
+    for result in (results[0], results[3]):
+        status = client.get(f"/workflows/{result['execution_id']}").json()
+        assert status["status"] == NodeStatus.PENDING.value
+
+
+def test_submit_batch_with_trigger_starts_executions(client):
+    from orchestrator.events import EVENT_STREAM
+    from orchestrator.sharding import active_set_key
+
+    results = client.post("/workflow/batch", json={
+        "workflows": [VALID_WORKFLOW, VALID_WORKFLOW], "trigger": True,
+    }).json()["results"]
+
+    execution_ids = [result["execution_id"] for result in results]
+    events = redis_client._redis.xrange(EVENT_STREAM)
+    assert [fields["execution_id"] for _, fields in events] == execution_ids
+    for execution_id in execution_ids:
+        assert redis_client.get(RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id=execution_id)) == "RUNNING"
+        assert redis_client.sismember(active_set_key(execution_id), execution_id)
+    running = client.get("/workflows", params={"status": "RUNNING"}).json()
+    assert {item["execution_id"] for item in running["items"]} == set(execution_ids)
+
+
+def test_submit_batch_rejects_oversized_batch(client, monkeypatch):
+    from config import settings
+
+    monkeypatch.setattr(settings, "WORKFLOW_BATCH_MAX_SIZE", 1)
+    response = client.post("/workflow/batch", json={"workflows": [VALID_WORKFLOW, VALID_WORKFLOW]})
+    assert response.status_code == 400
+
+
+def test_get_workflow_statuses_in_batch(client):
+    first = client.post("/workflow", json=VALID_WORKFLOW).json()["execution_id"]
+    second = client.post("/workflow", json=VALID_WORKFLOW).json()["execution_id"]
+
+    response = client.post("/workflows/status:batch", json={"execution_ids": [second, "invalid-id", first]})
+
+    assert response.status_code == 200
+    statuses = response.json()["statuses"]
+    assert [status["execution_id"] for status in statuses] == [second, "invalid-id", first]
+    assert statuses[0]["status"] == NodeStatus.PENDING.value
+    assert statuses[0]["nodes"] == {"total": 3, "pending": 3, "queued": 0, "running": 0, "completed": 0, "failed": 0}
+    assert "error" in statuses[1]
+
+
+def test_get_workflow_statuses_rejects_oversized_batch(client, monkeypatch):
+    from config import settings
+
+    monkeypatch.setattr(settings, "WORKFLOW_STATUS_BATCH_MAX_SIZE", 1)
+    response = client.post("/workflows/status:batch", json={"execution_ids": ["a", "b"]})
+    assert response.status_code == 400
+
+
+PARAMETERIZED_DEFINITION = {
+    "name": "Fetch DAG",
+    "dag": {
+        "nodes": [
+            {"id": "fetch", "handler": "call_external_service", "dependencies": [], "config": {"url": "{{ params.url }}"}},
+            {"id": "summarize", "handler": "llm", "dependencies": ["fetch"]},
+        ]
+    },
+    "parameters": {"url": None},
+}
+
+
+def test_register_and_run_definition(client):
+    from clients import codecs
+    from orchestrator.task_queue import STREAM_NAME
+
+    registered = client.post("/definitions", json=PARAMETERIZED_DEFINITION).json()
+    again = client.post("/definitions", json=PARAMETERIZED_DEFINITION).json()
+    assert (registered["version"], registered["created"]) == (1, True)
+    assert (again["version"], again["created"]) == (1, False)
+
+    run = client.post("/definitions/Fetch DAG/run", json={"params": {"url": "http://mock"}})
+    assert run.status_code == 200
+    execution_id = run.json()["execution_id"]
+    assert redis_client.get(RedisKeyTemplates.WORKFLOW_TOPOLOGY.format(execution_id=execution_id)) is None
+    client.post(f"/workflow/trigger/{execution_id}")
+
+    msgs = redis_client._redis.xrange(STREAM_NAME)
+    assert [codecs.decode(fields["payload"])["config"] for _, fields in msgs] == [{"url": "http://mock"}]
+    versions = client.get("/definitions/Fetch DAG").json()["versions"]
+    assert versions == [{"version": 1, "digest": registered["digest"]}]
+
+
+def test_register_definition_rejects_undeclared_parameters(client):
+    response = client.post("/definitions", json={**PARAMETERIZED_DEFINITION, "parameters": {}})
+    assert response.status_code == 400
+    assert "url" in response.json()["detail"]
+
+
+def test_run_definition_errors(client):
+    client.post("/definitions", json=PARAMETERIZED_DEFINITION)
+
+    assert client.post("/definitions/unknown/run", json={}).status_code == 404
+    assert client.post("/definitions/Fetch DAG/run", json={"version": 2, "params": {"url": "u"}}).status_code == 404
+    assert client.post("/definitions/Fetch DAG/run", json={}).status_code == 400
+    assert client.get("/definitions/unknown").status_code == 404
+
+
+def test_workflow_events_of_finished_execution_end_after_snapshot(client):
+    from orchestrator.state import set_workflow_status
+
+    execution_id = client.post("/workflow", json=VALID_WORKFLOW).json()["execution_id"]
+    set_workflow_status(execution_id, NodeStatus.COMPLETED)
+
+    response = client.get(f"/workflows/{execution_id}/events")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.startswith("id: ")
+    assert response.text.count("event: snapshot") == 1
+    assert '"status":"COMPLETED"' in response.text
+
+
+def test_workflow_events_resume_from_last_event_id(client):
+    from orchestrator.state import set_workflow_status
+
+    execution_id = client.post("/workflow", json=VALID_WORKFLOW).json()["execution_id"]
+    set_workflow_status(execution_id, NodeStatus.RUNNING)
+    events_key = RedisKeyTemplates.WORKFLOW_EXECUTION_EVENTS.format(execution_id=execution_id)
+    last_id = redis_client._redis.xrevrange(events_key, count=1)[0][0]
+    set_workflow_status(execution_id, NodeStatus.FAILED)
+
+    response = client.get(f"/workflows/{execution_id}/events", headers={"Last-Event-ID": last_id})
+
+    assert "event: snapshot" not in response.text
+    assert response.text.count("event: workflow") == 1
+    assert '"status":"FAILED"' in response.text
+
+
+def test_workflow_events_errors(client):
+    assert client.get("/workflows/invalid-id/events").status_code == 404
+    execution_id = client.post("/workflow", json=VALID_WORKFLOW).json()["execution_id"]
+    assert client.get(f"/workflows/{execution_id}/events", params={"last_event_id": "nope"}).status_code == 400
@@ -0,0 +1,101 @@
+import asyncio
+import json
+
+from api.event_hub import EventHub, execution_events, read_events_after
+from clients.async_redis_client import AsyncRedisClient
+from clients.redis_client import redis_client
+from config import settings
+from orchestrator.models import NodeStatus
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.state import init_node_counters, set_node_status, set_node_statuses, set_workflow_status
+
+EXECUTION_ID = "exec-sse"
+EVENTS_KEY = RedisKeyTemplates.WORKFLOW_EXECUTION_EVENTS.format(execution_id=EXECUTION_ID)
+
+
+def _start_execution():
+    init_node_counters(EXECUTION_ID, 2)
+    set_node_statuses(EXECUTION_ID, {"a": NodeStatus.PENDING, "b": NodeStatus.PENDING})
+    set_workflow_status(EXECUTION_ID, NodeStatus.RUNNING)
+
+
+def _parse(message: str) -> dict:
+    fields = dict(line.split(": ", 1) for line in message.strip().split("\n"))
+    return {**fields, "data": json.loads(fields["data"])}
+
+
+def _run(scenario):
+    async def runner():
+        client = AsyncRedisClient()
+        hub = EventHub(client, block_ms=50)
+        try:
+            return await scenario(client, hub)
+        finally:
+            await hub.close()
+            await client.close()
+
+    return asyncio.run(runner())
+
+
+def test_subscribers_share_one_reader_and_receive_live_transitions():
+    _start_execution()
+
+    async def scenario(client, hub):
+        streams = [execution_events(client, hub, EXECUTION_ID) for _ in range(2)]
+        snapshots = [_parse(await anext(stream)) for stream in streams]
+        received = [asyncio.create_task(_collect(stream)) for stream in streams]
+        await asyncio.to_thread(set_node_status, EXECUTION_ID, "a", NodeStatus.COMPLETED)
+        await asyncio.to_thread(set_node_status, EXECUTION_ID, "b", NodeStatus.COMPLETED)
+        return snapshots, await asyncio.gather(*received), hub.subscriber_count()
+
+    async def _collect(stream):
+        return [_parse(message) async for message in stream]
+
+    snapshots, received, remaining = _run(scenario)
+
+    assert snapshots[0]["event"] == "snapshot"
+    assert snapshots[0]["data"]["status"] == "RUNNING"
+    assert snapshots[0]["data"]["nodes"] == {"a": "PENDING", "b": "PENDING"}
+    for events in received:
+        assert [(event["event"], event["data"].get("node_id"), event["data"]["status"]) for event in events] == [
+            ("node", "a", "COMPLETED"),
+            ("node", "b", "COMPLETED"),
+            ("workflow", None, "COMPLETED"),
+        ]
+    assert remaining == 0
+
+
+def test_resume_replays_events_after_last_id():
+    _start_execution()
+    last_id = redis_client._redis.xrevrange(EVENTS_KEY, count=1)[0][0]
+    set_node_status(EXECUTION_ID, "a", NodeStatus.FAILED)
+
+    async def scenario(client, hub):
+        return [_parse(message) async for message in execution_events(client, hub, EXECUTION_ID, last_id)]
+
+    events = _run(scenario)
+
+    assert [(event["event"], event["data"]["status"]) for event in events] == [
+        ("node", "FAILED"),
+        ("workflow", "FAILED"),
+    ]
+    assert events[-1]["id"] == redis_client._redis.xrevrange(EVENTS_KEY, count=1)[0][0]
+
+
+def test_resume_from_trimmed_events_needs_a_snapshot(monkeypatch):
+    monkeypatch.setattr(settings, "EXECUTION_EVENT_STREAM_MAXLEN", 2)
+    trimmed_id = redis_client._redis.xadd(EVENTS_KEY, {"status": "RUNNING"})
+    retained_id = redis_client._redis.xadd(EVENTS_KEY, {"node_id": "a", "status": "QUEUED"})
+    redis_client._redis.xadd(EVENTS_KEY, {"node_id": "b", "status": "QUEUED"})
+    redis_client._redis.xtrim(EVENTS_KEY, maxlen=2, approximate=False)
+
+    async def scenario(client, hub):
+        return (
+            await read_events_after(client, EXECUTION_ID, retained_id),
+            await read_events_after(client, EXECUTION_ID, trimmed_id),
+        )
+
+    after_retained, after_trimmed = _run(scenario)
+
+    assert [fields["node_id"] for _, fields in after_retained] == ["b"]
+    assert after_trimmed is None
@@ -5,27 +5,27 @@ from api.schemas.workflow import Node
 
 def test_valid_dag_linear():
     nodes = [
-        Node(id="A", handler="input", dependencies=[]),
-        Node(id="B", handler="service", dependencies=["A"]),
-        Node(id="C", handler="output", dependencies=["B"]),
+        Node(id="A", handler="noop", dependencies=[]),
+        Node(id="B", handler="call_external_service", dependencies=["A"]),
+        Node(id="C", handler="llm", dependencies=["B"]),
     ]
     validate_workflow(nodes)
 
 
 def test_valid_dag_fan_out_fan_in():
     nodes = [
-        Node(id="A", handler="input", dependencies=[]),
-        Node(id="B", handler="service", dependencies=["A"]),
-        Node(id="C", handler="output", dependencies=["A"]),
-        Node(id="D", handler="output", dependencies=["B", "C"]),
+        Node(id="A", handler="noop", dependencies=[]),
+        Node(id="B", handler="call_external_service", dependencies=["A"]),
+        Node(id="C", handler="llm", dependencies=["A"]),
+        Node(id="D", handler="llm", dependencies=["B", "C"]),
     ]
     validate_workflow(nodes)
 
 
 def test_duplicate_node_ids():
     nodes = [
-        Node(id="A", handler="input", dependencies=[]),
-        Node(id="A", handler="service", dependencies=[]),
+        Node(id="A", handler="noop", dependencies=[]),
+        Node(id="A", handler="call_external_service", dependencies=[]),
     ]
     with pytest.raises(ValueError, match="Duplicate node ID"):
         validate_workflow(nodes)
@@ -33,8 +33,8 @@ def test_duplicate_node_ids():
 
 def test_invalid_dependency():
     nodes = [
-        Node(id="A", handler="input", dependencies=["B"]),
-        Node(id="C", handler="output", dependencies=[]),
+        Node(id="A", handler="noop", dependencies=["B"]),
+        Node(id="C", handler="llm", dependencies=[]),
     ]
     with pytest.raises(ValueError, match="Invalid dependency: B"):
         validate_workflow(nodes)
@@ -42,9 +42,39 @@ def test_invalid_dependency():
 
 def test_cycle_detection():
     nodes = [
-        Node(id="A", handler="input", dependencies=["C"]),
-        Node(id="B", handler="service", dependencies=["A"]),
-        Node(id="C", handler="output", dependencies=["B"]),
+        Node(id="A", handler="noop", dependencies=["C"]),
+        Node(id="B", handler="call_external_service", dependencies=["A"]),
+        Node(id="C", handler="llm", dependencies=["B"]),
     ]
     with pytest.raises(ValueError, match="contains a cycle"):
         validate_workflow(nodes)
+
+
+def test_unknown_handler_rejected():
+    nodes = [Node(id="A", handler="does-not-exist", dependencies=[])]
+    with pytest.raises(ValueError, match="Unknown handler: does-not-exist"):
+        validate_workflow(nodes)
+
+
+def test_deep_chain_does_not_hit_recursion_limit():
+    nodes = [Node(id="n0", handler="noop", dependencies=[])]
+    nodes += [Node(id=f"n{i}", handler="noop", dependencies=[f"n{i - 1}"]) for i in range(1, 5000)]
+
+    topology = validate_workflow(nodes)
+
+    assert topology.levels["n4999"] == 4999
+
+
+def test_topology_order_levels_and_children():
+    nodes = [
+        Node(id="D", handler="noop", dependencies=["B", "C"]),
+        Node(id="B", handler="noop", dependencies=["A"]),
+        Node(id="C", handler="noop", dependencies=["A", "B"]),
+        Node(id="A", handler="noop", dependencies=[]),
+    ]
+
+    topology = validate_workflow(nodes)
+
+    assert topology.order == ("A", "B", "C", "D")
+    assert topology.levels == {"A": 0, "B": 1, "C": 2, "D": 3}
+    assert topology.children == {"A": ("B", "C"), "B": ("D", "C"), "C": ("D",), "D": ()}
@@ -0,0 +1,36 @@
+import asyncio
+import json
+
+from clients.async_redis_client import AsyncRedisClient
+from clients.redis_client import redis_client
+
+
+def _run(coro_factory, **kwargs):
+    async def runner():
+        client = AsyncRedisClient(**kwargs)
+        try:
+            return await coro_factory(client)
+        finally:
+            await client.close()
+
+    return asyncio.run(runner())
+
+
+def test_concurrent_commands_share_a_bounded_pool():
+    redis_client.set("key", "value")
+
+    async def poll(client):
+        values = await asyncio.gather(*(client.get("key") for _ in range(200)))
+        pool = client._redis.connection_pool
+        return values, len(pool._available_connections) + len(pool._in_use_connections)
+
+    values, connections = _run(poll, max_connections=4)
+
+    assert values == ["value"] * 200
+    assert connections <= 4
+
+
+def test_hgetall_json_decodes_values():
+    redis_client._redis.hset("hash", mapping={"a": json.dumps({"x": 1}), "b": "not json"})
+
+    assert _run(lambda client: client.hgetall_json("hash")) == {"a": {"x": 1}, "b": None}
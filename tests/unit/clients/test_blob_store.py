@@ -0,0 +1,73 @@
+import pytest
+from unittest.mock import patch
+
+from clients import blob_store, codecs
+from clients.blob_store import LocalBlobStore
+
+
+@pytest.fixture(autouse=True)
+def local_store(tmp_path, monkeypatch):
+    store = LocalBlobStore(str(tmp_path))
+    monkeypatch.setattr("clients.blob_store.blob_store", store)
+    return store
+
+
+def test_local_store_round_trip(local_store):
+    local_store.put("exec-1/node-a/blob.z", b"data")
+    assert local_store.get("exec-1/node-a/blob.z") == b"data"
+
+    local_store.delete("exec-1/node-a/blob.z")
+    with pytest.raises(ValueError, match="Blob not found"):
+        local_store.get("exec-1/node-a/blob.z")
+
+
+def test_local_store_rejects_keys_outside_root(local_store):
+    with pytest.raises(ValueError, match="Invalid blob key"):
+        local_store.put("../escape", b"data")
+
+
+@patch("clients.blob_store.settings.BLOB_OFFLOAD_BYTES", 100)
+def test_backends_must_implement_every_operation():
+    class WriteOnlyStore(blob_store.BlobStore):
+        def put(self, key, data):
+            pass
+
+    with pytest.raises(TypeError):
+        WriteOnlyStore()
+
+
+def test_small_values_stay_inline():
+    encoded = codecs.encode({"value": "small"})
+    assert blob_store.offload(encoded, "exec-1/node-a") == encoded
+
+
+@patch("clients.blob_store.settings.BLOB_OFFLOAD_BYTES", 100)
+def test_large_values_are_compressed_and_referenced(local_store):
+    value = {"rows": ["row"] * 1000}
+    encoded = codecs.encode(value)
+
+    ref = codecs.decode(blob_store.offload(encoded, "exec-1/node-a"))
+
+    assert blob_store.is_blob_ref(ref)
+    assert ref["size"] == len(encoded)
+    assert ref["$blob"].startswith("exec-1/node-a/")
+    assert len(local_store.get(ref["$blob"])) < len(encoded)
+    assert blob_store.load(ref) == value
+    assert blob_store.resolve(ref) == value
+    assert blob_store.resolve({"rows": []}) == {"rows": []}
+
+
+@patch("clients.blob_store.settings.BLOB_OFFLOAD_BYTES", 0)
+def test_zero_threshold_disables_offloading():
+    encoded = codecs.encode({"rows": ["row"] * 1000})
+    assert blob_store.offload(encoded, "exec-1/node-a") == encoded
+
+
+@patch("clients.blob_store.settings.BLOB_OFFLOAD_BYTES", 100)
+def test_discard_deletes_referenced_blob(local_store):
+    ref = blob_store.offload(codecs.encode({"rows": ["row"] * 1000}), "exec-1/node-a")
+
+    blob_store.discard(ref)
+
+    with pytest.raises(ValueError, match="Blob not found"):
+        blob_store.load(codecs.decode(ref))
@@ -0,0 +1,81 @@
+import math
+
+import pytest
+
+from api.schemas.workflow import WorkflowRequest
+from clients import codecs
+from clients.redis_client import redis_client
+
+VALUE = {"name": "Ünïcode", "values": [1, 2.5, None, True], "nested": {"a": "b"}}
+
+
+def test_json_codecs_share_one_format():
+    for name in ("json", "orjson"):
+        if name not in codecs.available_codecs():
+            continue
+        encoded = codecs.get_codec(name).dumps(VALUE)
+        assert codecs.decode(encoded) == VALUE
+        assert codecs.get_codec("json").loads(encoded) == VALUE
+
+
+def test_json_is_used_unless_orjson_is_named():
+    assert codecs.get_codec("auto").name == "json"
+    assert codecs.json_codec.name == "json"
+
+
+def test_int_keys_and_nan_outputs_round_trip():
+    output = {1: "one", "score": float("nan")}
+
+    decoded = codecs.decode(codecs.json_codec.dumps(output))
+    assert decoded["1"] == "one"
+    assert math.isnan(decoded["score"])
+
+    if "orjson" in codecs.available_codecs():
+        decoded = codecs.decode(codecs.get_codec("orjson").dumps(output))
+        assert decoded == {"1": "one", "score": None}
+
+
+def test_get_codec_rejects_unknown_names():
+    with pytest.raises(ValueError):
+        codecs.get_codec("yaml")
+
+
+@pytest.mark.skipif("msgpack" in codecs.available_codecs(), reason="msgpack is installed")
+def test_msgpack_requires_its_package():
+    with pytest.raises(ValueError):
+        codecs.get_codec("msgpack")
+    with pytest.raises(ValueError):
+        codecs.decode(codecs.MSGPACK_TAG + "\x81")
+
+
+def test_msgpack_values_are_tagged_and_read_back_through_redis():
+    pytest.importorskip("msgpack")
+    encoded = codecs.get_codec("msgpack").dumps(VALUE)
+    assert encoded.startswith(codecs.MSGPACK_TAG)
+
+    redis_client.hset_json("codec:mixed", "json", VALUE)
+    redis_client._redis.hset("codec:mixed", "msgpack", encoded)
+
+    assert redis_client.hgetall_json("codec:mixed") == {"json": VALUE, "msgpack": VALUE}
+
+
+def test_binary_values_round_trip_through_the_client():
+    binary = codecs.MSGPACK_TAG + bytes(range(256)).decode("utf-8", "surrogateescape")
+    redis_client.set("codec:binary", binary)
+    assert redis_client.get("codec:binary") == binary
+
+
+def test_dumps_model_encodes_once():
+    request = WorkflowRequest.model_validate({
+        "name": "wf",
+        "dag": {"nodes": [{"id": "a", "handler": "noop", "dependencies": []}]},
+    })
+    assert codecs.decode(codecs.codec.dumps_model(request)) == request.model_dump(mode="json")
+
+
+def test_encoded_values_round_trip():
+    redis_client.set_encoded("codec:value", VALUE)
+    redis_client.hset_encoded("codec:hash", "field", VALUE)
+
+    assert redis_client.get_json("codec:value") == VALUE
+    assert redis_client.hget_json("codec:hash", "field") == VALUE
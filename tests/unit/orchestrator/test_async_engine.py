@@ -0,0 +1,99 @@
+import asyncio
+import json
+import time
+from unittest.mock import patch
+
+from clients.async_redis_client import AsyncRedisClient
+from clients.redis_client import redis_client
+from orchestrator.async_engine import AsyncScheduler
+from orchestrator.models import NodeStatus
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.sharding import active_set_key, all_shards
+from orchestrator.state import get_workflow_status, set_node_status
+from orchestrator.task_queue import STREAM_NAME
+from orchestrator.trigger import trigger_workflow_execution
+
+
+def _run(coro_factory, concurrency=4):
+    async def runner():
+        client = AsyncRedisClient()
+        scheduler = AsyncScheduler(client, concurrency=concurrency)
+        try:
+            return await coro_factory(scheduler)
+        finally:
+            await client.close()
+
+    return asyncio.run(runner())
+
+
+def _store_workflow(execution_id: str, nodes=None):
+    redis_client.set(RedisKeyTemplates.WORKFLOW.format(execution_id=execution_id), json.dumps({
+        "name": "DAG",
+        "dag": {"nodes": nodes or [{"id": "a", "handler": "noop", "dependencies": []}]}
+    }))
+    redis_client.sadd(active_set_key(execution_id), execution_id)
+
+
+def test_sweep_dispatches_every_active_execution():
+    _store_workflow("async-1")
+    _store_workflow("async-2")
+
+    _run(lambda scheduler: scheduler.sweep(all_shards()))
+
+    msgs = redis_client._redis.xrange(STREAM_NAME)
+    assert sorted(m[1]["execution_id"] for m in msgs) == ["async-1", "async-2"]
+
+
+def test_handle_node_events_skips_inactive_executions():
+    _store_workflow("async-active")
+    trigger_workflow_execution("async-active")
+    redis_client._redis.delete(STREAM_NAME)
+
+    with patch.object(AsyncScheduler, "process_execution") as mock_process:
+        _run(lambda scheduler: scheduler.handle_node_events([
+            {"execution_id": "async-active", "node_id": "a", "status": "COMPLETED"},
+            {"execution_id": "async-gone", "node_id": "a", "status": "COMPLETED"},
+        ]))
+
+    mock_process.assert_called_once_with("async-active", ["a"])
+
+
+def test_event_driven_pass_dispatches_children_of_completed_nodes():
+    _store_workflow("async-chain", [
+        {"id": "a", "handler": "noop", "dependencies": []},
+        {"id": "b", "handler": "noop", "dependencies": ["a"]},
+    ])
+    _run(lambda scheduler: scheduler.process_execution("async-chain"))
+    set_node_status("async-chain", "a", NodeStatus.COMPLETED)
+
+    _run(lambda scheduler: scheduler.process_execution("async-chain", ["a"]))
+
+    msgs = redis_client._redis.xrange(STREAM_NAME)
+    assert [m[1]["node_id"] for m in msgs] == ["a", "b"]
+
+
+def test_pass_retires_finished_executions():
+    _store_workflow("async-done")
+    trigger_workflow_execution("async-done")
+    redis_client.hset(
+        RedisKeyTemplates.WORKFLOW_NODE_COUNTERS.format(execution_id="async-done"),
+        {"total": 1, NodeStatus.QUEUED.value: 0, NodeStatus.COMPLETED.value: 1},
+    )
+
+    _run(lambda scheduler: scheduler.process_execution("async-done"))
+
+    assert get_workflow_status("async-done") == NodeStatus.COMPLETED
+    assert not redis_client._redis.sismember(active_set_key("async-done"), "async-done")
+
+
+def test_executions_are_processed_concurrently_up_to_the_limit():
+    async def slow_pass(execution_id, completed_node_ids=None):
+        await asyncio.sleep(0.2)
+
+    with patch.object(AsyncScheduler, "execute_workflow", side_effect=slow_pass), \
+            patch.object(AsyncScheduler, "check_completion", return_value=False):
+        start = time.monotonic()
+        _run(lambda scheduler: scheduler.process_executions({f"exec-{i}": None for i in range(4)}))
+        elapsed = time.monotonic() - start
+
+    assert elapsed < 0.6
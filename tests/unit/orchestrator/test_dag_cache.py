@@ -0,0 +1,58 @@
+import json
+
+from clients.redis_client import redis_client
+from orchestrator.dag_cache import WorkflowCache, workflow_cache
+from orchestrator.loader import load_workflow
+from orchestrator.models import Workflow
+from orchestrator.redis_keys import RedisKeyTemplates
+
+
+def _workflow(execution_id: str) -> Workflow:
+    return Workflow(execution_id=execution_id, name="WF", nodes=())
+
+
+def test_cache_counts_hits_and_misses():
+    cache = WorkflowCache(maxsize=2)
+    cache.put("a", _workflow("a"))
+
+    assert cache.get("a").execution_id == "a"
+    assert cache.get("b") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "maxsize": 2}
+
+
+def test_cache_evicts_least_recently_used():
+    cache = WorkflowCache(maxsize=2)
+    cache.put("a", _workflow("a"))
+    cache.put("b", _workflow("b"))
+    cache.get("a")
+    cache.put("c", _workflow("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_cache_invalidate_and_disabled_cache():
+    cache = WorkflowCache(maxsize=2)
+    cache.put("a", _workflow("a"))
+    cache.invalidate("a")
+    assert cache.get("a") is None
+
+    disabled = WorkflowCache(maxsize=0)
+    disabled.put("a", _workflow("a"))
+    assert disabled.get("a") is None
+
+
+def test_load_workflow_parses_definition_once():
+    execution_id = "cached-01"
+    redis_client.set(
+        RedisKeyTemplates.WORKFLOW.format(execution_id=execution_id),
+        json.dumps({"name": "Cached", "dag": {"nodes": [{"id": "a", "handler": "noop", "dependencies": []}]}}),
+    )
+
+    first = load_workflow(execution_id)
+    redis_client._redis.delete(RedisKeyTemplates.WORKFLOW.format(execution_id=execution_id))
+    second = load_workflow(execution_id)
+
+    assert second is first
+    assert workflow_cache.stats()["hits"] == 1
@@ -0,0 +1,68 @@
+import json
+
+from clients.redis_client import redis_client
+from orchestrator.events import latest_event_id, publish_node_event, read_node_events
+from orchestrator.loader import load_workflow
+from orchestrator.models import NodeStatus
+from orchestrator.readiness import init_readiness_index
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.sharding import active_set_key
+from orchestrator.starter import handle_node_events
+from orchestrator.state import set_node_status
+from orchestrator.task_queue import STREAM_NAME
+
+
+def test_latest_event_id_on_empty_stream():
+    assert latest_event_id() == "0-0"
+
+
+def test_publish_and_read_node_event():
+    start = latest_event_id()
+    publish_node_event("exec-ev", "a", NodeStatus.COMPLETED)
+
+    last_id, events = read_node_events(start, block_ms=10)
+
+    assert last_id == latest_event_id()
+    assert events == [{"execution_id": "exec-ev", "node_id": "a", "status": "COMPLETED"}]
+
+
+def test_read_node_events_times_out_without_events():
+    start = latest_event_id()
+    last_id, events = read_node_events(start, block_ms=10)
+    assert last_id == start
+    assert events == []
+
+
+def test_handle_node_events_dispatches_children_of_active_workflow():
+    execution_id = "exec-ev-active"
+    redis_client.set(RedisKeyTemplates.WORKFLOW.format(execution_id=execution_id), json.dumps({
+        "name": "DAG",
+        "dag": {
+            "nodes": [
+                {"id": "a", "handler": "noop", "dependencies": []},
+                {"id": "b", "handler": "noop", "dependencies": ["a"]},
+            ]
+        }
+    }))
+    init_readiness_index(execution_id, load_workflow(execution_id).nodes)
+    set_node_status(execution_id, "a", NodeStatus.COMPLETED)
+    set_node_status(execution_id, "b", NodeStatus.PENDING)
+    redis_client.sadd(active_set_key(execution_id), execution_id)
+
+    handle_node_events([{"execution_id": execution_id, "node_id": "a", "status": "COMPLETED"}])
+
+    msgs = redis_client._redis.xrevrange(STREAM_NAME, count=10)
+    assert [m[1]["node_id"] for m in msgs] == ["b"]
+
+
+def test_handle_node_events_ignores_inactive_workflow():
+    execution_id = "exec-ev-inactive"
+    redis_client.set(RedisKeyTemplates.WORKFLOW.format(execution_id=execution_id), json.dumps({
+        "name": "DAG",
+        "dag": {"nodes": [{"id": "a", "handler": "noop", "dependencies": []}]}
+    }))
+    set_node_status(execution_id, "a", NodeStatus.PENDING)
+
+    handle_node_events([{"execution_id": execution_id, "node_id": "a", "status": "COMPLETED"}])
+
+    assert redis_client._redis.xrevrange(STREAM_NAME, count=1) == []
@@ -19,16 +19,14 @@ def test_executor_schedules_ready_node():
             ]
         }
     }))
-    redis_client.set_json(
-        RedisKeyTemplates.WORKFLOW_NODE.format(
-            execution_id=execution_id, node_id="start"
-        ),
+    redis_client.hset_json(
+        RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id),
+        "start",
         {"status": NodeStatus.PENDING.value},
     )
-    redis_client.set_json(
-        RedisKeyTemplates.WORKFLOW_NODE.format(
-            execution_id=execution_id, node_id="end"
-        ),
+    redis_client.hset_json(
+        RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id),
+        "end",
         {"status": NodeStatus.PENDING.value},
     )
 
@@ -51,22 +49,19 @@ def test_executor_schedules_ready_nodes_fan_out():
             ]
         }
     }))
-    redis_client.set_json(
-        RedisKeyTemplates.WORKFLOW_NODE.format(
-            execution_id=execution_id, node_id="start"
-        ),
+    redis_client.hset_json(
+        RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id),
+        "start",
         {"status": NodeStatus.COMPLETED.value},
     )
-    redis_client.set_json(
-        RedisKeyTemplates.WORKFLOW_NODE.format(
-            execution_id=execution_id, node_id="middle1"
-        ),
+    redis_client.hset_json(
+        RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id),
+        "middle1",
         {"status": NodeStatus.PENDING.value},
     )
-    redis_client.set_json(
-        RedisKeyTemplates.WORKFLOW_NODE.format(
-            execution_id=execution_id, node_id="middle2"
-        ),
+    redis_client.hset_json(
+        RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id),
+        "middle2",
         {"status": NodeStatus.PENDING.value},
     )
 
@@ -89,16 +84,14 @@ def test_executor_does_not_schedule_if_dependencies_not_ready():
             ]
         }
     }))
-    redis_client.set_json(
-        RedisKeyTemplates.WORKFLOW_NODE.format(
-            execution_id=execution_id, node_id="a"
-        ),
+    redis_client.hset_json(
+        RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id),
+        "a",
         {"status": NodeStatus.QUEUED.value},
     )
-    redis_client.set_json(
-        RedisKeyTemplates.WORKFLOW_NODE.format(
-            execution_id=execution_id, node_id="b"
-        ),
+    redis_client.hset_json(
+        RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id),
+        "b",
         {"status": NodeStatus.PENDING.value},
     )
 
@@ -114,13 +107,43 @@ def test_executor_does_not_schedule_if_already_running():
         "name": "DAG",
         "dag": {"nodes": [{"id": "x", "handler": "noop", "dependencies": []}]}
     }))
-    redis_client.set_json(
-        RedisKeyTemplates.WORKFLOW_NODE.format(
-            execution_id=execution_id, node_id="x"
-        ),
+    redis_client.hset_json(
+        RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id),
+        "x",
         {"status": NodeStatus.RUNNING.value},
     )
     execute_workflow(execution_id)
 
     msgs = redis_client._redis.xrevrange(STREAM_NAME, count=1)
     assert msgs == []
+
+
+def test_executor_dispatches_only_children_of_completed_nodes():
+    execution_id = "exec4"
+    redis_client.set(RedisKeyTemplates.WORKFLOW.format(execution_id=execution_id), json.dumps({
+        "name": "DAG",
+        "dag": {
+            "nodes": [
+                {"id": "a", "handler": "noop", "dependencies": []},
+                {"id": "b", "handler": "noop", "dependencies": ["a"]},
+                {"id": "c", "handler": "noop", "dependencies": ["a", "b"]},
+            ]
+        }
+    }))
+    for node_id in ["a", "b", "c"]:
+        redis_client.hset_json(
+            RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id),
+            node_id,
+            {"status": NodeStatus.PENDING.value},
+        )
+    execute_workflow(execution_id)
+    redis_client.hset_json(
+        RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id),
+        "a",
+        {"status": NodeStatus.COMPLETED.value},
+    )
+
+    execute_workflow(execution_id, completed_node_ids=["a"])
+
+    msgs = redis_client._redis.xrange(STREAM_NAME)
+    assert [m[1]["node_id"] for m in msgs] == ["a", "b"]
@@ -0,0 +1,140 @@
+import asyncio
+import json
+
+import pytest
+
+from clients.async_redis_client import AsyncRedisClient
+from clients.redis_client import redis_client
+from orchestrator.index import (
+    iter_execution_ids,
+    list_workflows,
+    register_workflow,
+    reindex_workflows,
+)
+from orchestrator.models import NodeStatus
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.state import init_node_counters, set_node_status, set_node_statuses, set_workflow_status
+
+
+def _list(**kwargs):
+    async def runner():
+        client = AsyncRedisClient()
+        try:
+            return await list_workflows(client, **kwargs)
+        finally:
+            await client.close()
+
+    return asyncio.run(runner())
+
+
+def _status_index(status: NodeStatus) -> list[str]:
+    return redis_client._redis.zrange(RedisKeyTemplates.WORKFLOWS_BY_STATUS.format(status=status.value), 0, -1)
+
+
+def test_register_workflow_indexes_and_sets_pending():
+    register_workflow("wf-1", "etl", created_at=1000)
+
+    assert redis_client.get(RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id="wf-1")) == "PENDING"
+    assert _status_index(NodeStatus.PENDING) == ["wf-1"]
+    assert redis_client._redis.zscore(RedisKeyTemplates.WORKFLOWS_BY_NAME.format(name="etl"), "wf-1") == 1000
+
+
+def test_status_changes_move_executions_between_indexes():
+    register_workflow("wf-1", "etl", created_at=1000)
+    set_workflow_status("wf-1", NodeStatus.RUNNING)
+
+    assert _status_index(NodeStatus.PENDING) == []
+    assert _status_index(NodeStatus.RUNNING) == ["wf-1"]
+
+
+def test_completion_by_node_transition_updates_index():
+    init_node_counters("wf-done", 1)
+    set_node_statuses("wf-done", {"a": NodeStatus.RUNNING})
+    register_workflow("wf-done", "etl", created_at=1000)
+    set_workflow_status("wf-done", NodeStatus.RUNNING)
+
+    set_node_status("wf-done", "a", NodeStatus.FAILED, error="boom")
+
+    assert _status_index(NodeStatus.RUNNING) == []
+    assert _status_index(NodeStatus.FAILED) == ["wf-done"]
+
+
+def test_list_pages_newest_first_with_cursor():
+    for i in range(5):
+        register_workflow(f"wf-{i}", "etl", created_at=1000 + i)
+
+    first, cursor = _list(limit=2)
+    second, cursor = _list(limit=2, cursor=cursor)
+    third, cursor = _list(limit=2, cursor=cursor)
+
+    ids = [item["execution_id"] for item in first + second + third]
+    assert ids == ["wf-4", "wf-3", "wf-2", "wf-1", "wf-0"]
+    assert cursor is None
+    assert first[0] == {"execution_id": "wf-4", "name": "etl", "status": "PENDING", "created_at": 1004}
+
+
+def test_list_cursor_handles_equal_creation_times():
+    for i in range(5):
+        register_workflow(f"wf-{i}", "etl", created_at=1000)
+
+    seen, cursor = _list(limit=2)
+    while cursor:
+        page, cursor = _list(limit=2, cursor=cursor)
+        seen.extend(page)
+
+    assert sorted(item["execution_id"] for item in seen) == [f"wf-{i}" for i in range(5)]
+
+
+def test_list_cursor_survives_executions_leaving_the_index_between_pages():
+    for i in range(6):
+        register_workflow(f"wf-{i}", "etl", created_at=1000)
+
+    first, cursor = _list(status=NodeStatus.PENDING, limit=2)
+    for item in first:
+        set_workflow_status(item["execution_id"], NodeStatus.RUNNING)
+    second, cursor = _list(status=NodeStatus.PENDING, limit=2, cursor=cursor)
+    set_workflow_status("wf-0", NodeStatus.RUNNING)
+    third, cursor = _list(status=NodeStatus.PENDING, limit=2, cursor=cursor)
+
+    ids = [item["execution_id"] for item in first + second + third]
+    assert ids == ["wf-5", "wf-4", "wf-3", "wf-2", "wf-1"]
+    assert cursor is None
+
+
+def test_list_filters_by_status_name_and_creation_range():
+    register_workflow("wf-a", "etl", created_at=1000)
+    register_workflow("wf-b", "report", created_at=2000)
+    register_workflow("wf-c", "etl", created_at=3000)
+    set_workflow_status("wf-a", NodeStatus.FAILED, error="boom")
+    set_workflow_status("wf-b", NodeStatus.FAILED)
+
+    failed, _ = _list(status=NodeStatus.FAILED)
+    assert [item["execution_id"] for item in failed] == ["wf-b", "wf-a"]
+    assert failed[1]["error"] == "boom"
+
+    failed_etl, _ = _list(status=NodeStatus.FAILED, name="etl")
+    assert [item["execution_id"] for item in failed_etl] == ["wf-a"]
+
+    etl, _ = _list(name="etl", created_after=2000)
+    assert [item["execution_id"] for item in etl] == ["wf-c"]
+
+    window, _ = _list(created_after=1500, created_before=2500)
+    assert [item["execution_id"] for item in window] == ["wf-b"]
+
+
+def test_list_rejects_malformed_cursor():
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        _list(cursor="garbage")
+
+
+def test_reindex_and_scan_find_unindexed_executions():
+    redis_client.set(RedisKeyTemplates.WORKFLOW.format(execution_id="old"), json.dumps({"name": "legacy"}))
+    redis_client.set(RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id="old"), "COMPLETED")
+    register_workflow("new", "etl", created_at=1000)
+
+    assert sorted(iter_execution_ids()) == ["new", "old"]
+    assert reindex_workflows() == 1
+    assert reindex_workflows() == 0
+
+    items, _ = _list(status=NodeStatus.COMPLETED)
+    assert items == [{"execution_id": "old", "name": "legacy", "status": "COMPLETED", "created_at": None}]
@@ -1,6 +1,7 @@
 import json
 import pytest
 from orchestrator.loader import load_workflow
+from orchestrator.models import Priority
 from clients.redis_client import redis_client
 from orchestrator.redis_keys import RedisKeyTemplates
 
@@ -47,3 +48,43 @@ def test_load_workflow_missing_node_fields():
     )
     with pytest.raises(TypeError):
         load_workflow(execution_id)
+
+
+def test_load_workflow_priority_and_deadline_inherited_by_nodes():
+    execution_id = "load-priority"
+    data = {
+        "name": "Lanes",
+        "priority": "high",
+        "deadline": 1700000000.0,
+        "dag": {"nodes": [
+            {"id": "a", "handler": "noop", "dependencies": []},
+            {"id": "b", "handler": "noop", "dependencies": [], "priority": "low", "deadline": None},
+        ]}
+    }
+    redis_client.set(
+        RedisKeyTemplates.WORKFLOW.format(execution_id=execution_id),
+        json.dumps(data),
+    )
+    wf = load_workflow(execution_id)
+
+    assert wf.lane_for(wf.nodes[0]) == (Priority.HIGH, 1700000000.0)
+    assert wf.lane_for(wf.nodes[1]) == (Priority.LOW, 1700000000.0)
+
+
+def test_load_workflow_computes_topology_when_not_stored():
+    execution_id = "load-topology"
+    data = {
+        "name": "Topo",
+        "dag": {"nodes": [
+            {"id": "b", "handler": "noop", "dependencies": ["a"]},
+            {"id": "a", "handler": "noop", "dependencies": []},
+        ]}
+    }
+    redis_client.set(
+        RedisKeyTemplates.WORKFLOW.format(execution_id=execution_id),
+        json.dumps(data),
+    )
+    wf = load_workflow(execution_id)
+
+    assert list(wf.topology.order) == ["a", "b"]
+    assert wf.topology.children == {"a": ("b",), "b": ()}
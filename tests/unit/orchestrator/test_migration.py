@@ -0,0 +1,46 @@
+import json
+
+from clients.redis_client import redis_client
+from orchestrator.migration import migrate_legacy_node_keys, parse_legacy_node_key
+from orchestrator.models import NodeStatus
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.state import get_node_output, get_node_status, set_node_status
+
+
+def _legacy_status_key(execution_id, node_id):
+    return RedisKeyTemplates.WORKFLOW_NODE.format(execution_id=execution_id, node_id=node_id)
+
+
+def _legacy_output_key(execution_id, node_id):
+    return RedisKeyTemplates.WORKFLOW_NODE_OUTPUT.format(execution_id=execution_id, node_id=node_id)
+
+
+def test_parse_legacy_node_key():
+    assert parse_legacy_node_key("workflow:e1:node:a") == ("e1", "a", False)
+    assert parse_legacy_node_key("workflow:e1:node:a:output") == ("e1", "a", True)
+    assert parse_legacy_node_key("workflow:e1:nodes") is None
+    assert parse_legacy_node_key("workflow:e1:status") is None
+
+
+def test_migrate_moves_legacy_keys_into_hashes():
+    redis_client.set(_legacy_status_key("mig", "a"), json.dumps({"status": "COMPLETED"}))
+    redis_client.set(_legacy_output_key("mig", "a"), json.dumps({"value": 1}))
+    redis_client.set(_legacy_status_key("mig", "b"), "PENDING")
+
+    assert migrate_legacy_node_keys(batch_size=1) == 3
+
+    assert get_node_status("mig", "a") == NodeStatus.COMPLETED
+    assert get_node_output("mig", "a") == {"value": 1}
+    assert get_node_status("mig", "b") == NodeStatus.PENDING
+    assert redis_client.keys("workflow:mig:node:*") == []
+    assert migrate_legacy_node_keys() == 0
+
+
+def test_migrate_keeps_values_written_in_the_new_layout():
+    set_node_status("mig-new", "a", NodeStatus.RUNNING)
+    redis_client.set(_legacy_status_key("mig-new", "a"), json.dumps({"status": "PENDING"}))
+
+    assert migrate_legacy_node_keys() == 0
+
+    assert get_node_status("mig-new", "a") == NodeStatus.RUNNING
+    assert not redis_client.exists(_legacy_status_key("mig-new", "a"))
@@ -1,17 +1,19 @@
-from orchestrator.models import DAGNode, Workflow
+import pytest
+
+from orchestrator.models import DAGNode, Workflow, thaw
 
 
 def test_dag_node_basic_init():
     node = DAGNode(id="n1", handler="noop")
     assert node.id == "n1"
     assert node.handler == "noop"
-    assert node.dependencies == []
+    assert node.dependencies == ()
     assert node.config == {}
 
 
 def test_dag_node_with_all_fields():
     node = DAGNode(id='n1', handler='noop', dependencies=['a'], config={'x': 1})
-    assert node.dependencies == ['a']
+    assert node.dependencies == ('a',)
     assert node.config == {'x': 1}
 
 
@@ -20,3 +22,21 @@ def test_workflow_init():
     wf = Workflow(execution_id='id123', name='WF', nodes=nodes)
     assert wf.execution_id == 'id123'
     assert wf.nodes[0].id == 'a'
+
+
+def test_cached_models_cannot_be_modified_through_their_containers():
+    config = {"headers": {"x": "1"}, "ids": [1, 2]}
+    node = DAGNode(id="a", handler="noop", dependencies=["b"], config=config)
+    wf = Workflow(execution_id="id123", name="WF", nodes=[node], params={"tags": ["t"]})
+    config["headers"]["x"] = "changed"
+
+    assert node.config["headers"]["x"] == "1"
+    with pytest.raises(TypeError):
+        node.config["extra"] = 1
+    with pytest.raises(TypeError):
+        node.config["headers"]["x"] = "2"
+    with pytest.raises(AttributeError):
+        node.dependencies.append("c")
+    with pytest.raises(TypeError):
+        wf.params["tags"] += ("u",)
+    assert thaw(node.config) == {"headers": {"x": "1"}, "ids": [1, 2]}
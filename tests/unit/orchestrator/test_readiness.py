@@ -0,0 +1,48 @@
+from orchestrator.models import DAGNode
+from orchestrator.readiness import (
+    build_children_index,
+    get_remaining_dependencies,
+    init_readiness_index,
+    resolve_completed_nodes,
+)
+
+FAN_IN = [
+    DAGNode(id="a", handler="noop"),
+    DAGNode(id="b", handler="noop", dependencies=["a"]),
+    DAGNode(id="c", handler="noop", dependencies=["a"]),
+    DAGNode(id="d", handler="noop", dependencies=["b", "c"]),
+]
+
+
+def test_build_children_index():
+    assert build_children_index(FAN_IN) == {"a": ["b", "c"], "b": ["d"], "c": ["d"], "d": []}
+
+
+def test_init_readiness_index_counts_dependencies():
+    init_readiness_index("ready-1", FAN_IN)
+    assert get_remaining_dependencies("ready-1") == {"a": 0, "b": 1, "c": 1, "d": 2}
+
+
+def test_resolve_completed_nodes_returns_children_that_become_ready():
+    init_readiness_index("ready-2", FAN_IN)
+
+    assert sorted(resolve_completed_nodes("ready-2", ["a"])) == ["b", "c"]
+    assert resolve_completed_nodes("ready-2", ["b"]) == []
+    assert resolve_completed_nodes("ready-2", ["c"]) == ["d"]
+
+
+def test_resolve_completed_nodes_is_idempotent():
+    init_readiness_index("ready-3", FAN_IN)
+
+    resolve_completed_nodes("ready-3", ["a"])
+    assert resolve_completed_nodes("ready-3", ["a"]) == []
+    assert get_remaining_dependencies("ready-3")["b"] == 0
+
+
+def test_reinitializing_keeps_progress():
+    init_readiness_index("ready-4", FAN_IN)
+    resolve_completed_nodes("ready-4", ["a"])
+
+    init_readiness_index("ready-4", FAN_IN)
+
+    assert get_remaining_dependencies("ready-4")["b"] == 0
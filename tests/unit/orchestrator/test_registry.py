@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+from clients.async_redis_client import AsyncRedisClient
+from clients.redis_client import redis_client
+from orchestrator.executor import execute_workflow
+from orchestrator.loader import load_definition, load_workflow
+from orchestrator.models import NodeStatus, Priority
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.registry import (
+    bind_parameters,
+    register_definition,
+    register_definition_async,
+    resolve_version,
+    run_submission,
+)
+from orchestrator.state import get_node_status, set_node_status
+from orchestrator.submission import store_submissions
+from orchestrator.topology import topological_sort
+
+DEFINITION = {
+    "name": "fetch",
+    "dag": {
+        "nodes": [
+            {"id": "a", "handler": "noop", "dependencies": [], "config": {"url": "{{ params.url }}"}},
+            {"id": "b", "handler": "noop", "dependencies": ["a"], "config": {}},
+        ]
+    },
+    "priority": "normal",
+    "deadline": None,
+    "parameters": {"url": None, "retries": 3},
+}
+TOPOLOGY = topological_sort({"a": [], "b": ["a"]})
+
+
+def _resolve(name, version=None):
+    async def runner():
+        client = AsyncRedisClient()
+        try:
+            return await resolve_version(client, name, version)
+        finally:
+            await client.close()
+
+    return asyncio.run(runner())
+
+
+def test_register_definition_deduplicates_content():
+    first = register_definition(DEFINITION, TOPOLOGY)
+    again = register_definition(DEFINITION, TOPOLOGY)
+    changed = register_definition({**DEFINITION, "priority": "high"}, TOPOLOGY)
+
+    assert first[0] == 1 and first[2] is True
+    assert again == (1, first[1], False)
+    assert changed[0] == 2 and changed[1] != first[1]
+    assert _resolve("fetch") == (2, changed[1])
+    assert _resolve("fetch", 1) == (1, first[1])
+
+
+def test_async_registration_shares_versions_with_sync_registration():
+    async def register(definition):
+        client = AsyncRedisClient()
+        try:
+            return await register_definition_async(client, definition, TOPOLOGY)
+        finally:
+            await client.close()
+
+    first = register_definition(DEFINITION, TOPOLOGY)
+
+    assert asyncio.run(register(DEFINITION)) == (1, first[1], False)
+    assert asyncio.run(register({**DEFINITION, "priority": "high"}))[0] == 2
+    assert load_definition(first[1]).name == "fetch"
+
+
+def test_resolve_version_rejects_unknown_versions():
+    register_definition(DEFINITION, TOPOLOGY)
+    for name, version in (("fetch", 2), ("fetch", 0), ("missing", None)):
+        with pytest.raises(ValueError):
+            _resolve(name, version)
+
+
+def test_bind_parameters():
+    declared = {"url": None, "retries": 3}
+    assert bind_parameters(declared, {"url": "u"}) == {"url": "u", "retries": 3}
+    with pytest.raises(ValueError, match="Missing required parameters: url"):
+        bind_parameters(declared, {})
+    with pytest.raises(ValueError, match="Unknown parameters: nope"):
+        bind_parameters(declared, {"url": "u", "nope": 1})
+
+
+def test_executions_share_the_parsed_definition():
+    version, digest, _ = register_definition(DEFINITION, TOPOLOGY)
+    definition = load_definition(digest)
+    first = run_submission(definition, version, {"url": "http://one"})
+    second = run_submission(definition, version, {"url": "http://two"}, priority=Priority.HIGH)
+    store_submissions([first, second])
+
+    one, two = load_workflow(first.execution_id), load_workflow(second.execution_id)
+
+    assert one.nodes is two.nodes and one.topology is two.topology
+    assert one.params == {"url": "http://one", "retries": 3}
+    assert (one.priority, two.priority) == (Priority.NORMAL, Priority.HIGH)
+    assert one.topology.children["a"] == ("b",)
+
+
+def _run_until_second_node_is_queued(digest: str, version: int) -> str:
+    submission = run_submission(load_definition(digest), version, {"url": "http://one"})
+    store_submissions([submission])
+    execution_id = submission.execution_id
+    execute_workflow(execution_id)
+    set_node_status(execution_id, "a", NodeStatus.COMPLETED)
+    execute_workflow(execution_id, ["a"])
+    return execution_id
+
+
+def test_runs_resolve_through_the_children_index_of_their_definition():
+    version, digest, _ = register_definition(DEFINITION, TOPOLOGY)
+
+    execution_id = _run_until_second_node_is_queued(digest, version)
+
+    assert get_node_status(execution_id, "b") == NodeStatus.QUEUED
+    assert not redis_client.exists(RedisKeyTemplates.WORKFLOW_CHILDREN.format(execution_id=execution_id))
+    shared = RedisKeyTemplates.DEFINITION_CHILDREN.format(digest=digest)
+    assert redis_client.hgetall(shared) == {"a": '["b"]', "b": "[]"}
+
+
+def test_runs_of_a_definition_registered_without_children_index_store_it():
+    version, digest, _ = register_definition(DEFINITION, TOPOLOGY)
+    redis_client._redis.delete(RedisKeyTemplates.DEFINITION_CHILDREN.format(digest=digest))
+
+    execution_id = _run_until_second_node_is_queued(digest, version)
+
+    assert get_node_status(execution_id, "b") == NodeStatus.QUEUED
+    assert redis_client.exists(RedisKeyTemplates.DEFINITION_CHILDREN.format(digest=digest))
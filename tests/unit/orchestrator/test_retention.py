@@ -0,0 +1,104 @@
+import json
+from unittest.mock import patch
+
+from clients.redis_client import redis_client
+from orchestrator.models import NodeStatus
+from orchestrator.retention import stream_metrics, trim_acked_entries, trim_task_streams
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.state import get_node_status, get_node_statuses, get_workflow_status, set_node_statuses
+from orchestrator.task_queue import STREAM_NAME, dispatch_tasks
+from orchestrator.trigger import trigger_workflow_execution
+from workers.worker import GROUP
+
+
+def _add(count):
+    return [redis_client._redis.xadd(STREAM_NAME, {"n": i}) for i in range(count)]
+
+
+def _read(group, count):
+    response = redis_client._redis.xreadgroup(group, "c1", {STREAM_NAME: ">"}, count=count)
+    return [msg_id for _stream, entries in response for msg_id, _fields in entries]
+
+
+def test_trim_leaves_streams_without_groups_alone():
+    _add(3)
+
+    assert trim_acked_entries(STREAM_NAME) == (0, 3)
+
+
+def test_trim_keeps_pending_and_unread_entries():
+    redis_client._redis.xgroup_create(STREAM_NAME, "g", id="0", mkstream=True)
+    ids = _add(4)
+    first, second = _read("g", 2)
+    redis_client._redis.xack(STREAM_NAME, "g", first)
+
+    assert trim_acked_entries(STREAM_NAME) == (1, 3)
+    assert [msg_id for msg_id, _ in redis_client._redis.xrange(STREAM_NAME)] == ids[1:]
+
+    redis_client._redis.xack(STREAM_NAME, "g", second)
+    assert trim_acked_entries(STREAM_NAME) == (1, 2)
+
+
+def test_trim_waits_for_the_slowest_group():
+    redis_client._redis.xgroup_create(STREAM_NAME, "fast", id="0", mkstream=True)
+    redis_client._redis.xgroup_create(STREAM_NAME, "slow", id="0")
+    _add(3)
+    redis_client._redis.xack(STREAM_NAME, "fast", *_read("fast", 3))
+
+    assert trim_acked_entries(STREAM_NAME) == (0, 3)
+
+    redis_client._redis.xack(STREAM_NAME, "slow", *_read("slow", 3))
+    assert trim_acked_entries(STREAM_NAME) == (3, 0)
+
+
+def test_trim_task_streams_reports_metrics():
+    redis_client._redis.xgroup_create(STREAM_NAME, "g", id="0", mkstream=True)
+    _add(2)
+    redis_client._redis.xack(STREAM_NAME, "g", *_read("g", 2))
+    _add(1)
+
+    assert trim_task_streams([STREAM_NAME]) == {STREAM_NAME: 2}
+    assert stream_metrics([STREAM_NAME]) == {STREAM_NAME: {"length": 1, "trimmed": 2, "dropped": 0}}
+
+
+def test_trim_acks_pending_entries_whose_body_is_gone():
+    redis_client._redis.xgroup_create(STREAM_NAME, "g", id="0", mkstream=True)
+    ids = _add(3)
+    _read("g", 3)
+    redis_client._redis.xdel(STREAM_NAME, ids[0], ids[1])
+
+    assert trim_acked_entries(STREAM_NAME) == (0, 1)
+    assert redis_client._redis.xpending(STREAM_NAME, "g")["pending"] == 1
+
+
+@patch("orchestrator.task_queue.settings.TASK_STREAM_MAXLEN", 10)
+def test_task_streams_are_capped_at_maxlen():
+    set_node_statuses("capped", {f"d{i}": NodeStatus.PENDING for i in range(30)})
+    dispatch_tasks("capped", [(f"d{i}", [], {}) for i in range(30)])
+
+    trim_task_streams([STREAM_NAME])
+
+    assert redis_client._redis.xlen(STREAM_NAME) == 10
+    assert stream_metrics([STREAM_NAME])[STREAM_NAME]["dropped"] == 20
+    statuses = get_node_statuses("capped", [f"d{i}" for i in range(30)])
+    assert [statuses[f"d{i}"] for i in range(20)] == [NodeStatus.FAILED] * 20
+    assert [statuses[f"d{i}"] for i in range(20, 30)] == [NodeStatus.QUEUED] * 10
+
+
+@patch("orchestrator.task_queue.settings.TASK_STREAM_MAXLEN", 1)
+def test_dropping_pending_entries_fails_their_nodes_and_finishes_the_execution():
+    redis_client._redis.xgroup_create(STREAM_NAME, GROUP, id="0", mkstream=True)
+    redis_client.set(RedisKeyTemplates.WORKFLOW.format(execution_id="dropped"), json.dumps({
+        "name": "DAG", "dag": {"nodes": [{"id": "a", "handler": "noop", "dependencies": []}]},
+    }))
+    trigger_workflow_execution("dropped")
+    _read(GROUP, 1)
+    set_node_statuses("other", {"b": NodeStatus.PENDING})
+    dispatch_tasks("other", [("b", [], {})])
+
+    trim_task_streams([STREAM_NAME])
+
+    assert get_node_status("dropped", "a") == NodeStatus.FAILED
+    assert get_workflow_status("dropped") == NodeStatus.FAILED
+    assert redis_client._redis.xpending(STREAM_NAME, GROUP)["pending"] == 0
+    assert [fields["node_id"] for _msg_id, fields in redis_client._redis.xrange(STREAM_NAME)] == ["b"]
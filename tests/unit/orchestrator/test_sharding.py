@@ -0,0 +1,70 @@
+import time
+
+from clients.redis_client import redis_client
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.sharding import (
+    ShardLeaseManager,
+    active_set_key,
+    all_shards,
+    migrate_legacy_active_set,
+    shard_for,
+)
+from orchestrator.starter import discover_active_workflow_ids
+
+
+def test_shard_for_is_stable_and_in_range():
+    assert shard_for("exec-1") == shard_for("exec-1")
+    assert all(shard_for(f"exec-{i}") in all_shards() for i in range(100))
+
+
+def test_single_instance_owns_every_shard():
+    manager = ShardLeaseManager("orch-a", lease_seconds=5)
+    assert manager.refresh() == all_shards()
+    assert manager.owned == all_shards()
+
+
+def test_two_instances_split_shards():
+    first = ShardLeaseManager("orch-a", lease_seconds=5)
+    second = ShardLeaseManager("orch-b", lease_seconds=5)
+    first.refresh()
+    second.refresh()
+    first.refresh()
+    second.refresh()
+
+    assert first.owned and second.owned
+    assert first.owned.isdisjoint(second.owned)
+    assert first.owned | second.owned == all_shards()
+
+
+def test_dead_instance_shards_are_taken_over_after_lease_expiry():
+    first = ShardLeaseManager("orch-a", lease_seconds=0.3)
+    second = ShardLeaseManager("orch-b", lease_seconds=0.3)
+    first.refresh()
+    second.refresh()
+    first.refresh()
+    second.refresh()
+
+    time.sleep(0.4)
+    second.refresh()
+
+    assert second.owned == all_shards()
+
+
+def test_release_all_frees_shards_immediately():
+    first = ShardLeaseManager("orch-a", lease_seconds=5)
+    first.refresh()
+    first.release_all()
+
+    second = ShardLeaseManager("orch-b", lease_seconds=5)
+    assert second.refresh() == all_shards()
+
+
+def test_migrate_legacy_active_set():
+    redis_client.sadd(RedisKeyTemplates.WORKFLOWS_ACTIVE, "legacy-1")
+
+    migrate_legacy_active_set()
+
+    assert redis_client.smembers(RedisKeyTemplates.WORKFLOWS_ACTIVE) == set()
+    assert redis_client.sismember(active_set_key("legacy-1"), "legacy-1")
+    assert discover_active_workflow_ids() == ["legacy-1"]
+    assert discover_active_workflow_ids(all_shards() - {shard_for("legacy-1")}) == []
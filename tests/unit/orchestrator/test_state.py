@@ -1,12 +1,20 @@
+import asyncio
 import pytest
 
+from clients.async_redis_client import AsyncRedisClient
 from clients.redis_client import redis_client
 from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.sharding import active_set_key
 from orchestrator.state import (
     set_node_status,
     get_node_status,
-    all_dependencies_succeeded, set_node_output, get_node_output
+    all_dependencies_succeeded, set_node_output, get_node_output,
+    get_node_statuses, set_node_statuses, get_node_outputs,
+    init_node_counters, get_node_counters, get_workflow_status,
+    start_node_run, commit_node_run, get_all_node_statuses,
+    get_execution_statuses, set_workflow_status,
 )
+from orchestrator.events import read_node_events
 from orchestrator.models import NodeStatus
 
 
@@ -19,11 +27,9 @@ def test_get_node_status_raises_on_missing_node():
     execution_id = "test-exec"
     node_id = "nonexistent-node"
 
-    # Ensure the key does not exist
-    redis_client._redis.delete(
-        RedisKeyTemplates.WORKFLOW_NODE.format(
-            execution_id=execution_id, node_id=node_id
-        )
+    # Ensure the node does not exist
+    redis_client._redis.hdel(
+        RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id), node_id
     )
 
     with pytest.raises(ValueError) as exc:
@@ -71,3 +77,141 @@ def test_get_node_output_returns_empty_if_missing():
 
     output = get_node_output(execution_id, node_id)
     assert output == {}
+
+
+def test_set_and_get_node_statuses_in_bulk():
+    set_node_statuses("wf-bulk", {"a": NodeStatus.COMPLETED, "b": NodeStatus.QUEUED})
+    assert get_node_statuses("wf-bulk", ["a", "b", "missing"]) == {
+        "a": NodeStatus.COMPLETED,
+        "b": NodeStatus.QUEUED,
+        "missing": None,
+    }
+
+
+def test_get_node_statuses_treats_invalid_data_as_missing():
+    redis_client._redis.hset(
+        RedisKeyTemplates.WORKFLOW_NODES.format(execution_id="wf-bad"),
+        "a",
+        "not-json",
+    )
+    assert get_node_statuses("wf-bad", ["a"]) == {"a": None}
+
+
+def test_get_all_node_statuses_reads_the_execution_hash():
+    set_node_statuses("wf-all", {"a": NodeStatus.PENDING, "b": NodeStatus.COMPLETED})
+    assert get_all_node_statuses("wf-all") == {"a": NodeStatus.PENDING, "b": NodeStatus.COMPLETED}
+    assert redis_client.keys("workflow:wf-all:node:*") == []
+
+
+def test_get_node_outputs_in_bulk():
+    set_node_output("exec-bulk", "a", {"value": 1})
+    assert get_node_outputs("exec-bulk", ["a", "b"]) == {"a": {"value": 1}, "b": {}}
+
+
+def test_status_transitions_update_counters():
+    init_node_counters("wf-count", 2)
+    set_node_statuses("wf-count", {"a": NodeStatus.PENDING, "b": NodeStatus.PENDING})
+    set_node_status("wf-count", "a", NodeStatus.QUEUED)
+    set_node_status("wf-count", "a", NodeStatus.RUNNING)
+
+    counters = get_node_counters("wf-count")
+    assert counters["total"] == 2
+    assert counters["PENDING"] == 1
+    assert counters["QUEUED"] == 0
+    assert counters["RUNNING"] == 1
+
+
+def test_last_transition_finalizes_workflow():
+    init_node_counters("wf-done", 2)
+    set_node_statuses("wf-done", {"a": NodeStatus.RUNNING, "b": NodeStatus.RUNNING})
+    redis_client.sadd(active_set_key("wf-done"), "wf-done")
+
+    assert set_node_status("wf-done", "a", NodeStatus.COMPLETED) is None
+    assert set_node_status("wf-done", "b", NodeStatus.COMPLETED) == NodeStatus.COMPLETED
+
+    assert get_workflow_status("wf-done") == NodeStatus.COMPLETED
+    assert not redis_client.sismember(active_set_key("wf-done"), "wf-done")
+
+
+def test_failed_node_finalizes_workflow_once_nothing_is_in_flight():
+    init_node_counters("wf-fail", 3)
+    set_node_statuses("wf-fail", {"a": NodeStatus.RUNNING, "b": NodeStatus.RUNNING, "c": NodeStatus.PENDING})
+
+    assert set_node_status("wf-fail", "a", NodeStatus.FAILED, error="boom") is None
+    assert set_node_status("wf-fail", "b", NodeStatus.COMPLETED) == NodeStatus.FAILED
+    assert get_workflow_status("wf-fail") == NodeStatus.FAILED
+
+
+def _deliver(stream, group):
+    redis_client._redis.xgroup_create(stream, group, id="0", mkstream=True)
+    redis_client._redis.xadd(stream, {"node_id": "a"})
+    [[_stream, [(msg_id, _fields)]]] = redis_client._redis.xreadgroup(group, "c1", {stream: ">"})
+    return msg_id
+
+
+def test_start_node_run_claims_queued_node_once():
+    init_node_counters("wf-start", 1)
+    set_node_status("wf-start", "a", NodeStatus.QUEUED)
+
+    assert start_node_run("wf-start", "a", "1-0") is True
+    assert start_node_run("wf-start", "a", "2-0") is False
+    assert start_node_run("wf-start", "a", "1-0") is True
+    assert get_node_status("wf-start", "a") == NodeStatus.RUNNING
+    assert get_node_counters("wf-start")["RUNNING"] == 1
+
+
+def test_commit_node_run_writes_result_acks_and_publishes():
+    init_node_counters("wf-commit", 1)
+    set_node_status("wf-commit", "a", NodeStatus.QUEUED)
+    msg_id = _deliver("tasks:test", "g")
+    start_node_run("wf-commit", "a", msg_id)
+
+    applied, final_status = commit_node_run(
+        "wf-commit", "a", msg_id, "tasks:test", "g", NodeStatus.COMPLETED, output='{"x": 1}'
+    )
+
+    assert (applied, final_status) == (True, NodeStatus.COMPLETED)
+    assert get_node_output("wf-commit", "a") == {"x": 1}
+    assert get_workflow_status("wf-commit") == NodeStatus.COMPLETED
+    assert redis_client._redis.xpending("tasks:test", "g")["pending"] == 0
+    _last_id, events = read_node_events("0-0", block_ms=10)
+    assert events == [{"execution_id": "wf-commit", "node_id": "a", "status": "COMPLETED"}]
+
+
+def test_commit_node_run_skips_finished_node_but_still_acks():
+    init_node_counters("wf-stale", 1)
+    set_node_status("wf-stale", "a", NodeStatus.COMPLETED)
+    msg_id = _deliver("tasks:stale", "g")
+
+    applied, final_status = commit_node_run(
+        "wf-stale", "a", msg_id, "tasks:stale", "g", NodeStatus.FAILED, error="late"
+    )
+
+    assert (applied, final_status) == (False, None)
+    assert get_node_status("wf-stale", "a") == NodeStatus.COMPLETED
+    assert redis_client._redis.xpending("tasks:stale", "g")["pending"] == 0
+
+
+def test_get_execution_statuses_reports_counts_in_request_order():
+    init_node_counters("wf-counts", 3)
+    set_node_statuses("wf-counts", {"a": NodeStatus.COMPLETED, "b": NodeStatus.RUNNING, "c": NodeStatus.PENDING})
+    set_workflow_status("wf-counts", NodeStatus.RUNNING)
+    # Stored before counters existed
+    redis_client.set(RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id="wf-legacy"), NodeStatus.PENDING.value)
+
+    async def runner():
+        client = AsyncRedisClient()
+        try:
+            return await get_execution_statuses(client, ["wf-legacy", "wf-missing", "wf-counts"])
+        finally:
+            await client.close()
+
+    legacy, missing, counted = asyncio.run(runner())
+
+    assert legacy == {"execution_id": "wf-legacy", "status": "PENDING", "nodes": None}
+    assert missing["execution_id"] == "wf-missing" and "not found" in missing["error"]
+    assert counted == {
+        "execution_id": "wf-counts",
+        "status": "RUNNING",
+        "nodes": {"total": 3, "pending": 1, "queued": 0, "running": 1, "completed": 1, "failed": 0},
+    }
@@ -0,0 +1,74 @@
+import asyncio
+
+from clients import codecs
+from clients.async_redis_client import AsyncRedisClient
+from clients.redis_client import redis_client
+from orchestrator.events import latest_event_id, read_node_events
+from orchestrator.loader import load_workflow
+from orchestrator.models import DAGNode, NodeStatus
+from orchestrator.readiness import get_remaining_dependencies
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.starter import group_node_events, handle_node_events
+from orchestrator.state import get_all_node_statuses, get_node_counters
+from orchestrator.submission import Submission, store_submissions, store_submissions_async
+from orchestrator.task_queue import STREAM_NAME
+from orchestrator.topology import topological_sort
+
+NODES = [
+    DAGNode(id="a", handler="noop"),
+    DAGNode(id="b", handler="noop", dependencies=["a"]),
+]
+
+
+def _submission(execution_id: str) -> Submission:
+    definition = {
+        "name": "Batch DAG",
+        "dag": {"nodes": [{"id": n.id, "handler": n.handler, "dependencies": n.dependencies} for n in NODES]},
+    }
+    return Submission(
+        execution_id=execution_id,
+        name="Batch DAG",
+        definition=codecs.encode(definition),
+        nodes=NODES,
+        topology=topological_sort({node.id: node.dependencies for node in NODES}),
+    )
+
+
+def test_store_submissions_writes_initial_state():
+    created_at = store_submissions([_submission("sub-1"), _submission("sub-2")], created_at=1000)
+
+    assert created_at == 1000
+    for execution_id in ("sub-1", "sub-2"):
+        assert redis_client.get(RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id=execution_id)) == "PENDING"
+        assert [node.id for node in load_workflow(execution_id).nodes] == ["a", "b"]
+        assert get_all_node_statuses(execution_id) == {"a": NodeStatus.PENDING, "b": NodeStatus.PENDING}
+        assert get_node_counters(execution_id)["total"] == 2
+        assert get_remaining_dependencies(execution_id) == {"a": 0, "b": 1}
+    assert redis_client._redis.xlen(STREAM_NAME) == 0
+
+
+def test_async_submissions_write_the_same_state():
+    async def runner():
+        client = AsyncRedisClient()
+        try:
+            return await store_submissions_async(client, [_submission("sub-async")], created_at=1000)
+        finally:
+            await client.close()
+
+    assert asyncio.run(runner()) == 1000
+    assert redis_client.get(RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id="sub-async")) == "PENDING"
+    assert get_all_node_statuses("sub-async") == {"a": NodeStatus.PENDING, "b": NodeStatus.PENDING}
+    assert get_remaining_dependencies("sub-async") == {"a": 0, "b": 1}
+
+
+def test_triggered_submission_dispatches_roots_from_its_event():
+    start = latest_event_id()
+    store_submissions([_submission("sub-trigger")], trigger=True)
+
+    _, events = read_node_events(start, block_ms=10)
+    assert group_node_events(events) == {"sub-trigger": None}
+
+    handle_node_events(events)
+
+    msgs = redis_client._redis.xrevrange(STREAM_NAME, count=10)
+    assert [m[1]["node_id"] for m in msgs] == ["a"]
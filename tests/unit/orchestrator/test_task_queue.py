@@ -1,4 +1,7 @@
-from orchestrator.task_queue import push_task, STREAM_NAME
+from clients import codecs
+from orchestrator.models import NodeStatus, Priority
+from orchestrator.state import get_node_status, set_node_status
+from orchestrator.task_queue import LANE_STREAMS, QueuedTask, dispatch_tasks, push_task, STREAM_NAME
 from clients.redis_client import redis_client
 
 
@@ -20,3 +23,51 @@ def test_push_task_empty_payload():
     msgs = redis_client._redis.xrevrange(STREAM_NAME, count=1)
     assert msgs
     assert msgs[0][1]["node_id"] == "n2"
+
+
+def test_dispatch_tasks_queues_ready_nodes_once():
+    set_node_status("dispatch1", "a", NodeStatus.PENDING)
+
+    first = dispatch_tasks("dispatch1", [("a", [], {"handler": "noop", "config": {}})])
+    second = dispatch_tasks("dispatch1", [("a", [], {"handler": "noop", "config": {}})])
+
+    assert first == ["a"]
+    assert second == []
+    assert get_node_status("dispatch1", "a") == NodeStatus.QUEUED
+    msgs = redis_client._redis.xrange(STREAM_NAME)
+    assert len(msgs) == 1
+    assert codecs.decode(msgs[0][1]["payload"]) == {"handler": "noop", "config": {}}
+
+
+def test_dispatch_tasks_requires_completed_dependencies():
+    set_node_status("dispatch2", "a", NodeStatus.COMPLETED)
+    set_node_status("dispatch2", "b", NodeStatus.RUNNING)
+    set_node_status("dispatch2", "c", NodeStatus.PENDING)
+    set_node_status("dispatch2", "d", NodeStatus.PENDING)
+
+    dispatched = dispatch_tasks("dispatch2", [
+        ("c", ["a", "b"], {"handler": "noop"}),
+        ("d", ["a"], {"handler": "noop"}),
+    ])
+
+    assert dispatched == ["d"]
+    assert get_node_status("dispatch2", "c") == NodeStatus.PENDING
+
+
+def test_dispatch_tasks_routes_nodes_to_priority_lanes():
+    set_node_status("dispatch3", "urgent", NodeStatus.PENDING)
+    set_node_status("dispatch3", "bulk", NodeStatus.PENDING)
+
+    dispatched = dispatch_tasks("dispatch3", [
+        QueuedTask("urgent", [], {"handler": "noop"}, Priority.HIGH, 1700000000.5),
+        QueuedTask("bulk", [], {"handler": "noop"}, Priority.LOW),
+    ])
+
+    assert dispatched == ["urgent", "bulk"]
+    high = redis_client._redis.xrange(LANE_STREAMS[Priority.HIGH])
+    low = redis_client._redis.xrange(LANE_STREAMS[Priority.LOW])
+    assert high[0][1]["node_id"] == "urgent"
+    assert high[0][1]["deadline"] == "1700000000.5"
+    assert low[0][1]["node_id"] == "bulk"
+    assert "deadline" not in low[0][1]
+    assert redis_client._redis.xrange(STREAM_NAME) == []
@@ -1,22 +1,22 @@
 import pytest
 from unittest.mock import patch
 
-from orchestrator.template import resolve_templates
+from orchestrator.template import load_task_config, resolve_templates, task_inputs
 from clients.redis_client import redis_client
 from orchestrator.redis_keys import RedisKeyTemplates
 
 
-@patch("orchestrator.template.get_node_output")
+@patch("orchestrator.template.get_node_outputs")
 def test_single_template_resolves_value(mock_get_output):
     execution_id = "exec-1"
     config = {"url": "http://example.com/{{ get_user.id }}"}
 
-    mock_get_output.return_value = {"id": "abc-123"}
+    mock_get_output.return_value = {"get_user": {"id": "abc-123"}}
 
     resolved = resolve_templates(execution_id, config)
 
     assert resolved["url"] == "http://example.com/abc-123"
-    mock_get_output.assert_called_once_with("exec-1", "get_user")
+    mock_get_output.assert_called_once_with("exec-1", ["get_user"])
 
 
 def test_multiple_templates_resolve():
@@ -26,16 +26,14 @@ def test_multiple_templates_resolve():
     }
     alice_output = {"name": "Alice"}
     ben_output = {"name": "Ben"}
-    redis_client.set_json(
-        RedisKeyTemplates.WORKFLOW_NODE_OUTPUT.format(
-            execution_id=execution_id, node_id="alice"
-        ),
+    redis_client.hset_json(
+        RedisKeyTemplates.WORKFLOW_OUTPUTS.format(execution_id=execution_id),
+        "alice",
         alice_output,
     )
-    redis_client.set_json(
-        RedisKeyTemplates.WORKFLOW_NODE_OUTPUT.format(
-            execution_id=execution_id, node_id="ben"
-        ),
+    redis_client.hset_json(
+        RedisKeyTemplates.WORKFLOW_OUTPUTS.format(execution_id=execution_id),
+        "ben",
         ben_output,
     )
 
@@ -43,35 +41,108 @@ def test_multiple_templates_resolve():
     assert resolved["message"] == "Alice and Ben are friends."
 
 
-@patch("orchestrator.template.get_node_output")
+@patch("orchestrator.template.get_node_outputs")
 def test_multiple_nodes_templates_resolve(mock_get_output):
     execution_id = "exec-2"
     config = {
         "message": "User {{ get_user.name }} has {{ get_user.count }} items."
     }
 
-    mock_get_output.return_value = {
+    mock_get_output.return_value = {"get_user": {
         "name": "Alice",
         "count": 3
-    }
+    }}
 
     resolved = resolve_templates(execution_id, config)
     assert resolved["message"] == "User Alice has 3 items."
 
 
-@patch("orchestrator.template.get_node_output")
+@patch("orchestrator.template.get_node_outputs")
 def test_template_with_missing_output_key(mock_get_output):
     execution_id = "exec-3"
     config = {
         "text": "Order {{ order.id }} placed by {{ order.user }}"
     }
 
-    mock_get_output.return_value = {
+    mock_get_output.return_value = {"order": {
         "id": "xyz"
         # 'user' key is missing
-    }
+    }}
 
     resolved = resolve_templates(execution_id, config)
 
     # We expect fallback placeholder
     assert resolved["text"] == "Order xyz placed by <missing:order.user>"
+
+
+def test_task_inputs_reads_every_referenced_output_in_one_call():
+    execution_id = "exec-bulk"
+    key = RedisKeyTemplates.WORKFLOW_OUTPUTS.format(execution_id=execution_id)
+    redis_client.hset_json(key, "alice", {"name": "Alice"})
+    redis_client.hset_json(key, "ben", {"name": "Ben"})
+    config = {"a": "{{ alice.name }}", "b": "{{ ben.name }} and {{ alice.name }}"}
+
+    with patch.object(redis_client, "hmget_json", wraps=redis_client.hmget_json) as hmget, \
+            patch.object(redis_client, "hget_json", wraps=redis_client.hget_json) as hget:
+        inputs = task_inputs(execution_id, config)
+
+    assert inputs == {"config": {"a": "Alice", "b": "Ben and Alice"}}
+    hmget.assert_called_once_with(key, ["alice", "ben"])
+    hget.assert_not_called()
+
+
+def test_offloaded_outputs_are_passed_by_reference():
+    execution_id = "exec-4"
+    ref = {"$blob": "exec-4/report/blob.z", "size": 1_000_000}
+    redis_client.hset_json(RedisKeyTemplates.WORKFLOW_OUTPUTS.format(execution_id=execution_id), "report", ref)
+    redis_client.hset_json(RedisKeyTemplates.WORKFLOW_OUTPUTS.format(execution_id=execution_id), "user", {"id": 7})
+    config = {"text": "{{ user.id }}: {{ report.body }}", "retries": 3}
+
+    inputs = task_inputs(execution_id, config)
+
+    assert inputs == {
+        "config": {"text": {"$template": ["7: ", ["report", "body"]]}, "retries": 3},
+        "refs": {"report": ref},
+    }
+
+
+def test_inline_outputs_need_no_refs():
+    redis_client.hset_json(RedisKeyTemplates.WORKFLOW_OUTPUTS.format(execution_id="exec-5"), "user", {"id": 7})
+
+    assert task_inputs("exec-5", {"url": "/users/{{ user.id }}"}) == {"config": {"url": "/users/7"}}
+
+
+@patch("orchestrator.template.blob_store.load")
+def test_load_task_config_fills_in_referenced_outputs(mock_load):
+    mock_load.return_value = {"body": "large text"}
+    ref = {"$blob": "exec-4/report/blob.z", "size": 10}
+    payload = {"handler": "noop", "config": {"text": {"$template": ["7: ", ["report", "body"]]}}, "refs": {"report": ref}}
+
+    assert load_task_config(payload) == {"text": "7: large text"}
+    mock_load.assert_called_once_with(ref)
+
+
+@patch("orchestrator.template.blob_store.load")
+def test_substituted_values_are_not_rendered_again(mock_load):
+    execution_id = "exec-6"
+    ref = {"$blob": "exec-6/report/blob.z", "size": 10}
+    outputs_key = RedisKeyTemplates.WORKFLOW_OUTPUTS.format(execution_id=execution_id)
+    redis_client.hset_json(outputs_key, "report", ref)
+    redis_client.hset_json(outputs_key, "user", {"name": "{{ report.secret }}"})
+    mock_load.return_value = {"body": "{{ user.name }}", "secret": "hidden"}
+    config = {"text": "{{ user.name }} / {{ report.body }}"}
+
+    inputs = task_inputs(execution_id, config, {"host": "{{ report.secret }}"})
+    assert load_task_config(inputs) == {"text": "{{ report.secret }} / {{ user.name }}"}
+
+    params_config = {"url": "{{ params.host }} {{ report.body }}"}
+    inputs = task_inputs(execution_id, params_config, {"host": "{{ report.secret }}"})
+    assert load_task_config(inputs) == {"url": "{{ report.secret }} {{ user.name }}"}
+
+
+@patch("orchestrator.template.get_node_outputs")
+def test_task_inputs_substitutes_params_without_reading_outputs(mock_get_output):
+    inputs = task_inputs("exec-params", {"url": "http://{{ params.host }}/x"}, {"host": "example.com"})
+
+    assert inputs == {"config": {"url": "http://example.com/x"}}
+    mock_get_output.assert_not_called()
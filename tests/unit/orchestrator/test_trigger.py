@@ -1,9 +1,11 @@
+import asyncio
 import json
 import pytest
 
 from orchestrator.models import NodeStatus
-from orchestrator.trigger import trigger_workflow_execution
+from orchestrator.trigger import start_workflow_async, trigger_workflow_execution
 from orchestrator.task_queue import STREAM_NAME
+from clients.async_redis_client import AsyncRedisClient
 from clients.redis_client import redis_client
 from orchestrator.redis_keys import RedisKeyTemplates
 
@@ -14,10 +16,9 @@ def test_trigger_positive():
         "name": "WF",
         "dag": {"nodes": [{"id": "a", "handler": "noop", "dependencies": []}]}
     }))
-    redis_client.set_json(
-        RedisKeyTemplates.WORKFLOW_NODE.format(
-            execution_id=execution_id, node_id="a"
-        ),
+    redis_client.hset_json(
+        RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id),
+        "a",
         {"status": NodeStatus.PENDING.value},
     )
 
@@ -31,3 +32,29 @@ def test_trigger_positive():
 def test_trigger_missing_workflow():
     with pytest.raises(ValueError):
         trigger_workflow_execution("missing-id")
+
+
+def test_start_workflow_async_marks_running_and_dispatches_roots():
+    execution_id = "t-async"
+    redis_client.set(RedisKeyTemplates.WORKFLOW.format(execution_id=execution_id), json.dumps({
+        "name": "WF",
+        "dag": {"nodes": [{"id": "a", "handler": "noop", "dependencies": []}]}
+    }))
+    redis_client.hset_json(
+        RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id),
+        "a",
+        {"status": NodeStatus.PENDING.value},
+    )
+
+    async def runner():
+        client = AsyncRedisClient()
+        try:
+            await start_workflow_async(client, execution_id)
+        finally:
+            await client.close()
+
+    asyncio.run(runner())
+
+    assert redis_client.get(RedisKeyTemplates.WORKFLOW_STATUS.format(execution_id=execution_id)) == "RUNNING"
+    msgs = redis_client._redis.xrevrange(STREAM_NAME, count=1)
+    assert msgs[0][1]["node_id"] == "a"
@@ -0,0 +1,83 @@
+import asyncio
+import time
+import pytest
+from clients.redis_client import redis_client
+from orchestrator.models import NodeStatus
+from orchestrator.state import get_node_status, set_node_statuses
+from orchestrator.task_queue import STREAM_NAME, push_task
+from workers import registry
+from workers.async_worker import AsyncWorker
+from workers.lanes import LaneReader
+from workers.worker import GROUP
+
+
+def _queue(execution_id, handler, count):
+    set_node_statuses(execution_id, {f"n{i}": NodeStatus.QUEUED for i in range(count)})
+    for i in range(count):
+        push_task(execution_id, f"n{i}", {"handler": handler, "config": {}})
+
+
+def _run(concurrency, batch_size=100):
+    async def main():
+        lanes = LaneReader(GROUP, "async-consumer")
+        lanes.ensure_groups()
+        worker = AsyncWorker(concurrency=concurrency, batch_size=batch_size, lanes=lanes)
+        try:
+            while await worker.poll(block_ms=10):
+                pass
+            await worker.drain()
+        finally:
+            await worker.close()
+
+    asyncio.run(main())
+
+
+def test_async_worker_runs_async_handlers_concurrently(monkeypatch):
+    async def handler(config):
+        await asyncio.sleep(0.2)
+        return {"status": "ok"}
+
+    monkeypatch.setitem(registry.HANDLER_REGISTRY, "async_sleep", handler)
+    _queue("async-many", "async_sleep", 200)
+
+    start = time.perf_counter()
+    _run(concurrency=500)
+
+    assert time.perf_counter() - start < 2
+    assert all(get_node_status("async-many", f"n{i}") == NodeStatus.COMPLETED for i in range(200))
+    assert redis_client._redis.xpending(STREAM_NAME, GROUP)["pending"] == 0
+
+
+def test_async_worker_respects_concurrency_limit(monkeypatch):
+    running = {"now": 0, "max": 0}
+
+    async def handler(config):
+        running["now"] += 1
+        running["max"] = max(running["max"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+        return {"status": "ok"}
+
+    monkeypatch.setitem(registry.HANDLER_REGISTRY, "async_count", handler)
+    _queue("async-limit", "async_count", 20)
+
+    _run(concurrency=3)
+
+    assert running["max"] == 3
+    assert all(get_node_status("async-limit", f"n{i}") == NodeStatus.COMPLETED for i in range(20))
+
+
+def test_async_worker_offloads_sync_handlers_and_records_failures(monkeypatch):
+    def failing(config):
+        raise RuntimeError("Boom")
+
+    monkeypatch.setitem(registry.HANDLER_REGISTRY, "sync_fail", failing)
+    _queue("async-sync", "noop", 2)
+    set_node_statuses("async-fail", {"n0": NodeStatus.QUEUED})
+    push_task("async-fail", "n0", {"handler": "sync_fail", "config": {}})
+
+    _run(concurrency=10)
+
+    assert get_node_status("async-sync", "n0") == NodeStatus.COMPLETED
+    assert get_node_status("async-sync", "n1") == NodeStatus.COMPLETED
+    assert get_node_status("async-fail", "n0") == NodeStatus.FAILED
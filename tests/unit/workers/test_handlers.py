@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from workers.handlers import (
     noop_handler,
@@ -14,14 +15,14 @@ def test_noop_handler_returns_ok():
 
 def test_call_external_service_simulates_call():
     config = {"url": "http://fake.api"}
-    result = call_external_service(config)
+    result = asyncio.run(call_external_service(config))
     assert result["status"] == "ok"
     assert "Simulated call" in result["data"]
 
 
 def test_llm_handler_simulates_prompt():
     config = {"prompt": "Write me a poem"}
-    result = llm(config)
+    result = asyncio.run(llm(config))
     assert result["status"] == "ok"
     assert "Simulated response" in result["answer"]
 
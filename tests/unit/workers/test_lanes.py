@@ -0,0 +1,90 @@
+import asyncio
+import time
+import pytest
+from clients.async_redis_client import AsyncRedisClient
+from orchestrator.models import Priority
+from orchestrator.task_queue import LANE_STREAMS, push_task
+from workers.lanes import LaneReader
+
+
+def _reader(policy, **kwargs):
+    reader = LaneReader("lanes-group", "lanes-consumer", policy=policy, **kwargs)
+    reader.ensure_groups()
+    return reader
+
+
+def _drain(reader, n):
+    served = []
+    for _ in range(n):
+        messages = reader.read(block_ms=10)
+        served.extend(fields["node_id"] for _stream, _msg_id, fields in messages)
+    return served
+
+
+def test_weighted_policy_serves_lanes_in_proportion_without_starving_low():
+    reader = _reader("weighted", weights={"high": 4, "normal": 2, "low": 1})
+    for i in range(20):
+        for lane in Priority:
+            push_task("lanes", f"{lane.value}-{i}", {"handler": "noop"}, priority=lane)
+
+    served = _drain(reader, 14)
+    lanes = [node_id.split("-")[0] for node_id in served]
+
+    assert lanes.count("high") == 8
+    assert lanes.count("normal") == 4
+    assert lanes.count("low") == 2
+
+
+def test_weighted_policy_falls_back_to_any_non_empty_lane():
+    reader = _reader("weighted")
+    push_task("lanes", "only-low", {"handler": "noop"}, priority=Priority.LOW)
+
+    messages = reader.read(block_ms=10)
+
+    assert [(stream, fields["node_id"]) for stream, _id, fields in messages] == [
+        (LANE_STREAMS[Priority.LOW], "only-low")
+    ]
+    assert reader.read(block_ms=10) == []
+
+
+def test_edf_policy_prefers_earliest_deadline():
+    reader = _reader("edf")
+    now = time.time()
+    push_task("lanes", "high-late", {"handler": "noop"}, priority=Priority.HIGH, deadline=now + 60)
+    push_task("lanes", "low-urgent", {"handler": "noop"}, priority=Priority.LOW, deadline=now + 1)
+
+    assert _drain(reader, 2) == ["low-urgent", "high-late"]
+
+
+def test_edf_policy_ages_tasks_without_deadline_by_lane_slack():
+    reader = _reader("edf", slack_seconds={"high": 0, "normal": 0, "low": 0})
+    push_task("lanes", "low-old", {"handler": "noop"}, priority=Priority.LOW)
+    time.sleep(0.005)
+    push_task("lanes", "high-new", {"handler": "noop"}, priority=Priority.HIGH)
+
+    assert _drain(reader, 2) == ["low-old", "high-new"]
+
+
+def test_async_reads_follow_the_same_policy():
+    reader = _reader("edf")
+    now = time.time()
+    push_task("lanes", "high-late", {"handler": "noop"}, priority=Priority.HIGH, deadline=now + 60)
+    push_task("lanes", "low-urgent", {"handler": "noop"}, priority=Priority.LOW, deadline=now + 1)
+
+    async def drain():
+        client = AsyncRedisClient()
+        try:
+            served = []
+            for _ in range(2):
+                messages = await reader.read_async(client, block_ms=10)
+                served.extend(fields["node_id"] for _stream, _msg_id, fields in messages)
+            return served
+        finally:
+            await client.close()
+
+    assert asyncio.run(drain()) == ["low-urgent", "high-late"]
+
+
+def test_unknown_policy_rejected():
+    with pytest.raises(ValueError):
+        LaneReader("g", "c", policy="fifo")
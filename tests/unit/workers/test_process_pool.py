@@ -0,0 +1,79 @@
+import json
+import pytest
+from clients import codecs
+from clients.redis_client import redis_client
+from orchestrator.models import NodeStatus
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.state import get_node_output, get_node_status, set_node_status
+from workers.handlers import checksum
+from workers.process_pool import run_in_process, shutdown_process_pool
+from workers.registry import ExecutionClass, get_execution_class, register_handler
+from workers.worker import process_message
+
+
+@pytest.fixture(scope="module", autouse=True)
+def process_pool():
+    yield
+    shutdown_process_pool()
+
+
+def test_execution_class_defaults():
+    assert get_execution_class("checksum") == ExecutionClass.PROCESS
+    assert get_execution_class("noop") == ExecutionClass.INLINE
+    assert get_execution_class("llm") == ExecutionClass.INLINE
+    assert get_execution_class("unreliable") == ExecutionClass.THREAD
+
+
+def crunch(config):
+    return {"crunched": 42}
+
+
+def test_register_handler_with_execution_class(monkeypatch):
+    monkeypatch.setattr("workers.registry.HANDLER_REGISTRY", {})
+    monkeypatch.setattr("workers.registry.HANDLER_EXECUTION_CLASSES", {})
+
+    register_handler("crunch", crunch, ExecutionClass.PROCESS)
+
+    assert get_execution_class("crunch") == ExecutionClass.PROCESS
+    payload = json.dumps({"handler": "crunch", "config": {}})
+    assert codecs.decode(run_in_process("crunch", payload)) == {"crunched": 42}
+
+
+def test_process_handlers_must_be_importable(monkeypatch):
+    monkeypatch.setattr("workers.registry.HANDLER_REGISTRY", {})
+    monkeypatch.setattr("workers.registry.HANDLER_EXECUTION_CLASSES", {})
+
+    with pytest.raises(ValueError):
+        register_handler("local", lambda config: {}, ExecutionClass.PROCESS)
+
+
+def test_run_in_process_rejects_unknown_handlers():
+    with pytest.raises(ValueError):
+        run_in_process("missing", json.dumps({"handler": "missing", "config": {}}))
+
+
+def test_run_in_process_returns_encoded_output():
+    config = {"data": "abc", "rounds": 10}
+    payload = json.dumps({"handler": "checksum", "config": config})
+
+    encoded = run_in_process("checksum", payload)
+
+    assert isinstance(encoded, str)
+    assert codecs.decode(encoded) == checksum(config)
+
+
+def test_process_message_stores_process_output_without_reencoding():
+    config = {"data": "xyz", "rounds": 10}
+    set_node_status("proc-exec", "crunch", NodeStatus.QUEUED)
+    fields = {
+        "execution_id": "proc-exec",
+        "node_id": "crunch",
+        "payload": json.dumps({"handler": "checksum", "config": config}),
+    }
+
+    process_message("msg-proc", fields)
+
+    assert get_node_status("proc-exec", "crunch") == NodeStatus.COMPLETED
+    assert get_node_output("proc-exec", "crunch") == checksum(config)
+    raw = redis_client._redis.hget(RedisKeyTemplates.WORKFLOW_OUTPUTS.format(execution_id="proc-exec"), "crunch")
+    assert raw == codecs.encode(checksum(config))
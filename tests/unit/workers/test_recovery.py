@@ -0,0 +1,109 @@
+import time
+import pytest
+from clients.redis_client import redis_client
+from orchestrator.events import read_node_events
+from orchestrator.models import NodeStatus
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.state import get_node_status, set_node_status, start_node_run
+from orchestrator.task_queue import STREAM_NAME, push_task
+from workers.lanes import LaneReader
+from workers.recovery import InFlightMessages, Reclaimer, WorkerHeartbeat
+from workers.worker import GROUP, handle_message
+
+
+@pytest.fixture
+def dead_delivery():
+    """Queue a task and deliver it to a consumer that never acks it."""
+    lanes = LaneReader(GROUP, "dead-worker")
+    lanes.ensure_groups()
+    set_node_status("reclaim", "a", NodeStatus.QUEUED)
+    push_task("reclaim", "a", {"handler": "noop", "config": {}})
+    [(stream, msg_id, fields)] = lanes.read(block_ms=10)
+    start_node_run("reclaim", "a", msg_id)
+    return stream, msg_id
+
+
+def _reclaimer(**kwargs):
+    kwargs.setdefault("min_idle_seconds", 0.05)
+    return Reclaimer(GROUP, "rescuer", [STREAM_NAME], interval=0, **kwargs)
+
+
+def test_reclaimer_takes_over_idle_message_and_reruns_node(dead_delivery):
+    stream, msg_id = dead_delivery
+    time.sleep(0.1)
+
+    messages = _reclaimer().reclaim(count=10)
+
+    assert [(s, m) for s, m, _fields in messages] == [(stream, msg_id)]
+    assert get_node_status("reclaim", "a") == NodeStatus.RUNNING
+    handle_message(*messages[0])
+    assert get_node_status("reclaim", "a") == NodeStatus.COMPLETED
+    assert redis_client._redis.xpending(STREAM_NAME, GROUP)["pending"] == 0
+
+
+def test_reclaimer_ignores_recently_active_messages(dead_delivery):
+    assert _reclaimer(min_idle_seconds=60).reclaim(count=10) == []
+    assert get_node_status("reclaim", "a") == NodeStatus.RUNNING
+
+
+def test_reclaimer_fails_node_after_max_deliveries(dead_delivery):
+    stream, msg_id = dead_delivery
+    reclaimer = _reclaimer(max_deliveries=2)
+
+    time.sleep(0.1)
+    assert len(reclaimer.reclaim(count=10)) == 1
+    time.sleep(0.1)
+    assert reclaimer.reclaim(count=10) == []
+
+    assert get_node_status("reclaim", "a") == NodeStatus.FAILED
+    assert redis_client._redis.xpending(STREAM_NAME, GROUP)["pending"] == 0
+    _last_id, events = read_node_events("0-0", block_ms=10)
+    assert events[-1] == {"execution_id": "reclaim", "node_id": "a", "status": "FAILED"}
+
+
+def test_giving_up_keeps_a_result_committed_first(dead_delivery):
+    set_node_status("reclaim", "a", NodeStatus.COMPLETED)
+    time.sleep(0.1)
+
+    assert _reclaimer(max_deliveries=1).reclaim(count=10) == []
+
+    assert get_node_status("reclaim", "a") == NodeStatus.COMPLETED
+    assert redis_client._redis.xpending(STREAM_NAME, GROUP)["pending"] == 0
+
+
+def test_heartbeat_keeps_in_flight_messages_from_being_reclaimed(dead_delivery):
+    stream, msg_id = dead_delivery
+    messages = InFlightMessages()
+    messages.add(stream, msg_id)
+    heartbeat = WorkerHeartbeat(GROUP, "dead-worker", messages)
+
+    time.sleep(0.1)
+    live = heartbeat.beat()
+
+    assert live == ["dead-worker"]
+    assert redis_client._redis.zscore(RedisKeyTemplates.WORKER_HEARTBEATS, "dead-worker") is not None
+    assert _reclaimer().reclaim(count=10) == []
+
+
+def test_reclaimer_skips_messages_of_live_consumers(dead_delivery):
+    stream, msg_id = dead_delivery
+    time.sleep(0.1)
+    WorkerHeartbeat(GROUP, "dead-worker", InFlightMessages()).beat()
+    reclaimer = _reclaimer()
+
+    assert reclaimer.reclaim(count=10) == []
+    time.sleep(0.1)
+    assert [(s, m) for s, m, _fields in reclaimer.reclaim(count=10)] == [(stream, msg_id)]
+
+
+def test_heartbeat_does_not_steal_reclaimed_messages(dead_delivery):
+    stream, msg_id = dead_delivery
+    time.sleep(0.1)
+    _reclaimer().reclaim(count=10)
+    messages = InFlightMessages()
+    messages.add(stream, msg_id)
+
+    WorkerHeartbeat(GROUP, "dead-worker", messages).beat()
+
+    [entry] = redis_client._redis.xpending_range(STREAM_NAME, GROUP, "-", "+", 10)
+    assert entry["consumer"] == "rescuer"
@@ -1,4 +1,15 @@
-from workers.registry import get_handler, HANDLER_REGISTRY
+import pytest
+
+from workers import registry
+from workers.registry import (
+    HANDLER_EXECUTION_CLASSES,
+    HANDLER_REGISTRY,
+    ExecutionClass,
+    get_handler,
+    invoke_handler,
+    is_async_handler,
+    register_handler,
+)
 
 
 def test_get_handler_returns_callable():
@@ -10,3 +21,24 @@ def test_get_handler_returns_callable():
 def test_get_handler_raises_on_unknown():
     fn = get_handler("nonexistent")
     assert fn.__name__ == "noop_handler"
+
+
+def test_register_and_invoke_async_handler(monkeypatch):
+    async def handler(config):
+        return {"echo": config["value"]}
+
+    monkeypatch.setattr("workers.registry.HANDLER_REGISTRY", dict(HANDLER_REGISTRY))
+    register_handler("echo", handler)
+
+    fn = get_handler("echo")
+    assert is_async_handler(fn)
+    assert invoke_handler(fn, {"value": 1}) == {"echo": 1}
+
+
+def test_sync_handlers_cannot_run_inline(monkeypatch):
+    monkeypatch.setattr("workers.registry.HANDLER_REGISTRY", dict(HANDLER_REGISTRY))
+    monkeypatch.setattr("workers.registry.HANDLER_EXECUTION_CLASSES", dict(HANDLER_EXECUTION_CLASSES))
+
+    with pytest.raises(ValueError):
+        register_handler("blocking", lambda config: {}, ExecutionClass.INLINE)
+    assert "blocking" not in registry.HANDLER_REGISTRY
@@ -0,0 +1,59 @@
+import time
+import pytest
+from clients.redis_client import redis_client
+from orchestrator.models import NodeStatus
+from orchestrator.state import get_node_status, set_node_status
+from orchestrator.task_queue import STREAM_NAME, push_task
+from workers import registry
+from workers.lanes import LaneReader
+from workers.threaded_worker import ThreadedWorker
+from workers.worker import GROUP
+
+
+@pytest.fixture
+def slow_handler(monkeypatch):
+    def handler(config):
+        time.sleep(0.2)
+        return {"status": "ok"}
+
+    monkeypatch.setitem(registry.HANDLER_REGISTRY, "slow", handler)
+
+
+def _queue(execution_id, count):
+    for i in range(count):
+        set_node_status(execution_id, f"n{i}", NodeStatus.QUEUED)
+        push_task(execution_id, f"n{i}", {"handler": "slow", "config": {}})
+
+
+@pytest.fixture
+def threaded_worker():
+    lanes = LaneReader(GROUP, "threaded-consumer")
+    lanes.ensure_groups()
+    worker = ThreadedWorker(concurrency=4, batch_size=8, lanes=lanes)
+    yield worker
+    worker.close()
+
+
+def test_threaded_worker_never_exceeds_concurrency(slow_handler, threaded_worker):
+    _queue("threaded", 8)
+
+    assert threaded_worker.poll(block_ms=10) == 4
+    assert redis_client._redis.xpending(STREAM_NAME, GROUP)["pending"] == 4
+
+    threaded_worker.drain()
+    assert redis_client._redis.xpending(STREAM_NAME, GROUP)["pending"] == 0
+    assert threaded_worker.poll(block_ms=10) == 4
+    threaded_worker.drain()
+
+    assert all(get_node_status("threaded", f"n{i}") == NodeStatus.COMPLETED for i in range(8))
+
+
+def test_threaded_worker_overlaps_handlers(slow_handler, threaded_worker):
+    _queue("threaded-overlap", 4)
+
+    start = time.perf_counter()
+    threaded_worker.poll(block_ms=10)
+    threaded_worker.drain()
+
+    assert time.perf_counter() - start < 0.6
+    assert all(get_node_status("threaded-overlap", f"n{i}") == NodeStatus.COMPLETED for i in range(4))
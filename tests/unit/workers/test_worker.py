@@ -1,14 +1,25 @@
 import pytest
 import json
+from clients import blob_store
+from clients.blob_store import LocalBlobStore
+from clients.redis_client import redis_client
 from unittest.mock import patch
+from orchestrator.events import read_node_events
 from orchestrator.models import NodeStatus
-from orchestrator.state import set_node_status
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.state import get_node_output, set_node_status
+from orchestrator.template import task_inputs
 from workers.worker import process_message
 
 
-@patch("workers.worker.set_node_status")
-@patch("workers.registry.get_handler")
-def test_process_message_success(mock_get_handler, mock_set_node_status):
+def get_node_record(execution_id, node_id):
+    return json.loads(redis_client._redis.hget(
+        RedisKeyTemplates.WORKFLOW_NODES.format(execution_id=execution_id), node_id
+    ))
+
+
+@patch("workers.worker.get_handler")
+def test_process_message_success(mock_get_handler):
     mock_get_handler.return_value = lambda config: {"status": "ok"}
 
     fields = {
@@ -23,13 +34,14 @@ def test_process_message_success(mock_get_handler, mock_set_node_status):
 
     process_message("msg-id-1", fields)
 
-    mock_set_node_status.assert_any_call("exec-123", "task-1", NodeStatus.RUNNING)
-    mock_set_node_status.assert_any_call("exec-123", "task-1", NodeStatus.COMPLETED)
+    record = get_node_record("exec-123", "task-1")
+    assert record["status"] == NodeStatus.COMPLETED.value
+    assert record["started_at"] <= record["finished_at"]
+    assert get_node_output("exec-123", "task-1") == {"status": "ok"}
 
 
-@patch("workers.worker.set_node_status")
 @patch("workers.worker.get_handler")
-def test_process_message_failure(mock_get_handler, mock_set_node_status):
+def test_process_message_failure(mock_get_handler):
     def fail_handler(config):
         raise RuntimeError("Boom")
 
@@ -47,5 +59,54 @@ def test_process_message_failure(mock_get_handler, mock_set_node_status):
 
     process_message("msg-id-fail", fields)
 
-    mock_set_node_status.assert_any_call("exec-999", "fail-task", NodeStatus.RUNNING)
-    mock_set_node_status.assert_any_call("exec-999", "fail-task", NodeStatus.FAILED, error="Boom")
+    record = get_node_record("exec-999", "fail-task")
+    assert record["status"] == NodeStatus.FAILED.value
+    assert record["error"] == "Boom"
+    assert get_node_output("exec-999", "fail-task") == {}
+
+
+@patch("workers.worker.get_handler")
+def test_process_message_publishes_completion_event(mock_get_handler):
+    mock_get_handler.return_value = lambda config: {"status": "ok"}
+
+    fields = {
+        "execution_id": "exec-event",
+        "node_id": "task-1",
+        "payload": json.dumps({"handler": "noop", "config": {}})
+    }
+    set_node_status("exec-event", "task-1", NodeStatus.QUEUED)
+
+    process_message("msg-id-event", fields)
+
+    _, events = read_node_events("0-0", block_ms=10)
+    assert events == [{"execution_id": "exec-event", "node_id": "task-1", "status": "COMPLETED"}]
+
+
+@patch("clients.blob_store.settings.BLOB_OFFLOAD_BYTES", 1000)
+@patch("workers.worker.get_handler")
+def test_large_outputs_are_offloaded_and_loaded_by_consumers(mock_get_handler, tmp_path, monkeypatch):
+    monkeypatch.setattr("clients.blob_store.blob_store", LocalBlobStore(str(tmp_path)))
+    large = {"body": "x" * 10_000}
+    mock_get_handler.return_value = lambda config: large
+    set_node_status("exec-blob", "producer", NodeStatus.QUEUED)
+
+    process_message("msg-producer", {
+        "execution_id": "exec-blob",
+        "node_id": "producer",
+        "payload": json.dumps({"handler": "noop", "config": {}}),
+    })
+
+    ref = get_node_output("exec-blob", "producer")
+    assert blob_store.is_blob_ref(ref)
+    assert blob_store.load(ref) == large
+
+    seen = []
+    mock_get_handler.return_value = lambda config: seen.append(config) or {}
+    set_node_status("exec-blob", "consumer", NodeStatus.QUEUED)
+    process_message("msg-consumer", {
+        "execution_id": "exec-blob",
+        "node_id": "consumer",
+        "payload": json.dumps({"handler": "noop", **task_inputs("exec-blob", {"text": "{{ producer.body }}"})}),
+    })
+
+    assert seen == [{"text": large["body"]}]
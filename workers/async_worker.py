@@ -0,0 +1,207 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from redis.exceptions import ConnectionError
+from logging_config import get_logger
+from clients import blob_store
+from clients.async_redis_client import AsyncRedisClient
+from config import settings
+from orchestrator.models import NodeStatus
+from orchestrator.scripts import COMMIT_NODE_RUN, START_NODE_RUN
+from orchestrator.state import commit_node_run_call, parse_commit_result, start_node_run_call
+from orchestrator.template import load_task_config
+from workers.lanes import LaneReader
+from workers.process_pool import get_process_pool, run_encoded, start_process_pool
+from workers.recovery import Reclaimer, WorkerHeartbeat, in_flight
+from workers.registry import (
+    ExecutionClass,
+    get_execution_class,
+    get_handler,
+    invoke_handler,
+    is_async_handler,
+    require_handler,
+)
+from workers.worker import (
+    CONSUMER,
+    GROUP,
+    STREAM,
+    encode_output,
+    parse_message,
+)
+
+logger = get_logger(__name__)
+
+
+class AsyncWorker:
+    """Run up to ``concurrency`` handlers concurrently on one event loop.
+
+    ``async def`` handlers are awaited directly, so thousands of network-bound
+    calls can be in flight in a single process. Thread-class handlers are
+    offloaded to a pool of ``WORKER_CONCURRENCY`` threads and process-class
+    handlers to the shared process pool. Lane reads, claims, commits and acks
+    are awaited on an ``AsyncRedisClient`` and run the same Lua scripts, with
+    the same keys and args, as the other worker modes, so every mode stores
+    state and acks messages the same way: in the call that persists the
+    node's final status. Redis round trips in flight are bounded by the
+    client's connection pool (``REDIS_MAX_CONNECTIONS``), not by threads.
+    Only the reclaim pass, every ``WORKER_RECLAIM_INTERVAL_SECONDS``, and
+    blob store file I/O run on threads.
+    """
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        lanes: Optional[LaneReader] = None,
+        reclaimer: Optional[Reclaimer] = None,
+        client: Optional[AsyncRedisClient] = None,
+    ):
+        self.concurrency = concurrency or settings.WORKER_ASYNC_CONCURRENCY
+        self.batch_size = batch_size or settings.WORKER_BATCH_SIZE
+        self.lanes = lanes or LaneReader(GROUP, CONSUMER, STREAM)
+        self.reclaimer = reclaimer or Reclaimer(self.lanes.group, self.lanes.consumer, self.lanes.streams.values())
+        self.client = client or AsyncRedisClient()
+        self._start_node_run = self.client.register_script(START_NODE_RUN)
+        self._commit_node_run = self.client.register_script(COMMIT_NODE_RUN)
+        self._handler_pool = ThreadPoolExecutor(
+            max_workers=settings.WORKER_CONCURRENCY, thread_name_prefix="worker-handler"
+        )
+        self._in_flight: set[asyncio.Task] = set()
+
+    async def poll(self, block_ms: int) -> int:
+        """Claim as many messages as there are free slots and start them.
+
+        Args:
+            block_ms: How long to wait for new messages when the lanes are empty.
+
+        Returns:
+            int: Number of messages started.
+        """
+        if len(self._in_flight) >= self.concurrency:
+            await asyncio.wait(self._in_flight, return_when=asyncio.FIRST_COMPLETED)
+        count = min(self.batch_size, self.concurrency - len(self._in_flight))
+        messages = []
+        if self.reclaimer.due():
+            messages = await asyncio.to_thread(self.reclaimer.poll, count)
+        if not messages:
+            messages = await self.lanes.read_async(self.client, self.reclaimer.block_ms(block_ms), count)
+        for stream, msg_id, fields in messages:
+            task = asyncio.create_task(self._handle(stream, msg_id, fields))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+        return len(messages)
+
+    async def drain(self):
+        """Wait until every started message is processed."""
+        if self._in_flight:
+            await asyncio.wait(self._in_flight)
+
+    async def close(self):
+        self._handler_pool.shutdown(wait=True)
+        await self.client.close()
+
+    async def _in_thread(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._handler_pool, fn, *args)
+
+    async def start_task(self, msg_id: str, execution_id: str, node_id: str) -> bool:
+        """Async counterpart of ``worker.start_task``."""
+        keys, args = start_node_run_call(execution_id, node_id, msg_id)
+        if await self._start_node_run(keys=keys, args=args):
+            return True
+        logger.info("Skipping task %s/%s: node is not QUEUED for message %s", execution_id, node_id, msg_id)
+        return False
+
+    async def complete_task(self, stream: str, msg_id: str, execution_id: str, node_id: str, output: str):
+        """Async counterpart of ``worker.complete_task``."""
+        if blob_store.should_offload(output):
+            output = await self._in_thread(blob_store.offload, output, f"{execution_id}/{node_id}")
+        keys, args = commit_node_run_call(
+            execution_id, node_id, msg_id, stream, GROUP, NodeStatus.COMPLETED, output=output
+        )
+        applied, _ = parse_commit_result(await self._commit_node_run(keys=keys, args=args))
+        if not applied:
+            await self._in_thread(blob_store.discard, output)
+        logger.debug("Task %s/%s completed successfully", execution_id, node_id)
+
+    async def fail_task(self, stream: str, msg_id: str, execution_id: str, node_id: str, error: Exception):
+        """Async counterpart of ``worker.fail_task``."""
+        logger.error("Task %s/%s failed: %s", execution_id, node_id, error)
+        keys, args = commit_node_run_call(
+            execution_id, node_id, msg_id, stream, GROUP, NodeStatus.FAILED, error=str(error)
+        )
+        await self._commit_node_run(keys=keys, args=args)
+
+    async def process_message(self, stream: str, msg_id: str, fields: dict):
+        """Async counterpart of ``worker.process_message``."""
+        execution_id, node_id, handler_name, payload = parse_message(fields)
+        logger.debug("Received task %s/%s using handler %s", execution_id, node_id, handler_name)
+
+        if not await self.start_task(msg_id, execution_id, node_id):
+            await self.client.xack(stream, GROUP, msg_id)
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+            handler = get_handler(handler_name)
+            execution_class = get_execution_class(handler_name)
+            if execution_class == ExecutionClass.PROCESS:
+                output = await loop.run_in_executor(
+                    get_process_pool(), run_encoded, require_handler(handler_name), fields["payload"]
+                )
+            else:
+                # Only configs referencing offloaded outputs read the blob store
+                if payload.get("refs"):
+                    config = await self._in_thread(load_task_config, payload)
+                else:
+                    config = load_task_config(payload)
+                if execution_class == ExecutionClass.THREAD:
+                    output = await self._in_thread(invoke_handler, handler, config)
+                elif is_async_handler(handler):
+                    output = await handler(config)
+                else:
+                    # Only the built-in noop: register_handler rejects other
+                    # plain functions as INLINE
+                    output = handler(config)
+            output = encode_output(output)
+        except Exception as e:
+            await self.fail_task(stream, msg_id, execution_id, node_id, e)
+            return
+
+        await self.complete_task(stream, msg_id, execution_id, node_id, output)
+
+    async def _handle(self, stream: str, msg_id: str, fields: dict):
+        in_flight.add(stream, msg_id)
+        try:
+            await self.process_message(stream, msg_id, fields)
+        except Exception as e:
+            logger.error("Message %s on %s left pending: %s", msg_id, stream, e)
+        finally:
+            in_flight.discard(stream, msg_id)
+
+
+async def run_async_worker():
+    """asyncio worker loop (``WORKER_MODE=async``)."""
+    logger.info("Starting asyncio worker consumer loop")
+    worker = AsyncWorker()
+    await asyncio.to_thread(worker.lanes.ensure_groups)
+    await asyncio.to_thread(start_process_pool)
+    WorkerHeartbeat(GROUP, CONSUMER).start()
+    logger.info("Worker is running with up to %d in-flight handlers...", worker.concurrency)
+
+    try:
+        while True:
+            try:
+                await worker.poll(block_ms=5000)
+            except ConnectionError:
+                logger.warning("Redis connection lost. Retrying in 5s...")
+                await asyncio.sleep(5)
+            except Exception as e:
+                logger.error("Unexpected error in worker loop: %s", e)
+                await asyncio.sleep(2)
+    finally:
+        await worker.drain()
+        await worker.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_async_worker())
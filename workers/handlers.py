@@ -1,4 +1,5 @@
-import time
+import asyncio
+import hashlib
 import random
 from logging_config import get_logger
 
@@ -11,14 +12,14 @@ def noop_handler(config):
     return {"status": "ok"}
 
 
-def call_external_service(config):
+async def call_external_service(config):
     url = config.get("url", "http://example.com")
     logger.info("call_external_service invoked with url=%s", url)
-    time.sleep(1)  # simulate delay
+    await asyncio.sleep(1)  # simulate delay
     return {"status": "ok", "data": f"Simulated call to {url}"}
 
 
-def llm(config):
+async def llm(config):
     prompt = config.get("prompt", "Hello, world!")
     logger.info("llm handler invoked with prompt starting: %s", prompt[:30])
     return {"status": "ok", "answer": f"Simulated response for: {prompt}"}
@@ -31,3 +32,13 @@ def unreliable_handler(config):
         logger.error("unreliable_handler encountered simulated failure")
         raise RuntimeError("Simulated failure")
     return {"status": "ok", "message": "Sometimes it works"}
+
+
+def checksum(config):
+    """CPU-bound example: iterate SHA-256 over ``data`` ``rounds`` times."""
+    rounds = int(config.get("rounds", 100000))
+    logger.info("checksum handler invoked with %d rounds", rounds)
+    digest = str(config.get("data", "")).encode()
+    for _ in range(rounds):
+        digest = hashlib.sha256(digest).digest()
+    return {"status": "ok", "checksum": digest.hex()}
@@ -0,0 +1,156 @@
+from typing import Optional
+from logging_config import get_logger
+from clients.redis_client import redis_client
+from config import settings
+from orchestrator.models import Priority
+from orchestrator.scripts import PEEK_STREAM_HEADS, peek_stream_heads_script
+from orchestrator.task_queue import lane_streams
+
+logger = get_logger(__name__)
+
+WEIGHTED = "weighted"
+EDF = "edf"
+
+
+class LaneReader:
+    """Read task messages from the priority lanes on behalf of one consumer.
+
+    Two policies decide which lane is served next:
+
+    * ``weighted`` runs smooth weighted round-robin over the lanes, so under
+      contention each lane gets a share of reads proportional to its weight
+      and the low lane is never starved. A lane found empty forfeits its
+      accumulated credit, which keeps a lane that idled for a while from
+      monopolising the worker once work shows up again.
+    * ``edf`` peeks at the oldest undelivered task of every lane and serves the
+      one with the earliest deadline. Tasks without a deadline get one of
+      enqueue time plus the lane's slack, so old low-priority tasks eventually
+      overtake fresh high-priority ones.
+
+    When every lane is empty the reader blocks on all of them at once.
+    ``read_async`` makes the same reads on an ``AsyncRedisClient``.
+    """
+
+    def __init__(
+        self,
+        group: str,
+        consumer: str,
+        base_stream: str = settings.STREAM,
+        policy: Optional[str] = None,
+        weights: Optional[dict[str, int]] = None,
+        slack_seconds: Optional[dict[str, float]] = None,
+    ):
+        self.group = group
+        self.consumer = consumer
+        self.streams = lane_streams(base_stream)
+        self.policy = policy or settings.WORKER_LANE_POLICY
+        if self.policy not in (WEIGHTED, EDF):
+            raise ValueError(f"Unknown lane policy: {self.policy}")
+        weights = weights or settings.WORKER_LANE_WEIGHTS
+        slack_seconds = slack_seconds or settings.WORKER_LANE_SLACK_SECONDS
+        self.weights = {lane: max(1, int(weights.get(lane.value, 1))) for lane in self.streams}
+        self.slack_ms = {lane: float(slack_seconds.get(lane.value, 0)) * 1000 for lane in self.streams}
+        self._credit = {lane: 0 for lane in self.streams}
+        self._peek_async = None
+
+    def ensure_groups(self):
+        """Create the consumer group on every lane stream if absent."""
+        for stream in self.streams.values():
+            try:
+                redis_client.xgroup_create(stream, self.group, id="0", mkstream=True)
+                logger.info("Group '%s' created on stream '%s'", self.group, stream)
+            except Exception as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+
+    def read(self, block_ms: int, count: int = 1) -> list[tuple[str, str, dict]]:
+        """Claim up to ``count`` messages from the lane the policy picks.
+
+        Args:
+            block_ms: How long to wait when every lane is empty.
+            count: Maximum number of messages to claim from the chosen lane.
+
+        Returns:
+            list: ``(stream, msg_id, fields)`` for every claimed message.
+        """
+        if self.policy == EDF:
+            order = self._edf_order(peek_stream_heads_script(keys=self._lane_keys(), args=[self.group]))
+        else:
+            order = self._weighted_order()
+        for lane in order:
+            messages = self._read({self.streams[lane]: ">"}, count)
+            if messages:
+                return self._picked(lane, messages)
+            self._credit[lane] = 0
+
+        return self._read({stream: ">" for stream in self.streams.values()}, count, block_ms)
+
+    async def read_async(self, client, block_ms: int, count: int = 1) -> list[tuple[str, str, dict]]:
+        """``read`` on an ``AsyncRedisClient``; the reader must always be given the same client."""
+        if self.policy == EDF:
+            if self._peek_async is None:
+                self._peek_async = client.register_script(PEEK_STREAM_HEADS)
+            order = self._edf_order(await self._peek_async(keys=self._lane_keys(), args=[self.group]))
+        else:
+            order = self._weighted_order()
+        for lane in order:
+            messages = self._parse(await client.xreadgroup(self.group, self.consumer, {self.streams[lane]: ">"}, count))
+            if messages:
+                return self._picked(lane, messages)
+            self._credit[lane] = 0
+
+        streams = {stream: ">" for stream in self.streams.values()}
+        return self._parse(await client.xreadgroup(self.group, self.consumer, streams, count, block_ms))
+
+    def _picked(self, lane: Priority, messages: list) -> list:
+        if self.policy == WEIGHTED:
+            self._served(lane)
+        return messages
+
+    def _weighted_order(self) -> list[Priority]:
+        """Lanes ordered by the credit they would have after this round."""
+        return sorted(
+            self.streams,
+            key=lambda lane: self._credit[lane] + self.weights[lane],
+            reverse=True,
+        )
+
+    def _served(self, lane: Priority):
+        """Apply one smooth weighted round-robin step in favour of ``lane``."""
+        for other in self._credit:
+            self._credit[other] += self.weights[other]
+        self._credit[lane] -= sum(self.weights.values())
+
+    def _lane_keys(self) -> list[str]:
+        return [self.streams[lane] for lane in self.streams]
+
+    def _edf_order(self, heads: list) -> list[Priority]:
+        """Non-empty lanes ordered by the effective deadline of their head task, given ``PEEK_STREAM_HEADS`` output."""
+        due = {}
+        for lane, head in zip(self.streams, heads):
+            if not head:
+                continue
+            msg_id, deadline = head
+            if deadline:
+                due[lane] = float(deadline) * 1000
+            else:
+                due[lane] = int(msg_id.split("-")[0]) + self.slack_ms[lane]
+        return sorted(due, key=due.get)
+
+    def _read(self, streams: dict, count: int, block_ms: Optional[int] = None) -> list[tuple[str, str, dict]]:
+        response = redis_client.xreadgroup(
+            groupname=self.group,
+            consumername=self.consumer,
+            streams=streams,
+            count=count,
+            block=block_ms,
+        )
+        return self._parse(response)
+
+    @staticmethod
+    def _parse(response) -> list[tuple[str, str, dict]]:
+        return [
+            (stream, msg_id, fields)
+            for stream, entries in response or []
+            for msg_id, fields in entries
+        ]
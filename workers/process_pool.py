@@ -0,0 +1,85 @@
+"""Warm process pool for ``ExecutionClass.PROCESS`` handlers.
+
+Pool processes are started with ``spawn``. The parent resolves the handler
+by name and passes the function itself; module-level functions pickle by
+reference, so a handler registered at runtime runs in the pool too. The task
+payload crosses the process boundary as the encoded string read from the
+stream and the output comes back as the encoded string that is stored in
+Redis: each value is encoded exactly once and the parent never re-encodes it.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+from logging_config import get_logger
+from clients import codecs
+from config import settings
+from orchestrator.template import load_task_config
+from workers.registry import invoke_handler, require_handler, uses_process_pool
+
+logger = get_logger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def pool_size() -> int:
+    return settings.WORKER_PROCESSES or os.cpu_count() or 1
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Return the shared process pool, creating it on first use."""
+    global _pool
+    with _lock:
+        if _pool is None:
+            max_tasks = settings.WORKER_MAX_TASKS_PER_CHILD or None
+            logger.info("Starting process pool with %d processes (max_tasks_per_child=%s)", pool_size(), max_tasks)
+            _pool = ProcessPoolExecutor(
+                max_workers=pool_size(),
+                mp_context=multiprocessing.get_context("spawn"),
+                max_tasks_per_child=max_tasks,
+            )
+        return _pool
+
+
+def start_process_pool():
+    """Start every pool process up front if a process-class handler is registered.
+
+    Waiting for one trivial task per process makes the first real tasks skip
+    interpreter start-up and module imports.
+    """
+    if not uses_process_pool():
+        return
+    pool = get_process_pool()
+    for future in [pool.submit(os.getpid) for _ in range(pool_size())]:
+        future.result()
+    logger.info("Process pool is warm")
+
+
+def shutdown_process_pool():
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+
+def run_encoded(handler: Callable, payload: str) -> str:
+    """Run a handler on an encoded task payload and return its encoded output.
+
+    Executed inside a pool process, which also loads any offloaded upstream
+    outputs the payload references, so they never pass through the parent.
+    """
+    config = load_task_config(codecs.decode(payload))
+    return codecs.encode(invoke_handler(handler, config))
+
+
+def run_in_process(handler_name: str, payload: str) -> str:
+    """Run a handler in the pool and wait for its encoded output.
+
+    Raises:
+        ValueError: If no handler is registered under ``handler_name``.
+    """
+    return get_process_pool().submit(run_encoded, require_handler(handler_name), payload).result()
@@ -0,0 +1,171 @@
+import threading
+import time
+from typing import Iterable, Optional
+from logging_config import get_logger
+from clients.redis_client import redis_client
+from config import settings
+from orchestrator.models import NodeStatus
+from orchestrator.redis_keys import RedisKeyTemplates
+from orchestrator.scripts import (
+    claim_abandoned_messages_script,
+    heartbeat_instance_script,
+    touch_pending_messages_script,
+)
+from orchestrator.state import commit_node_run
+
+logger = get_logger(__name__)
+
+
+class InFlightMessages:
+    """Thread-safe record of the messages this process is currently handling."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._messages: set[tuple[str, str]] = set()
+
+    def add(self, stream: str, msg_id: str):
+        with self._lock:
+            self._messages.add((stream, msg_id))
+
+    def discard(self, stream: str, msg_id: str):
+        with self._lock:
+            self._messages.discard((stream, msg_id))
+
+    def by_stream(self) -> dict[str, list[str]]:
+        grouped: dict[str, list[str]] = {}
+        with self._lock:
+            for stream, msg_id in self._messages:
+                grouped.setdefault(stream, []).append(msg_id)
+        return grouped
+
+
+in_flight = InFlightMessages()
+
+
+class WorkerHeartbeat(threading.Thread):
+    """Background thread that proves this worker is alive.
+
+    Every ``WORKER_HEARTBEAT_SECONDS`` it records the consumer in the
+    ``workers:heartbeats`` sorted set and resets the idle time of the messages
+    it is still handling, so a slow handler is never mistaken for a dead one.
+    """
+
+    def __init__(self, group: str, consumer: str, messages: InFlightMessages = in_flight, interval: float = None):
+        super().__init__(name="worker-heartbeat", daemon=True)
+        self.group = group
+        self.consumer = consumer
+        self.messages = messages
+        self.interval = interval or settings.WORKER_HEARTBEAT_SECONDS
+        self._stopped = threading.Event()
+
+    def beat(self) -> list[str]:
+        """Heartbeat once and return the consumers seen within the claim timeout."""
+        live = heartbeat_instance_script(
+            keys=[RedisKeyTemplates.WORKER_HEARTBEATS],
+            args=[self.consumer, int(settings.WORKER_CLAIM_IDLE_SECONDS * 1000)],
+        )
+        for stream, msg_ids in self.messages.by_stream().items():
+            touch_pending_messages_script(keys=[stream], args=[self.group, self.consumer, *msg_ids])
+        return live
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.beat()
+            except Exception as e:
+                logger.warning("Worker heartbeat failed: %s", e)
+
+    def stop(self):
+        self._stopped.set()
+
+
+class Reclaimer:
+    """Take over messages left pending by workers that stopped heartbeating.
+
+    Every ``interval`` seconds it claims, on each stream, entries idle longer
+    than ``min_idle_seconds`` whose consumer has not heartbeated in
+    ``workers:heartbeats`` within that time either. The claimed message keeps its id,
+    so it may run a node the dead worker left ``RUNNING`` under that id
+    again (see ``start_node_run``). Entries delivered more than ``max_deliveries`` times (per XPENDING)
+    are poison: their node is marked ``FAILED`` and the entry acked in one
+    ``commit_node_run`` call, unless the node already finished.
+    """
+
+    def __init__(
+        self,
+        group: str,
+        consumer: str,
+        streams: Iterable[str],
+        min_idle_seconds: float = None,
+        max_deliveries: int = None,
+        interval: float = None,
+    ):
+        self.group = group
+        self.consumer = consumer
+        self.min_idle_ms = int((min_idle_seconds or settings.WORKER_CLAIM_IDLE_SECONDS) * 1000)
+        self.max_deliveries = max_deliveries or settings.WORKER_MAX_DELIVERIES
+        self.interval = settings.WORKER_RECLAIM_INTERVAL_SECONDS if interval is None else interval
+        self._cursors = {stream: "-" for stream in streams}
+        self._next_run = 0.0
+
+    def block_ms(self, max_block_ms: int) -> int:
+        """Cap a blocking read so the next reclaim pass is not delayed."""
+        until_due = int((self._next_run - time.monotonic()) * 1000)
+        return max(1, min(max_block_ms, until_due))
+
+    def due(self) -> bool:
+        """Return True if the next reclaim pass is due."""
+        return time.monotonic() >= self._next_run
+
+    def poll(self, count: int) -> list[tuple[str, str, dict]]:
+        """Reclaim up to ``count`` messages if a pass is due, else return nothing."""
+        if not self.due():
+            return []
+        return self.reclaim(count)
+
+    def reclaim(self, count: int) -> list[tuple[str, str, dict]]:
+        """Claim up to ``count`` idle messages and return the ones to process.
+
+        Returns:
+            list: ``(stream, msg_id, fields)`` for every message to run again.
+        """
+        self._next_run = time.monotonic() + self.interval
+        claimed = []
+        for stream, cursor in self._cursors.items():
+            if len(claimed) >= count:
+                break
+            cursor, entries = claim_abandoned_messages_script(
+                keys=[stream, RedisKeyTemplates.WORKER_HEARTBEATS],
+                args=[self.group, self.consumer, self.min_idle_ms, cursor, count - len(claimed)],
+            )
+            self._cursors[stream] = cursor
+            claimed.extend(
+                (stream, msg_id, dict(zip(fields[::2], fields[1::2])), deliveries)
+                for msg_id, fields, deliveries in entries
+            )
+
+        ready = []
+        for stream, msg_id, fields, deliveries in claimed:
+            if deliveries > self.max_deliveries:
+                self._give_up(stream, msg_id, fields, deliveries)
+                continue
+            logger.warning(
+                "Reclaimed message %s on %s for %s/%s (delivery %d)",
+                msg_id, stream, fields["execution_id"], fields["node_id"], deliveries,
+            )
+            ready.append((stream, msg_id, fields))
+        return ready
+
+    def _give_up(self, stream: str, msg_id: str, fields: dict, deliveries: int):
+        execution_id, node_id = fields["execution_id"], fields["node_id"]
+        logger.error(
+            "Giving up on %s/%s after %d deliveries of message %s",
+            execution_id, node_id, deliveries, msg_id,
+        )
+        # Goes through the same first-terminal-write-wins commit as a finished
+        # run, so a stalled worker committing concurrently cannot be overwritten
+        # and the failure, its event and the ack land together.
+        commit_node_run(
+            execution_id, node_id, msg_id, stream, self.group, NodeStatus.FAILED,
+            error=f"Abandoned after {deliveries} deliveries",
+        )
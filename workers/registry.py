@@ -1,25 +1,128 @@
+import asyncio
+import inspect
+import pickle
+from enum import Enum
+from typing import Callable, Optional
 from workers.handlers import (
     noop_handler,
     call_external_service,
+    checksum,
     llm,
     unreliable_handler,
 )
 from logging_config import get_logger
 
+
+class ExecutionClass(str, Enum):
+    """Where a handler runs.
+
+    INLINE   in the context that processes the message; for ``async def``
+             handlers that is the event loop, so they must not block.
+             Plain functions cannot be registered as INLINE, since any
+             blocking call would stall every coroutine; only the built-in
+             ``noop`` runs inline synchronously.
+    THREAD   on a handler thread, never on an event loop. Suits blocking I/O.
+             The serial and threaded workers already process each message
+             on such a thread.
+    PROCESS  in the warm process pool (``workers/process_pool.py``), for
+             CPU-bound work that would otherwise serialize on the GIL.
+             The function is pickled by reference, so it must be defined
+             at module level where pool processes can import it.
+    """
+    INLINE = "inline"
+    THREAD = "thread"
+    PROCESS = "process"
+
+
 HANDLER_REGISTRY = {
     "noop": noop_handler,
     "call_external_service": call_external_service,
     "llm": llm,
     "unreliable": unreliable_handler,
+    "checksum": checksum,
+}
+
+HANDLER_EXECUTION_CLASSES = {
+    "noop": ExecutionClass.INLINE,
+    "checksum": ExecutionClass.PROCESS,
 }
 
 logger = get_logger(__name__)
 
 
+def register_handler(name: str, handler: Callable, execution_class: Optional[ExecutionClass] = None):
+    """Register a handler under ``name``; plain and ``async def`` functions are both accepted.
+
+    Args:
+        name: Handler name referenced by workflow nodes.
+        handler: Callable taking the node config and returning its output dict.
+        execution_class: Where the handler runs. Defaults to ``INLINE`` for
+            coroutine functions and ``THREAD`` for plain functions.
+
+    Raises:
+        ValueError: If ``handler`` is not callable, is a plain function
+            registered as ``INLINE``, or is registered as ``PROCESS`` but
+            cannot be imported by pool processes.
+    """
+    if not callable(handler):
+        raise ValueError(f"Handler {name} is not callable")
+    if execution_class is not None and ExecutionClass(execution_class) == ExecutionClass.INLINE \
+            and not is_async_handler(handler):
+        raise ValueError(f"Handler {name} is not a coroutine function and cannot run inline")
+    if execution_class is not None and ExecutionClass(execution_class) == ExecutionClass.PROCESS:
+        try:
+            pickle.dumps(handler)
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            raise ValueError(f"Handler {name} cannot run in the process pool: {e}") from e
+    logger.info("Registering %s handler %s", "async" if is_async_handler(handler) else "sync", name)
+    HANDLER_REGISTRY[name] = handler
+    if execution_class is None:
+        HANDLER_EXECUTION_CLASSES.pop(name, None)
+    else:
+        HANDLER_EXECUTION_CLASSES[name] = ExecutionClass(execution_class)
+
+
 def get_handler(name: str):
-    logger.info("Fetching handler for name=%s", name)
+    logger.debug("Fetching handler for name=%s", name)
     if name not in HANDLER_REGISTRY:
         logger.warning("Handler %s not found. Using noop handler.", name)
         return HANDLER_REGISTRY["noop"]
-    logger.info("Handler %s found", name)
+    logger.debug("Handler %s found", name)
     return HANDLER_REGISTRY[name]
+
+
+def require_handler(name: str) -> Callable:
+    """Return the handler registered under ``name``, without the noop fallback of ``get_handler``.
+
+    Raises:
+        ValueError: If no handler is registered under ``name``.
+    """
+    if name not in HANDLER_REGISTRY:
+        raise ValueError(f"Unknown handler: {name}")
+    return HANDLER_REGISTRY[name]
+
+
+def get_execution_class(name: str) -> ExecutionClass:
+    """Return the execution class of a handler (see ``register_handler`` for defaults)."""
+    if name in HANDLER_EXECUTION_CLASSES:
+        return HANDLER_EXECUTION_CLASSES[name]
+    if is_async_handler(get_handler(name)):
+        return ExecutionClass.INLINE
+    return ExecutionClass.THREAD
+
+
+def uses_process_pool() -> bool:
+    """Return True if any registered handler runs in the process pool."""
+    return ExecutionClass.PROCESS in HANDLER_EXECUTION_CLASSES.values()
+
+
+def is_async_handler(handler: Callable) -> bool:
+    """Return True for handlers defined with ``async def``."""
+    return inspect.iscoroutinefunction(handler)
+
+
+def invoke_handler(handler: Callable, config: dict) -> dict:
+    """Call a handler from synchronous code, running coroutine handlers to completion."""
+    if is_async_handler(handler):
+        return asyncio.run(handler(config))
+    return handler(config)
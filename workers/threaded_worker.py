@@ -0,0 +1,115 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Optional
+from redis.exceptions import ConnectionError
+from logging_config import get_logger
+from config import settings
+from workers.lanes import LaneReader
+from workers.process_pool import start_process_pool
+from workers.recovery import Reclaimer, WorkerHeartbeat
+from workers.worker import CONSUMER, GROUP, STREAM, handle_message
+
+logger = get_logger(__name__)
+
+
+class ThreadedWorker:
+    """Run handlers for many messages at once on a bounded thread pool.
+
+    The consumer thread claims messages in batches of up to ``batch_size`` but
+    never holds more than ``concurrency`` unacknowledged messages: it only
+    reads as many as there are free slots, and waits for a handler to finish
+    when every slot is taken. Each message is processed and acknowledged on
+    its pool thread, so a message is acked only after its state is stored.
+    I/O-bound handlers (HTTP calls, sleeps) therefore overlap instead of
+    running back to back.
+    """
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        lanes: Optional[LaneReader] = None,
+        reclaimer: Optional[Reclaimer] = None,
+    ):
+        self.concurrency = concurrency or settings.WORKER_CONCURRENCY
+        self.batch_size = batch_size or settings.WORKER_BATCH_SIZE
+        self.lanes = lanes or LaneReader(GROUP, CONSUMER, STREAM)
+        self.reclaimer = reclaimer or Reclaimer(self.lanes.group, self.lanes.consumer, self.lanes.streams.values())
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="worker"
+        )
+        self._in_flight: set[Future] = set()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of claimed messages whose handler has not finished yet."""
+        self._in_flight = {future for future in self._in_flight if not future.done()}
+        return len(self._in_flight)
+
+    def poll(self, block_ms: int) -> int:
+        """Claim as many messages as there are free slots and start them.
+
+        Waits for a running handler to finish first if every slot is taken.
+
+        Args:
+            block_ms: How long to wait for new messages when the lanes are empty.
+
+        Returns:
+            int: Number of messages started.
+        """
+        if self.in_flight >= self.concurrency:
+            wait(self._in_flight, return_when=FIRST_COMPLETED)
+        count = min(self.batch_size, self.concurrency - self.in_flight)
+        messages = self.reclaimer.poll(count) or self.lanes.read(
+            block_ms=self.reclaimer.block_ms(block_ms), count=count
+        )
+        for stream, msg_id, fields in messages:
+            self._in_flight.add(self._pool.submit(self._handle, stream, msg_id, fields))
+        return len(messages)
+
+    def drain(self):
+        """Wait until every started message is processed."""
+        wait(self._in_flight)
+        self._in_flight.clear()
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+
+    @staticmethod
+    def _handle(stream: str, msg_id: str, fields: dict):
+        try:
+            handle_message(stream, msg_id, fields)
+        except Exception as e:
+            logger.error("Message %s on %s left pending: %s", msg_id, stream, e)
+
+
+def run_threaded_worker():
+    """Threaded worker loop (``WORKER_MODE=threaded``)."""
+    logger.info("Starting threaded worker consumer loop")
+    worker = ThreadedWorker()
+    worker.lanes.ensure_groups()
+    start_process_pool()
+    WorkerHeartbeat(GROUP, CONSUMER).start()
+    logger.info(
+        "Worker is running with concurrency %d and batch size %d...",
+        worker.concurrency,
+        worker.batch_size,
+    )
+
+    try:
+        while True:
+            try:
+                worker.poll(block_ms=5000)
+            except ConnectionError:
+                logger.warning("Redis connection lost. Retrying in 5s...")
+                time.sleep(5)
+            except Exception as e:
+                logger.error("Unexpected error in worker loop: %s", e)
+                time.sleep(2)
+    finally:
+        worker.drain()
+        worker.close()
+
+
+if __name__ == "__main__":
+    run_threaded_worker()
@@ -1,11 +1,16 @@
 import time
-import json
+from typing import Union
 from redis.exceptions import ConnectionError
 from logging_config import get_logger
+from clients import blob_store, codecs
 from clients.redis_client import redis_client
 from orchestrator.models import NodeStatus
-from orchestrator.state import set_node_status, set_node_output, get_node_status
-from workers.registry import get_handler
+from orchestrator.state import commit_node_run, start_node_run
+from orchestrator.template import load_task_config
+from workers.lanes import LaneReader
+from workers.process_pool import run_in_process, start_process_pool
+from workers.recovery import Reclaimer, WorkerHeartbeat, in_flight
+from workers.registry import ExecutionClass, get_execution_class, get_handler, invoke_handler
 from config import settings
 
 STREAM = settings.STREAM
@@ -28,62 +33,118 @@ def ensure_group_exists():
             raise
 
 
-def process_message(msg_id, fields):
-    """Handle a single stream message and execute its handler."""
-    logger.info("Processing message %s with fields %s", msg_id, list(fields.keys()))
-    execution_id = fields["execution_id"]
-    node_id = fields["node_id"]
-    payload = json.loads(fields["payload"])
-    handler_name = payload["handler"]
-    config = payload.get("config", {})
+def parse_message(fields: dict) -> tuple[str, str, str, dict]:
+    """Return ``(execution_id, node_id, handler_name, payload)`` of a task message.
 
-    logger.info("Received task %s/%s using handler %s", execution_id, node_id, handler_name)
+    The config is not resolved yet; ``load_task_config`` fetches the
+    offloaded outputs it references once the node has been claimed.
+    """
+    payload = codecs.decode(fields["payload"])
+    return fields["execution_id"], fields["node_id"], payload["handler"], payload
+
+
+def start_task(msg_id: str, execution_id: str, node_id: str) -> bool:
+    """Claim the node for this message; return False if another delivery owns it."""
+    if start_node_run(execution_id, node_id, msg_id):
+        return True
+    logger.info("Skipping task %s/%s: node is not QUEUED for message %s", execution_id, node_id, msg_id)
+    return False
+
+
+def complete_task(stream: str, msg_id: str, execution_id: str, node_id: str, output: str) -> NodeStatus:
+    """Commit an encoded output, mark the node COMPLETED and ack the message.
+
+    Outputs over ``BLOB_OFFLOAD_BYTES`` go to the blob store first and only
+    their reference is committed; the blob is deleted again if another run
+    of the node committed first.
+    """
+    output = blob_store.offload(output, f"{execution_id}/{node_id}")
+    applied, _ = commit_node_run(execution_id, node_id, msg_id, stream, GROUP, NodeStatus.COMPLETED, output=output)
+    if not applied:
+        blob_store.discard(output)
+    logger.debug("Task %s/%s completed successfully", execution_id, node_id)
+    return NodeStatus.COMPLETED
+
+
+def fail_task(stream: str, msg_id: str, execution_id: str, node_id: str, error: Exception) -> NodeStatus:
+    """Mark the node FAILED with the handler's error and ack the message."""
+    logger.error("Task %s/%s failed: %s", execution_id, node_id, error)
+    commit_node_run(execution_id, node_id, msg_id, stream, GROUP, NodeStatus.FAILED, error=str(error))
+    return NodeStatus.FAILED
+
+
+def skip_task(stream: str, msg_id: str):
+    """Acknowledge a message whose node another delivery owns or finished."""
+    redis_client._redis.xack(stream, GROUP, msg_id)
 
-    try:
-        status = get_node_status(execution_id, node_id)
-        if status != NodeStatus.QUEUED:
-            logger.info("Skipping task %s: status is %s, expected QUEUED", node_id, status)
-            return
 
-        set_node_status(execution_id, node_id, NodeStatus.RUNNING)
+def encode_output(output: Union[dict, str]) -> str:
+    """Encode a handler output with the configured codec; process-class handlers return it encoded already."""
+    return output if isinstance(output, str) else codecs.encode(output)
 
-        handler = get_handler(handler_name)
-        output = handler(config)
-        set_node_output(execution_id, node_id, output)
 
-        logger.info("Task %s/%s completed successfully with output keys %s", execution_id, node_id, list(output.keys()))
-        set_node_status(execution_id, node_id, NodeStatus.COMPLETED)
+def process_message(msg_id, fields, stream: str = STREAM):
+    """Handle a single stream message and execute its handler.
 
+    Costs two Redis calls around the handler: an atomic QUEUED -> RUNNING
+    claim, and one script that stores the output and final status, updates
+    the counters, publishes the node event (waking the orchestrator) and acks
+    the message.
+    """
+    execution_id, node_id, handler_name, payload = parse_message(fields)
+    logger.debug("Received task %s/%s using handler %s", execution_id, node_id, handler_name)
+
+    if not start_task(msg_id, execution_id, node_id):
+        skip_task(stream, msg_id)
+        return
+
+    try:
+        if get_execution_class(handler_name) == ExecutionClass.PROCESS:
+            output = run_in_process(handler_name, fields["payload"])
+        else:
+            config = load_task_config(payload)
+            output = encode_output(invoke_handler(get_handler(handler_name), config))
     except Exception as e:
-        logger.error("Task %s/%s failed: %s", execution_id, node_id, e)
-        set_node_status(execution_id, node_id, NodeStatus.FAILED, error=str(e))
+        fail_task(stream, msg_id, execution_id, node_id, e)
+        return
+
+    complete_task(stream, msg_id, execution_id, node_id, output)
+
+
+def handle_message(stream: str, msg_id: str, fields: dict):
+    """Process one message; it is acked in the same call that stores its result.
+
+    A message whose processing raised (e.g. Redis went away mid-way) is left
+    unacknowledged in the group's pending list.
+    """
+    in_flight.add(stream, msg_id)
+    try:
+        process_message(msg_id, fields, stream)
+    finally:
+        in_flight.discard(stream, msg_id)
 
 
 def run_worker():
-    """Main worker loop: read tasks, execute handlers, and acknowledge."""
+    """Main worker loop: read tasks from the priority lanes, execute handlers, and acknowledge."""
     logger.info("Starting worker consumer loop")
-    ensure_group_exists()
+    lanes = LaneReader(GROUP, CONSUMER, STREAM)
+    lanes.ensure_groups()
+    start_process_pool()
+    reclaimer = Reclaimer(GROUP, CONSUMER, lanes.streams.values())
+    WorkerHeartbeat(GROUP, CONSUMER).start()
 
-    logger.info("Worker is running...")
+    logger.info("Worker is running with %s lane policy...", lanes.policy)
 
     while True:
         try:
-            messages = redis_client.xreadgroup(
-                groupname=GROUP,
-                consumername=CONSUMER,
-                streams={STREAM: '>'},
-                count=1,
-                block=5000
-            )
+            messages = reclaimer.poll(count=1) or lanes.read(block_ms=reclaimer.block_ms(5000))
 
             if not messages:
                 logger.debug("No messages received, continuing")
                 continue
 
-            for stream, entries in messages:
-                for msg_id, fields in entries:
-                    process_message(msg_id, fields)
-                    redis_client._redis.xack(STREAM, GROUP, msg_id)
+            for stream, msg_id, fields in messages:
+                handle_message(stream, msg_id, fields)
 
         except ConnectionError:
             logger.warning("Redis connection lost. Retrying in 5s...")
@@ -94,4 +155,12 @@ def run_worker():
 
 
 if __name__ == "__main__":
-    run_worker()
+    if settings.WORKER_MODE == "threaded":
+        from workers.threaded_worker import run_threaded_worker
+        run_threaded_worker()
+    elif settings.WORKER_MODE == "async":
+        import asyncio
+        from workers.async_worker import run_async_worker
+        asyncio.run(run_async_worker())
+    else:
+        run_worker()